@@ -87,7 +87,7 @@ class HealthcareAgent:
                 vector_db=ChromaDb(
                     collection="medical_reports",
                     path=str(self.config.chroma_dir),
-                    persistent_client=True,
+                    persistent_client=self.config.chroma_mode != "ephemeral",
                 ),
                 embedder=OpenAIEmbedder(
                     id=self.config.embedding_model,
@@ -75,21 +75,26 @@ def init_db():
 @cli.command()
 @click.option("--pattern", default="test_*.py", help="Test pattern to run")
 @click.option("--verbose", "-v", is_flag=True, help="Verbose output")
-def test(pattern: str, verbose: bool):
+@click.option("--workers", "-n", default="auto", help="Parallel pytest-xdist workers")
+def test(pattern: str, verbose: bool, workers: str):
     """Run tests."""
     try:
-        import subprocess
+        import pytest
 
-        cmd = ["python", "-m", "pytest"]
-        if verbose:
-            cmd.append("-v")
+        # Collect every matching file so one pytest session runs them all
+        test_files = sorted(str(path) for path in Path("tests").rglob(pattern))
+        if not test_files:
+            click.echo(f"No tests match pattern: {pattern}", err=True)
+            sys.exit(1)
 
-        # Add test pattern
-        cmd.append(f"tests/agent/healthcare/{pattern}")
+        # Distribute by module/class so scoped fixtures stay on one worker
+        args = ["-n", workers, "--dist", "loadscope"]
+        if verbose:
+            args.append("-v")
+        args.extend(test_files)
 
-        click.echo(f"Running tests: {' '.join(cmd)}")
-        result = subprocess.run(cmd, env={"PYTHONPATH": "."})
-        sys.exit(result.returncode)
+        click.echo(f"Running {len(test_files)} test files")
+        sys.exit(pytest.main(args))
 
     except Exception as e:
         click.echo(f"Error running tests: {e}", err=True)
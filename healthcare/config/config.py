@@ -31,6 +31,19 @@ class Config:
     max_retries: int = 3
     request_timeout: int = 300
 
+    # Embedding Configuration
+    embedding_batch_size: int = 2048  # Max inputs per embeddings request
+    embedding_max_batch_tokens: int = 250_000  # Token budget per request
+    embedding_concurrency: int = 4  # Max in-flight async embeddings requests
+    embedding_rpm: int = 3000  # Requests per minute budget
+    embedding_tpm: int = 1_000_000  # Tokens per minute budget
+    embedding_cache_enabled: bool = True  # Reuse embeddings of unchanged chunks
+    embedding_cache_max_entries: int = 100_000  # Oldest entries evicted beyond this
+    chroma_batch_size: int = 500  # Max chunks per vector database insert
+    chroma_mode: str = "persistent"  # "persistent" on disk or "ephemeral" in memory
+    embedding_use_batch_api: bool = False  # Use the Batch API for bulk ingest
+    embedding_batch_api_min_chunks: int = 10_000  # Smallest ingest sent as a batch
+
     # Logging Configuration
     log_level: str = "INFO"
     log_format: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -60,6 +73,27 @@ class ConfigManager:
             chunk_overlap=int(os.getenv("CHUNK_OVERLAP", "200")),
             max_retries=int(os.getenv("MAX_RETRIES", "3")),
             request_timeout=int(os.getenv("REQUEST_TIMEOUT", "120")),
+            embedding_batch_size=int(os.getenv("EMBEDDING_BATCH_SIZE", "2048")),
+            embedding_max_batch_tokens=int(
+                os.getenv("EMBEDDING_MAX_BATCH_TOKENS", "250000")
+            ),
+            embedding_concurrency=int(os.getenv("EMBEDDING_CONCURRENCY", "4")),
+            embedding_rpm=int(os.getenv("EMBEDDING_RPM", "3000")),
+            embedding_tpm=int(os.getenv("EMBEDDING_TPM", "1000000")),
+            embedding_cache_enabled=(
+                os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+            ),
+            embedding_cache_max_entries=int(
+                os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "100000")
+            ),
+            chroma_batch_size=int(os.getenv("CHROMA_BATCH_SIZE", "500")),
+            chroma_mode=os.getenv("CHROMA_MODE", "persistent").lower(),
+            embedding_use_batch_api=(
+                os.getenv("EMBEDDING_USE_BATCH_API", "false").lower() == "true"
+            ),
+            embedding_batch_api_min_chunks=int(
+                os.getenv("EMBEDDING_BATCH_API_MIN_CHUNKS", "10000")
+            ),
             log_level=os.getenv("LOG_LEVEL", "INFO"),
             log_format=os.getenv(
                 "LOG_FORMAT", "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -112,6 +146,22 @@ class ConfigManager:
             raise ValueError("max_retries cannot be negative")
         if config.request_timeout <= 0:
             raise ValueError("request_timeout must be positive")
+        if config.embedding_batch_size <= 0:
+            raise ValueError("embedding_batch_size must be positive")
+        if config.embedding_max_batch_tokens <= 0:
+            raise ValueError("embedding_max_batch_tokens must be positive")
+        if config.embedding_concurrency <= 0:
+            raise ValueError("embedding_concurrency must be positive")
+        if config.embedding_rpm <= 0 or config.embedding_tpm <= 0:
+            raise ValueError("embedding_rpm and embedding_tpm must be positive")
+        if config.embedding_cache_max_entries <= 0:
+            raise ValueError("embedding_cache_max_entries must be positive")
+        if config.chroma_batch_size <= 0:
+            raise ValueError("chroma_batch_size must be positive")
+        if config.chroma_mode not in ("persistent", "ephemeral"):
+            raise ValueError("chroma_mode must be 'persistent' or 'ephemeral'")
+        if config.embedding_batch_api_min_chunks <= 0:
+            raise ValueError("embedding_batch_api_min_chunks must be positive")
 
     @staticmethod
     def check_external_dependencies() -> List[str]:
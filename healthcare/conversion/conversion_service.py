@@ -1,6 +1,5 @@
 """PDF conversion service using OpenAI Files API and Responses API."""
 
-import json
 import logging
 import re
 import time
@@ -8,6 +7,7 @@ from pathlib import Path
 from typing import Optional
 
 import openai
+import orjson
 from openai import OpenAI
 from pydantic import BaseModel
 from tenacity import (
@@ -22,6 +22,9 @@ from healthcare.images import AssetMetadata, ImageExtractionService
 
 logger = logging.getLogger(__name__)
 
+# Buffer size for writing converted reports to disk
+_WRITE_BUFFER_SIZE = 1 << 20
+
 
 class Figure(BaseModel):
     """Represents a figure/image detected in the PDF."""
@@ -104,9 +107,10 @@ Return both as a JSON object with keys: {"markdown": str, "manifest": {"figures"
         upload_start_time = time.time()
 
         try:
+            # Pass the open handle so the multipart body is streamed from disk
             with open(pdf_path, "rb") as f:
                 uploaded_file = self.client.files.create(
-                    file=f,
+                    file=(pdf_path.name, f, "application/pdf"),
                     purpose="assistants",  # or appropriate purpose for responses API
                 )
 
@@ -169,9 +173,9 @@ Return both as a JSON object with keys: {"markdown": str, "manifest": {"figures"
                 raise ValueError("OpenAI response output_text is empty or None")
 
             try:
-                result_data = json.loads(response.output_text)
+                result_data = orjson.loads(response.output_text)
                 logger.info(f"Successfully parsed JSON result")
-            except json.JSONDecodeError as json_err:
+            except orjson.JSONDecodeError as json_err:
                 logger.error(f"JSON decode error: {json_err}")
                 logger.error(
                     f"Raw output_text content: '{response.output_text[:500]}...' (first 500 chars)"
@@ -209,7 +213,10 @@ Return both as a JSON object with keys: {"markdown": str, "manifest": {"figures"
         markdown_path = report_dir / "report.md"
 
         try:
-            markdown_path.write_text(markdown, encoding="utf-8")
+            with markdown_path.open(
+                "w", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE
+            ) as f:
+                f.write(markdown)
             logger.info(f"Saved Markdown to: {markdown_path}")
             return markdown_path
 
@@ -2,9 +2,9 @@
 
 import io
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import ClassVar, Dict, List, Optional
 
 import pikepdf
 from PIL import Image
@@ -12,7 +12,7 @@ from PIL import Image
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AssetMetadata:
     """Metadata for extracted assets (images, tables, etc.)."""
 
@@ -28,9 +28,13 @@ class AssetMetadata:
 class ImageExtractionService:
     """Service for extracting images from PDF files."""
 
+    SUPPORTED_FORMATS: ClassVar[frozenset[str]] = frozenset(
+        {".png", ".jpg", ".jpeg", ".tiff", ".bmp"}
+    )
+
     def __init__(self):
         """Initialize the image extraction service."""
-        self.supported_formats = {".png", ".jpg", ".jpeg", ".tiff", ".bmp"}
+        self.supported_formats = self.SUPPORTED_FORMATS
 
     def extract_images_pikepdf(
         self, pdf_path: Path, output_dir: Path
@@ -234,22 +238,25 @@ class ImageExtractionService:
             page_to_figures[page].append(figure)
 
         # Link extracted images to figures based on page number and index
+        linked_images = []
         for img_metadata in extracted_images:
+            figure = None
             if img_metadata.page_number in page_to_figures:
                 page_figures = page_to_figures[img_metadata.page_number]
 
                 # Try to match by index within the page
                 if img_metadata.index and img_metadata.index <= len(page_figures):
                     figure = page_figures[img_metadata.index - 1]
-                    img_metadata.caption = figure.get("caption")
-                    img_metadata.alt_text = figure.get("caption")
                 elif len(page_figures) == 1:
                     # If only one figure on the page, link it
                     figure = page_figures[0]
-                    img_metadata.caption = figure.get("caption")
-                    img_metadata.alt_text = figure.get("caption")
 
-        return extracted_images
+            if figure is not None:
+                caption = figure.get("caption")
+                img_metadata = replace(img_metadata, caption=caption, alt_text=caption)
+            linked_images.append(img_metadata)
+
+        return linked_images
 
     def extract_and_process(
         self, pdf_path: Path, manifest: dict, images_dir: Path
@@ -1,12 +1,16 @@
 """Main FastAPI application for Healthcare Agent MVP."""
 
+import asyncio
 import logging
+import time
 from contextlib import asynccontextmanager
+from typing import Any, Dict
 
 from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.exception_handlers import http_exception_handler
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from sqlmodel import text
 
 from healthcare.agent.agent_service import HealthcareAgent
 from healthcare.config.config import Config, ConfigManager
@@ -33,6 +37,9 @@ healthcare_agent: HealthcareAgent = None
 
 logger = get_healthcare_logger(__name__)
 
+# How long a healthy /health result is served before services are probed again
+HEALTH_CACHE_TTL_SECONDS = 5.0
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -268,6 +275,94 @@ def add_error_handlers(app: FastAPI) -> None:
         )
 
 
+def _check_config(state) -> Dict[str, Any]:
+    """Report configuration status for the health check."""
+    if not getattr(state, "config", None):
+        return {"status": "not_initialized"}
+
+    return {
+        "status": "healthy",
+        "openai_model": state.config.openai_model,
+        "embedding_model": state.config.embedding_model,
+        "base_data_dir_exists": state.config.base_data_dir.exists(),
+    }
+
+
+def _check_database(state) -> Dict[str, Any]:
+    """Report database status for the health check."""
+    if not getattr(state, "db_service", None):
+        return {"status": "not_initialized"}
+
+    try:
+        with state.db_service.get_session() as session:
+            session.exec(text("SELECT 1")).first()
+        return {"status": "healthy", "connection": "active"}
+    except Exception as e:
+        return {"status": "unhealthy", "error": str(e)}
+
+
+def _check_embedding(state) -> Dict[str, Any]:
+    """Report embedding service status for the health check."""
+    if not getattr(state, "embedding_service", None):
+        return {"status": "not_initialized"}
+
+    try:
+        # Basic health check - verify service is initialized with config
+        embedding_config = state.embedding_service.config
+        return {
+            "status": "healthy",
+            "model": embedding_config.embedding_model,
+            "chunk_size": embedding_config.chunk_size,
+            "chunk_overlap": embedding_config.chunk_overlap,
+        }
+    except Exception as e:
+        return {"status": "unhealthy", "error": str(e)}
+
+
+def _check_search(state) -> Dict[str, Any]:
+    """Report search service status for the health check."""
+    if not getattr(state, "search_service", None):
+        return {"status": "not_initialized"}
+
+    try:
+        # Verify search service has required dependencies
+        search_config = state.search_service.config
+        return {
+            "status": "healthy",
+            "embedding_model": search_config.embedding_model,
+            "vector_db": "chroma",
+        }
+    except Exception as e:
+        return {"status": "unhealthy", "error": str(e)}
+
+
+def _check_reports(state) -> Dict[str, Any]:
+    """Report report service status for the health check."""
+    if not getattr(state, "report_service", None):
+        return {"status": "not_initialized"}
+
+    try:
+        # Verify report service has required dependencies
+        report_config = state.report_service.config
+        return {
+            "status": "healthy",
+            "base_data_dir": str(report_config.base_data_dir),
+            "reports_dir": str(report_config.reports_dir),
+        }
+    except Exception as e:
+        return {"status": "unhealthy", "error": str(e)}
+
+
+# Service name in the health response and the probe that checks it
+_HEALTH_PROBES = (
+    ("config", _check_config),
+    ("database", _check_database),
+    ("embedding", _check_embedding),
+    ("search", _check_search),
+    ("reports", _check_reports),
+)
+
+
 def add_routes(app: FastAPI) -> None:
     """Add all routes to the FastAPI app."""
 
@@ -307,11 +402,17 @@ def add_routes(app: FastAPI) -> None:
         return {"message": "Healthcare Agent MVP", "status": "running", "docs": "/docs"}
 
     @app.get("/health")
-    async def health_check():
+    async def health_check(request: Request):
         """Health check endpoint for all services."""
         from datetime import datetime
 
-        from sqlmodel import text
+        state = request.app.state
+
+        # Serve a recent healthy result instead of probing every service again
+        cached = getattr(state, "health_cache", None)
+        if cached is not None and time.monotonic() < cached[0]:
+            return cached[1]
+        state.health_cache = None
 
         health_status = {
             "status": "healthy",
@@ -321,97 +422,13 @@ def add_routes(app: FastAPI) -> None:
         }
 
         try:
-            # Check configuration service
-            if hasattr(app.state, "config") and app.state.config:
-                health_status["services"]["config"] = {
-                    "status": "healthy",
-                    "openai_model": app.state.config.openai_model,
-                    "embedding_model": app.state.config.embedding_model,
-                    "base_data_dir_exists": app.state.config.base_data_dir.exists(),
-                }
-            else:
-                health_status["services"]["config"] = {"status": "not_initialized"}
-                health_status["status"] = "degraded"
-
-            # Check database service
-            if hasattr(app.state, "db_service") and app.state.db_service:
-                try:
-                    with app.state.db_service.get_session() as session:
-                        session.exec(text("SELECT 1")).first()
-                    health_status["services"]["database"] = {
-                        "status": "healthy",
-                        "connection": "active",
-                    }
-                except Exception as e:
-                    health_status["services"]["database"] = {
-                        "status": "unhealthy",
-                        "error": str(e),
-                    }
-                    health_status["status"] = "unhealthy"
-            else:
-                health_status["services"]["database"] = {"status": "not_initialized"}
-                health_status["status"] = "degraded"
-
-            # Check embedding service
-            if hasattr(app.state, "embedding_service") and app.state.embedding_service:
-                try:
-                    # Basic health check - verify service is initialized with config
-                    embedding_config = app.state.embedding_service.config
-                    health_status["services"]["embedding"] = {
-                        "status": "healthy",
-                        "model": embedding_config.embedding_model,
-                        "chunk_size": embedding_config.chunk_size,
-                        "chunk_overlap": embedding_config.chunk_overlap,
-                    }
-                except Exception as e:
-                    health_status["services"]["embedding"] = {
-                        "status": "unhealthy",
-                        "error": str(e),
-                    }
-                    health_status["status"] = "unhealthy"
-            else:
-                health_status["services"]["embedding"] = {"status": "not_initialized"}
-                health_status["status"] = "degraded"
-
-            # Check search service
-            if hasattr(app.state, "search_service") and app.state.search_service:
-                try:
-                    # Verify search service has required dependencies
-                    search_config = app.state.search_service.config
-                    health_status["services"]["search"] = {
-                        "status": "healthy",
-                        "embedding_model": search_config.embedding_model,
-                        "vector_db": "chroma",
-                    }
-                except Exception as e:
-                    health_status["services"]["search"] = {
-                        "status": "unhealthy",
-                        "error": str(e),
-                    }
-                    health_status["status"] = "unhealthy"
-            else:
-                health_status["services"]["search"] = {"status": "not_initialized"}
-                health_status["status"] = "degraded"
-
-            # Check report service
-            if hasattr(app.state, "report_service") and app.state.report_service:
-                try:
-                    # Verify report service has required dependencies
-                    report_config = app.state.report_service.config
-                    health_status["services"]["reports"] = {
-                        "status": "healthy",
-                        "base_data_dir": str(report_config.base_data_dir),
-                        "reports_dir": str(report_config.reports_dir),
-                    }
-                except Exception as e:
-                    health_status["services"]["reports"] = {
-                        "status": "unhealthy",
-                        "error": str(e),
-                    }
-                    health_status["status"] = "unhealthy"
-            else:
-                health_status["services"]["reports"] = {"status": "not_initialized"}
-                health_status["status"] = "degraded"
+            # Probe all services concurrently so slow checks overlap
+            results = await asyncio.gather(
+                *(asyncio.to_thread(probe, state) for _, probe in _HEALTH_PROBES)
+            )
+            health_status["services"] = {
+                name: result for (name, _), result in zip(_HEALTH_PROBES, results)
+            }
 
             # Set overall status based on service health
             service_statuses = [
@@ -428,6 +445,11 @@ def add_routes(app: FastAPI) -> None:
             elif health_status["status"] == "degraded":
                 raise HTTPException(status_code=503, detail=health_status)
 
+            # Only healthy results are cached so failures are re-checked right away
+            state.health_cache = (
+                time.monotonic() + HEALTH_CACHE_TTL_SECONDS,
+                health_status,
+            )
             return health_status
 
         except HTTPException:
@@ -0,0 +1,110 @@
+"""Persistent content-addressed cache for text embeddings."""
+
+import hashlib
+import logging
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Keep lookups well under SQLite's bound-parameter limit
+_LOOKUP_BATCH_SIZE = 500
+
+DEFAULT_MAX_ENTRIES = 100_000
+
+
+class EmbeddingCache:
+    """SQLite-backed cache mapping (model, text) to an embedding vector.
+
+    Vectors are stored as float32 blobs keyed by a SHA-256 of the model name
+    and the text, so unchanged chunks never need to be embedded twice. The
+    cache holds at most max_entries vectors; the least recently written are
+    evicted first.
+    """
+
+    def __init__(self, db_path: Path, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """Initialize the cache, creating the database if needed.
+
+        Args:
+            db_path: Path to the SQLite database file
+            max_entries: Maximum number of embeddings kept in the cache
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the cache database."""
+        return sqlite3.connect(self.db_path)
+
+    @staticmethod
+    def _key(model: str, text: str) -> str:
+        """Build the cache key for a text embedded with a model."""
+        return hashlib.sha256(f"{model}:{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, model: str, texts: Iterable[str]) -> Dict[str, List[float]]:
+        """Look up cached embeddings.
+
+        Args:
+            model: Embedding model name
+            texts: Texts to look up
+
+        Returns:
+            Mapping of text to embedding for every text found in the cache
+        """
+        keys = {self._key(model, text): text for text in texts}
+        if not keys:
+            return {}
+
+        key_list = list(keys)
+        found = {}
+        with closing(self._connect()) as conn:
+            for i in range(0, len(key_list), _LOOKUP_BATCH_SIZE):
+                batch = key_list[i : i + _LOOKUP_BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    batch,
+                )
+                for key, vector in rows:
+                    found[keys[key]] = np.frombuffer(vector, dtype=np.float32).tolist()
+
+        return found
+
+    def set_many(self, model: str, embeddings: Dict[str, List[float]]) -> None:
+        """Store embeddings in the cache.
+
+        Args:
+            model: Embedding model name
+            embeddings: Mapping of text to embedding vector
+        """
+        if not embeddings:
+            return
+
+        rows = [
+            (self._key(model, text), np.asarray(vector, dtype=np.float32).tobytes())
+            for text, vector in embeddings.items()
+        ]
+        with closing(self._connect()) as conn, conn:
+            # REPLACE deletes and reinserts, so rowid order is write order
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows
+            )
+            conn.execute(
+                "DELETE FROM embeddings WHERE rowid IN (SELECT rowid FROM "
+                "embeddings ORDER BY rowid DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
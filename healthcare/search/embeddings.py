@@ -1,49 +1,144 @@
 """Embedding service for vector database operations using Chroma."""
 
+import asyncio
+import hashlib
 import logging
+import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import chromadb
+import numpy as np
+import openai
+import orjson
+from chromadb.api import ClientAPI
 from chromadb.config import Settings
-from openai import OpenAI
-from tenacity import retry, stop_after_attempt, wait_exponential
+from openai import AsyncOpenAI, OpenAI
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential,
+    wait_random_exponential,
+)
 
 from healthcare.config.config import Config
+from healthcare.search.embedding_cache import EmbeddingCache
+from healthcare.search.rate_limiter import AsyncTokenBucket
+
+try:
+    import tiktoken
+except ImportError:  # Fall back to estimated token counts without it
+    tiktoken = None
 
 logger = logging.getLogger(__name__)
 
+# Rough characters-per-token ratio used to budget embedding requests without a
+# tokenizer; kept low so estimates err towards smaller batches.
+_CHARS_PER_TOKEN = 3
+
+# Paragraph boundaries for Markdown chunking: one or more blank lines
+_PARA_RE = re.compile(r"\n{2,}")
+
+# Seconds between status checks of an OpenAI Batch API job
+_BATCH_POLL_INTERVAL = 30
+# Seconds to wait for a Batch API job before cancelling it; a little past the
+# 24h completion window, after which OpenAI expires the job itself
+_BATCH_POLL_TIMEOUT = 25 * 60 * 60
+_BATCH_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def _estimate_tokens(text: str) -> int:
+    """Estimate the token count of a text chunk."""
+    return len(text) // _CHARS_PER_TOKEN + 1
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(model: str) -> Optional["tiktoken.Encoding"]:
+    """Get the tokenizer for an embedding model, if one can be loaded."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except Exception as e:
+        logger.warning(f"No tokenizer for {model}, estimating token counts: {e}")
+        return None
+
+
+@lru_cache(maxsize=8192)
+def _encode(model: str, text: str) -> Tuple[int, ...]:
+    """Tokenize a chunk, caching the result for repeat ingest."""
+    return tuple(_get_encoding(model).encode(text))
+
+
+def _content_hash(markdown_content: str) -> str:
+    """Hash report content to detect unchanged re-ingests."""
+    return hashlib.blake2b(markdown_content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def get_chroma_client(chroma_dir: Path, ephemeral: bool = False) -> ClientAPI:
+    """Get the shared Chroma client for a directory.
+
+    Clients are cached per directory so services created per request share
+    one client instead of reopening the database each time.
+
+    Args:
+        chroma_dir: Directory holding the Chroma database
+        ephemeral: Keep the database in memory instead of on disk
+
+    Returns:
+        Persistent Chroma client, or an in-memory one if ephemeral
+    """
+    settings = Settings(
+        anonymized_telemetry=False,
+        allow_reset=True,
+    )
+    if ephemeral:
+        return chromadb.EphemeralClient(settings=settings)
+
+    chroma_dir.mkdir(parents=True, exist_ok=True)
+    return chromadb.PersistentClient(path=str(chroma_dir), settings=settings)
+
 
 class EmbeddingService:
     """Service for managing embeddings and vector database operations."""
 
-    def __init__(self, config: Config, openai_client: Optional[OpenAI] = None):
+    def __init__(
+        self,
+        config: Config,
+        openai_client: Optional[OpenAI] = None,
+        async_openai_client: Optional[AsyncOpenAI] = None,
+        chroma_client: Optional[ClientAPI] = None,
+    ):
         """Initialize embedding service with configuration.
 
         Args:
             config: Configuration object
             openai_client: Optional OpenAI client (will create one if not provided)
+            async_openai_client: Optional async OpenAI client (created on first
+                async call if not provided)
+            chroma_client: Optional Chroma client (uses the shared client for
+                config.chroma_dir and config.chroma_mode if not provided)
         """
         self.config = config
         self.openai_client = openai_client or OpenAI(api_key=config.openai_api_key)
-        self.chroma_client = None
+        self._async_openai_client = async_openai_client
+        self._rate_limiter: Optional[AsyncTokenBucket] = None
+        self._embedding_cache: Optional[EmbeddingCache] = None
+        self.chroma_client = chroma_client
         self.collection = None
         self._initialize_chroma()
 
     def _initialize_chroma(self) -> None:
         """Initialize Chroma client and collection."""
         try:
-            # Ensure chroma directory exists
-            self.config.chroma_dir.mkdir(parents=True, exist_ok=True)
-
-            # Initialize persistent Chroma client
-            self.chroma_client = chromadb.PersistentClient(
-                path=str(self.config.chroma_dir),
-                settings=Settings(
-                    anonymized_telemetry=False,
-                    allow_reset=True,
-                ),
-            )
+            if self.chroma_client is None:
+                self.chroma_client = get_chroma_client(
+                    self.config.chroma_dir,
+                    ephemeral=self.config.chroma_mode == "ephemeral",
+                )
 
             # Get or create collection
             self.collection = self.chroma_client.get_or_create_collection(
@@ -77,8 +172,10 @@ class EmbeddingService:
 
         except Exception as e:
             logger.error(f"Failed to refresh collection: {e}")
-            # If refresh fails, try full reinitialization
+            # If refresh fails, try full reinitialization with a new client
             logger.info("Attempting full ChromaDB reinitialization...")
+            get_chroma_client.cache_clear()
+            self.chroma_client = None
             self._initialize_chroma()
 
     def chunk_markdown(self, markdown: str) -> List[str]:
@@ -93,46 +190,113 @@ class EmbeddingService:
         if not markdown or not markdown.strip():
             return []
 
-        # Simple paragraph-based chunking for now
-        # Split on double newlines (paragraph breaks)
-        paragraphs = [p.strip() for p in markdown.split("\n\n") if p.strip()]
-
-        chunks = []
-        current_chunk = ""
-        current_size = 0
+        # Paragraph-based chunking: split on blank lines in a single regex pass
+        paragraphs = [p.strip() for p in _PARA_RE.split(markdown) if p.strip()]
 
-        for paragraph in paragraphs:
-            paragraph_size = len(paragraph)
+        # Cumulative size of the paragraphs, each followed by a "\n\n" separator
+        paragraph_ends = np.cumsum(
+            np.fromiter(
+                (len(p) + 2 for p in paragraphs), dtype=np.int64, count=len(paragraphs)
+            )
+        )
 
-            # If adding this paragraph would exceed chunk size, save current chunk
-            if current_size + paragraph_size > self.config.chunk_size and current_chunk:
-                chunks.append(current_chunk.strip())
-                current_chunk = paragraph
-                current_size = paragraph_size
-            else:
-                # Add paragraph to current chunk
-                if current_chunk:
-                    current_chunk += "\n\n" + paragraph
-                    current_size += paragraph_size + 2  # +2 for the newlines
-                else:
-                    current_chunk = paragraph
-                    current_size = paragraph_size
+        # Greedily pack paragraphs: a paragraph joins the current chunk while the
+        # chunk so far plus the paragraph fits chunk_size (the separator joining
+        # them is not counted), so allow both separators on top of chunk_size.
+        chunks = []
+        start = 0
+        chunk_base = 0
+        while start < len(paragraphs):
+            stop = int(
+                np.searchsorted(
+                    paragraph_ends,
+                    chunk_base + self.config.chunk_size + 4,
+                    side="right",
+                )
+            )
+            # Oversized paragraphs still form a chunk of their own
+            stop = max(stop, start + 1)
 
-        # Add the last chunk if it exists
-        if current_chunk.strip():
-            chunks.append(current_chunk.strip())
+            chunks.append("\n\n".join(paragraphs[start:stop]))
+            chunk_base = int(paragraph_ends[stop - 1])
+            start = stop
 
         logger.info(f"Chunked markdown into {len(chunks)} segments")
         return chunks
 
+    @property
+    def embedding_cache(self) -> Optional[EmbeddingCache]:
+        """Embedding cache stored under the data directory, if enabled."""
+        if not self.config.embedding_cache_enabled:
+            return None
+        if self._embedding_cache is None:
+            self._embedding_cache = EmbeddingCache(
+                self.config.base_data_dir / "embedding_cache.db",
+                max_entries=self.config.embedding_cache_max_entries,
+            )
+        return self._embedding_cache
+
+    def _get_cached_embeddings(self, chunks: List[str]) -> Dict[str, List[float]]:
+        """Look up cached embeddings for chunks, ignoring cache failures.
+
+        Args:
+            chunks: List of text chunks
+
+        Returns:
+            Mapping of chunk text to embedding for cache hits
+        """
+        try:
+            cache = self.embedding_cache
+            if cache is None:
+                return {}
+            return cache.get_many(self.config.embedding_model, chunks)
+        except Exception as e:
+            logger.warning(f"Embedding cache lookup failed: {e}")
+            return {}
+
+    def _set_cached_embeddings(self, embeddings: Dict[str, List[float]]) -> None:
+        """Store new embeddings in the cache, ignoring cache failures.
+
+        Args:
+            embeddings: Mapping of chunk text to embedding
+        """
+        try:
+            cache = self.embedding_cache
+            if cache is not None:
+                cache.set_many(self.config.embedding_model, embeddings)
+        except Exception as e:
+            logger.warning(f"Embedding cache update failed: {e}")
+
+    def _count_tokens(self, chunk: str) -> int:
+        """Count the tokens in a chunk, estimating them without a tokenizer."""
+        if _get_encoding(self.config.embedding_model) is None:
+            return _estimate_tokens(chunk)
+        return len(_encode(self.config.embedding_model, chunk))
+
+    def _request_input(self, batch: List[str]) -> Union[List[str], List[List[int]]]:
+        """Build an embeddings request input for a batch of chunks.
+
+        With a tokenizer available, chunks are sent as token IDs, reusing the
+        encodings already computed for batch packing.
+        """
+        if _get_encoding(self.config.embedding_model) is None:
+            return batch
+        return [list(_encode(self.config.embedding_model, chunk)) for chunk in batch]
+
     @retry(
         stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10)
     )
-    def generate_embeddings(self, chunks: List[str]) -> List[List[float]]:
+    def generate_embeddings(
+        self, chunks: List[str], use_cache: bool = True
+    ) -> List[List[float]]:
         """Generate embeddings for text chunks using OpenAI.
 
+        Chunks already in the embedding cache are not sent to the API.
+
         Args:
             chunks: List of text chunks to embed
+            use_cache: Read and write the embedding cache; disable for
+                user queries so their text is never persisted
 
         Returns:
             List of embedding vectors
@@ -141,13 +305,33 @@ class EmbeddingService:
             return []
 
         try:
-            response = self.openai_client.embeddings.create(
-                model=self.config.embedding_model, input=chunks, encoding_format="float"
+            embeddings_by_chunk = (
+                self._get_cached_embeddings(chunks) if use_cache else {}
             )
-
-            embeddings = [data.embedding for data in response.data]
+            # Embed each distinct uncached chunk once
+            misses = [
+                chunk
+                for chunk in dict.fromkeys(chunks)
+                if chunk not in embeddings_by_chunk
+            ]
+
+            if misses:
+                response = self.openai_client.embeddings.create(
+                    model=self.config.embedding_model,
+                    input=self._request_input(misses),
+                    encoding_format="float",
+                )
+                new_embeddings = {
+                    chunk: data.embedding for chunk, data in zip(misses, response.data)
+                }
+                if use_cache:
+                    self._set_cached_embeddings(new_embeddings)
+                embeddings_by_chunk.update(new_embeddings)
+
+            embeddings = [embeddings_by_chunk[chunk] for chunk in chunks]
             logger.info(
-                f"Generated {len(embeddings)} embeddings using {self.config.embedding_model}"
+                f"Generated {len(embeddings)} embeddings using {self.config.embedding_model} "
+                f"({len(misses)} from API, {len(chunks) - len(misses)} cached)"
             )
             return embeddings
 
@@ -155,8 +339,350 @@ class EmbeddingService:
             logger.error(f"Failed to generate embeddings: {e}")
             raise
 
+    def _pack_batches(
+        self, chunks: List[str], max_batch_tokens: Optional[int] = None
+    ) -> List[List[str]]:
+        """Greedily pack chunks into batches that fit one embeddings request.
+
+        Args:
+            chunks: List of text chunks to pack
+            max_batch_tokens: Token budget per batch (defaults to config value)
+
+        Returns:
+            List of chunk batches, in original order
+        """
+        max_tokens = max_batch_tokens or self.config.embedding_max_batch_tokens
+        max_inputs = self.config.embedding_batch_size
+
+        batches = []
+        current_batch = []
+        current_tokens = 0
+
+        for chunk in chunks:
+            chunk_tokens = self._count_tokens(chunk)
+
+            # Start a new batch when either the input or token limit would be hit
+            if current_batch and (
+                len(current_batch) >= max_inputs
+                or current_tokens + chunk_tokens > max_tokens
+            ):
+                batches.append(current_batch)
+                current_batch = []
+                current_tokens = 0
+
+            current_batch.append(chunk)
+            current_tokens += chunk_tokens
+
+        if current_batch:
+            batches.append(current_batch)
+
+        return batches
+
+    def generate_embeddings_batched(
+        self, chunks: List[str], max_batch_tokens: Optional[int] = None
+    ) -> List[List[float]]:
+        """Generate embeddings for any number of chunks using as few requests as possible.
+
+        Args:
+            chunks: List of text chunks to embed
+            max_batch_tokens: Token budget per request (defaults to config value)
+
+        Returns:
+            List of embedding vectors, in the same order as chunks
+        """
+        if not chunks:
+            return []
+
+        batches = self._pack_batches(chunks, max_batch_tokens)
+
+        embeddings = []
+        for batch in batches:
+            embeddings.extend(self.generate_embeddings(batch))
+
+        logger.info(
+            f"Generated {len(embeddings)} embeddings in {len(batches)} request(s)"
+        )
+        return embeddings
+
+    @property
+    def async_openai_client(self) -> AsyncOpenAI:
+        """Async OpenAI client, created lazily for the async embedding path."""
+        if self._async_openai_client is None:
+            self._async_openai_client = AsyncOpenAI(api_key=self.config.openai_api_key)
+        return self._async_openai_client
+
+    @property
+    def rate_limiter(self) -> AsyncTokenBucket:
+        """Rate limiter shared by all async embeddings requests of this service."""
+        if self._rate_limiter is None:
+            self._rate_limiter = AsyncTokenBucket(
+                rpm=self.config.embedding_rpm, tpm=self.config.embedding_tpm
+            )
+        return self._rate_limiter
+
+    @retry(
+        stop=stop_after_attempt(6),
+        wait=wait_random_exponential(multiplier=1, max=60),
+        retry=retry_if_exception_type(
+            (openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError)
+        ),
+    )
+    async def _aembed_batch(self, batch: List[str]) -> List[List[float]]:
+        """Embed a single batch of chunks with the async OpenAI client.
+
+        Waits for rate limit capacity first; rate limit and connection errors
+        are retried with jittered exponential backoff.
+
+        Args:
+            batch: Chunks that fit in one embeddings request
+
+        Returns:
+            List of embedding vectors for the batch
+        """
+        await self.rate_limiter.acquire(
+            sum(self._count_tokens(chunk) for chunk in batch)
+        )
+
+        response = await self.async_openai_client.embeddings.create(
+            model=self.config.embedding_model,
+            input=self._request_input(batch),
+            encoding_format="float",
+        )
+        return [data.embedding for data in response.data]
+
+    async def agenerate_embeddings(
+        self, chunks: List[str], max_batch_tokens: Optional[int] = None
+    ) -> List[List[float]]:
+        """Generate embeddings concurrently, one request per batch.
+
+        At most config.embedding_concurrency requests are in flight at once,
+        and chunks already in the embedding cache are not sent to the API.
+        With config.embedding_use_batch_api set, large ingests go through the
+        Batch API instead.
+
+        Args:
+            chunks: List of text chunks to embed
+            max_batch_tokens: Token budget per request (defaults to config value)
+
+        Returns:
+            List of embedding vectors, in the same order as chunks
+        """
+        if not chunks:
+            return []
+
+        embeddings_by_chunk = self._get_cached_embeddings(chunks)
+        misses = [
+            chunk for chunk in dict.fromkeys(chunks) if chunk not in embeddings_by_chunk
+        ]
+
+        if self._use_batch_api(misses):
+            miss_embeddings = await self.agenerate_embeddings_via_batch(
+                misses, max_batch_tokens
+            )
+        else:
+            miss_embeddings = await self._aembed_concurrently(misses, max_batch_tokens)
+
+        new_embeddings = dict(zip(misses, miss_embeddings))
+        self._set_cached_embeddings(new_embeddings)
+        embeddings_by_chunk.update(new_embeddings)
+
+        logger.info(
+            f"Generated {len(chunks)} embeddings, {len(chunks) - len(misses)} cached"
+        )
+        return [embeddings_by_chunk[chunk] for chunk in chunks]
+
+    def _use_batch_api(self, misses: List[str]) -> bool:
+        """Check whether uncached chunks are numerous enough for the Batch API."""
+        return (
+            self.config.embedding_use_batch_api
+            and len(misses) >= self.config.embedding_batch_api_min_chunks
+        )
+
+    async def _aembed_ingest_via_batch(
+        self, chunks: List[str]
+    ) -> Dict[str, List[float]]:
+        """Embed a whole ingest through the Batch API if it is large enough.
+
+        The Batch API threshold applies to all uncached chunks of the ingest,
+        so it is checked here rather than per pipeline batch, as each of those
+        is far smaller than the threshold.
+
+        Args:
+            chunks: All text chunks of the ingest
+
+        Returns:
+            Mapping of chunk text to embedding covering every chunk, or an
+            empty dict if the chunks should be embedded with regular requests
+        """
+        if not self.config.embedding_use_batch_api:
+            return {}
+
+        embeddings_by_chunk = self._get_cached_embeddings(chunks)
+        misses = [
+            chunk for chunk in dict.fromkeys(chunks) if chunk not in embeddings_by_chunk
+        ]
+        if not self._use_batch_api(misses):
+            return {}
+
+        new_embeddings = dict(
+            zip(misses, await self.agenerate_embeddings_via_batch(misses))
+        )
+        self._set_cached_embeddings(new_embeddings)
+        embeddings_by_chunk.update(new_embeddings)
+        return embeddings_by_chunk
+
+    async def _aembed_concurrently(
+        self, chunks: List[str], max_batch_tokens: Optional[int] = None
+    ) -> List[List[float]]:
+        """Embed chunks with one concurrent request per batch.
+
+        Args:
+            chunks: List of text chunks to embed
+            max_batch_tokens: Token budget per request (defaults to config value)
+
+        Returns:
+            List of embedding vectors, in the same order as chunks
+        """
+        batches = self._pack_batches(chunks, max_batch_tokens)
+        semaphore = asyncio.Semaphore(self.config.embedding_concurrency)
+
+        async def embed_with_limit(batch: List[str]) -> List[List[float]]:
+            async with semaphore:
+                return await self._aembed_batch(batch)
+
+        try:
+            results = await asyncio.gather(
+                *(embed_with_limit(batch) for batch in batches)
+            )
+        except Exception as e:
+            logger.error(f"Failed to generate embeddings: {e}")
+            raise
+
+        logger.info(
+            f"Embedded {len(chunks)} chunks in {len(batches)} concurrent request(s)"
+        )
+        return [embedding for result in results for embedding in result]
+
+    async def agenerate_embeddings_via_batch(
+        self, chunks: List[str], max_batch_tokens: Optional[int] = None
+    ) -> List[List[float]]:
+        """Generate embeddings through the OpenAI Batch API.
+
+        Batch jobs cost half as much and have their own, higher rate limits,
+        but may take up to 24 hours, so this is only meant for bulk ingest.
+
+        Args:
+            chunks: List of text chunks to embed
+            max_batch_tokens: Token budget per batch request line (defaults to
+                config value)
+
+        Returns:
+            List of embedding vectors, in the same order as chunks
+
+        Raises:
+            RuntimeError: If the batch job or any of its requests fails, or the
+                job does not finish within _BATCH_POLL_TIMEOUT seconds
+        """
+        if not chunks:
+            return []
+
+        batches = self._pack_batches(chunks, max_batch_tokens)
+        requests_jsonl = b"\n".join(
+            orjson.dumps(
+                {
+                    "custom_id": str(batch_index),
+                    "method": "POST",
+                    "url": "/v1/embeddings",
+                    "body": {
+                        "model": self.config.embedding_model,
+                        "input": self._request_input(batch),
+                        "encoding_format": "float",
+                    },
+                }
+            )
+            for batch_index, batch in enumerate(batches)
+        )
+
+        client = self.async_openai_client
+        input_file = await client.files.create(
+            file=("embeddings_batch.jsonl", requests_jsonl, "application/jsonl"),
+            purpose="batch",
+        )
+        # Batch files are deleted whatever the outcome, so failed jobs don't
+        # leave request data behind
+        batch_file_ids = [input_file.id]
+        try:
+            batch_job = await client.batches.create(
+                input_file_id=input_file.id,
+                endpoint="/v1/embeddings",
+                completion_window="24h",
+            )
+            logger.info(
+                f"Submitted embeddings batch {batch_job.id} with {len(chunks)} chunks "
+                f"in {len(batches)} request(s)"
+            )
+
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + _BATCH_POLL_TIMEOUT
+            while batch_job.status not in _BATCH_TERMINAL_STATUSES:
+                if loop.time() >= deadline:
+                    try:
+                        await client.batches.cancel(batch_job.id)
+                    except Exception as e:
+                        logger.warning(f"Failed to cancel batch {batch_job.id}: {e}")
+                    raise RuntimeError(
+                        f"Embeddings batch {batch_job.id} did not finish within "
+                        f"{_BATCH_POLL_TIMEOUT} seconds (status {batch_job.status})"
+                    )
+                await asyncio.sleep(_BATCH_POLL_INTERVAL)
+                batch_job = await client.batches.retrieve(batch_job.id)
+
+            if batch_job.output_file_id:
+                batch_file_ids.append(batch_job.output_file_id)
+            if batch_job.status != "completed" or not batch_job.output_file_id:
+                raise RuntimeError(
+                    f"Embeddings batch {batch_job.id} ended with status {batch_job.status}"
+                )
+
+            output = await client.files.content(batch_job.output_file_id)
+        finally:
+            for file_id in batch_file_ids:
+                try:
+                    await client.files.delete(file_id)
+                except Exception as e:
+                    logger.warning(f"Failed to delete batch file {file_id}: {e}")
+
+        # Output lines are not guaranteed to be in request order
+        results: List[Optional[List[List[float]]]] = [None] * len(batches)
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            record = orjson.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") != 200:
+                raise RuntimeError(
+                    f"Embeddings batch request {record['custom_id']} failed: "
+                    f"{record.get('error') or response.get('body')}"
+                )
+            data = sorted(response["body"]["data"], key=lambda item: item["index"])
+            results[int(record["custom_id"])] = [item["embedding"] for item in data]
+
+        missing = [str(i) for i, result in enumerate(results) if result is None]
+        if missing:
+            raise RuntimeError(
+                f"Embeddings batch {batch_job.id} is missing results for "
+                f"request(s) {', '.join(missing)}"
+            )
+
+        logger.info(f"Embeddings batch {batch_job.id} completed")
+        return [embedding for result in results for embedding in result]
+
     def store_chunks(
-        self, chunks: List[str], embeddings: List[List[float]], metadata: Dict[str, Any]
+        self,
+        chunks: List[str],
+        embeddings: List[List[float]],
+        metadata: Dict[str, Any],
+        start_index: int = 0,
     ) -> None:
         """Store chunks with embeddings in Chroma vector database.
 
@@ -164,6 +690,8 @@ class EmbeddingService:
             chunks: List of text chunks
             embeddings: List of embedding vectors
             metadata: Base metadata to attach to all chunks
+            start_index: Position of the first chunk within its report, used
+                when a report is stored in several parts
         """
         if len(chunks) != len(embeddings):
             raise ValueError("Number of chunks must match number of embeddings")
@@ -174,31 +702,37 @@ class EmbeddingService:
 
         try:
             # Generate unique IDs for each chunk
-            chunk_ids = []
+            id_prefix = f"{metadata.get('report_id', 'unknown')}_"
+            chunk_ids = [
+                f"{id_prefix}{i}" for i in range(start_index, start_index + len(chunks))
+            ]
+
+            # Create metadata for each chunk from a shared template
+            metadata_template = {
+                **metadata,
+                "content_type": "paragraph",  # Default content type
+            }
             chunk_metadatas = []
-
-            for i, chunk in enumerate(chunks):
-                chunk_id = f"{metadata.get('report_id', 'unknown')}_{i}"
-                chunk_ids.append(chunk_id)
-
-                # Create metadata for this chunk
-                chunk_metadata = metadata.copy()
-                chunk_metadata.update(
-                    {
-                        "chunk_index": i,
-                        "content_type": "paragraph",  # Default content type
-                        "chunk_size": len(chunk),
-                    }
-                )
+            for i, chunk in enumerate(chunks, start=start_index):
+                chunk_metadata = metadata_template.copy()
+                chunk_metadata["chunk_index"] = i
+                chunk_metadata["chunk_size"] = len(chunk)
                 chunk_metadatas.append(chunk_metadata)
 
-            # Store in Chroma
-            self.collection.add(
-                documents=chunks,
-                embeddings=embeddings,
-                metadatas=chunk_metadatas,
-                ids=chunk_ids,
-            )
+            # Chroma's index is float32, so convert once here rather than
+            # shipping Python float lists through its validation layer
+            embedding_array = np.asarray(embeddings, dtype=np.float32)
+
+            # Store in Chroma in bounded batches to cap peak memory per call
+            batch_size = self.config.chroma_batch_size
+            for start in range(0, len(chunks), batch_size):
+                end = start + batch_size
+                self.collection.add(
+                    documents=chunks[start:end],
+                    embeddings=embedding_array[start:end],
+                    metadatas=chunk_metadatas[start:end],
+                    ids=chunk_ids[start:end],
+                )
 
             logger.info(f"Stored {len(chunks)} chunks in vector database")
 
@@ -206,6 +740,42 @@ class EmbeddingService:
             logger.error(f"Failed to store chunks in vector database: {e}")
             raise
 
+    def _prepare_report_ingest(
+        self, markdown_content: str, report_metadata: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Check whether a report needs (re-)embedding and clear stale chunks.
+
+        Args:
+            markdown_content: The markdown content of the report
+            report_metadata: Metadata about the report
+
+        Returns:
+            Metadata to store with the report's chunks, including its content
+            hash, or None if the same content is already stored
+        """
+        content_hash = _content_hash(markdown_content)
+        report_id = report_metadata.get("report_id")
+
+        if report_id is not None:
+            existing = self.collection.get(
+                where={
+                    "$and": [
+                        {"report_id": report_id},
+                        {"content_hash": content_hash},
+                    ]
+                },
+                limit=1,
+                include=[],
+            )
+            if existing["ids"]:
+                logger.info(f"Report {report_id} unchanged, skipping embeddings")
+                return None
+
+            # Content changed or was never stored: drop any previous chunks
+            self.delete_report_chunks(report_id)
+
+        return {**report_metadata, "content_hash": content_hash}
+
     def process_report_embeddings(
         self, markdown_content: str, report_metadata: Dict[str, Any]
     ) -> None:
@@ -216,6 +786,12 @@ class EmbeddingService:
             report_metadata: Metadata about the report (user_id, report_id, etc.)
         """
         try:
+            report_metadata = self._prepare_report_ingest(
+                markdown_content, report_metadata
+            )
+            if report_metadata is None:
+                return
+
             # Chunk the markdown content
             chunks = self.chunk_markdown(markdown_content)
 
@@ -226,7 +802,7 @@ class EmbeddingService:
                 return
 
             # Generate embeddings
-            embeddings = self.generate_embeddings(chunks)
+            embeddings = self.generate_embeddings_batched(chunks)
 
             # Store chunks with embeddings
             self.store_chunks(chunks, embeddings, report_metadata)
@@ -239,6 +815,223 @@ class EmbeddingService:
             logger.error(f"Failed to process report embeddings: {e}")
             raise
 
+    async def aprocess_report_embeddings(
+        self, markdown_content: str, report_metadata: Dict[str, Any]
+    ) -> None:
+        """Process a complete report for embeddings storage using concurrent requests.
+
+        Embedding and storage run as a pipeline: batches are stored in Chroma
+        as soon as they are embedded, while later batches are still in flight.
+
+        Args:
+            markdown_content: The markdown content of the report
+            report_metadata: Metadata about the report (user_id, report_id, etc.)
+        """
+        try:
+            chunked_report = await self._achunk_report(
+                markdown_content, report_metadata
+            )
+            if chunked_report is None:
+                return
+
+            chunks, report_metadata = chunked_report
+            embeddings_by_chunk = await self._aembed_ingest_via_batch(chunks)
+            await self._run_embedding_pipeline(
+                chunks, report_metadata, embeddings_by_chunk
+            )
+
+            logger.info(
+                f"Successfully processed embeddings for report {report_metadata.get('report_id')}"
+            )
+
+        except Exception as e:
+            logger.error(f"Failed to process report embeddings: {e}")
+            raise
+
+    async def _achunk_report(
+        self, markdown_content: str, report_metadata: Dict[str, Any]
+    ) -> Optional[Tuple[List[str], Dict[str, Any]]]:
+        """Prepare a report for async ingest and split it into chunks.
+
+        Args:
+            markdown_content: The markdown content of the report
+            report_metadata: Metadata about the report
+
+        Returns:
+            The report's chunks and the metadata to store with them, or None
+            if the report is unchanged or produced no chunks
+        """
+        # Chroma reads and deletes are blocking, keep them off the event loop
+        report_metadata = await asyncio.to_thread(
+            self._prepare_report_ingest, markdown_content, report_metadata
+        )
+        if report_metadata is None:
+            return None
+
+        chunks = self.chunk_markdown(markdown_content)
+        if not chunks:
+            logger.warning(
+                f"No chunks generated for report {report_metadata.get('report_id')}"
+            )
+            return None
+
+        return chunks, report_metadata
+
+    async def _run_embedding_pipeline(
+        self,
+        chunks: List[str],
+        report_metadata: Dict[str, Any],
+        embeddings_by_chunk: Optional[Dict[str, List[float]]] = None,
+    ) -> None:
+        """Embed and store chunks with overlapping embedding and storage stages.
+
+        A producer queues request-sized batches, embedding_concurrency workers
+        embed them, and a single writer stores each embedded batch in Chroma.
+        Both queues are bounded so memory stays flat for large reports.
+
+        Args:
+            chunks: Chunks of one report, in order
+            report_metadata: Metadata about the report
+            embeddings_by_chunk: Embeddings already generated for every chunk,
+                e.g. through the Batch API; batches are then stored without
+                further requests
+        """
+        worker_count = self.config.embedding_concurrency
+        embed_queue: asyncio.Queue = asyncio.Queue(maxsize=worker_count)
+        store_queue: asyncio.Queue = asyncio.Queue(maxsize=worker_count)
+
+        async def produce() -> None:
+            start_index = 0
+            for batch in self._pack_batches(chunks):
+                await embed_queue.put((start_index, batch))
+                start_index += len(batch)
+            for _ in range(worker_count):
+                await embed_queue.put(None)
+
+        async def embed() -> None:
+            while (item := await embed_queue.get()) is not None:
+                start_index, batch = item
+                if embeddings_by_chunk:
+                    embeddings = [embeddings_by_chunk[chunk] for chunk in batch]
+                else:
+                    embeddings = await self.agenerate_embeddings(batch)
+                await store_queue.put((start_index, batch, embeddings))
+            await store_queue.put(None)
+
+        async def store() -> None:
+            finished_workers = 0
+            while finished_workers < worker_count:
+                item = await store_queue.get()
+                if item is None:
+                    finished_workers += 1
+                    continue
+                start_index, batch, embeddings = item
+                # Chroma writes are blocking, keep them off the event loop
+                await asyncio.to_thread(
+                    self.store_chunks, batch, embeddings, report_metadata, start_index
+                )
+
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                task_group.create_task(produce())
+                for _ in range(worker_count):
+                    task_group.create_task(embed())
+                task_group.create_task(store())
+        except ExceptionGroup as eg:
+            # Surface the underlying failure rather than the group wrapper
+            raise eg.exceptions[0] from None
+
+    def process_reports_embeddings(
+        self, reports: List[Tuple[str, Dict[str, Any]]]
+    ) -> None:
+        """Process several reports, sharing embedding requests across them.
+
+        Chunks from all reports are embedded together so small reports don't
+        each pay for a separate round-trip.
+
+        Args:
+            reports: List of (markdown_content, report_metadata) pairs
+        """
+        try:
+            chunked_reports = []
+            for markdown_content, report_metadata in reports:
+                report_metadata = self._prepare_report_ingest(
+                    markdown_content, report_metadata
+                )
+                if report_metadata is not None:
+                    chunked_reports.append(
+                        (self.chunk_markdown(markdown_content), report_metadata)
+                    )
+
+            all_chunks = [chunk for chunks, _ in chunked_reports for chunk in chunks]
+
+            embeddings = self.generate_embeddings_batched(all_chunks)
+
+            # Split embeddings back out per report, in the same order
+            offset = 0
+            for chunks, report_metadata in chunked_reports:
+                if not chunks:
+                    logger.warning(
+                        f"No chunks generated for report {report_metadata.get('report_id')}"
+                    )
+                    continue
+
+                self.store_chunks(
+                    chunks, embeddings[offset : offset + len(chunks)], report_metadata
+                )
+                offset += len(chunks)
+
+            logger.info(f"Successfully processed embeddings for {len(reports)} reports")
+
+        except Exception as e:
+            logger.error(f"Failed to process embeddings for reports: {e}")
+            raise
+
+    async def aprocess_reports_embeddings(
+        self, reports: List[Tuple[str, Dict[str, Any]]]
+    ) -> None:
+        """Process several reports concurrently.
+
+        Each report runs its own embedding pipeline. All pipelines share this
+        service's rate limiter, so together they stay within the RPM/TPM budget.
+        Whether to use the Batch API is decided once, over all reports' chunks.
+
+        Args:
+            reports: List of (markdown_content, report_metadata) pairs
+        """
+        try:
+            chunked_reports = [
+                chunked_report
+                for chunked_report in await asyncio.gather(
+                    *(
+                        self._achunk_report(markdown_content, report_metadata)
+                        for markdown_content, report_metadata in reports
+                    )
+                )
+                if chunked_report is not None
+            ]
+
+            embeddings_by_chunk = await self._aembed_ingest_via_batch(
+                [chunk for chunks, _ in chunked_reports for chunk in chunks]
+            )
+
+            async with asyncio.TaskGroup() as task_group:
+                for chunks, report_metadata in chunked_reports:
+                    task_group.create_task(
+                        self._run_embedding_pipeline(
+                            chunks, report_metadata, embeddings_by_chunk
+                        )
+                    )
+        except ExceptionGroup as eg:
+            logger.error(f"Failed to process embeddings for reports: {eg}")
+            # Surface the underlying failure rather than the group wrapper
+            raise eg.exceptions[0] from None
+        except Exception as e:
+            logger.error(f"Failed to process embeddings for reports: {e}")
+            raise
+
+        logger.info(f"Successfully processed embeddings for {len(reports)} reports")
+
     def search_similar(
         self, query: str, user_filter: Optional[str] = None, k: int = 5
     ) -> List[Dict[str, Any]]:
@@ -252,13 +1045,33 @@ class EmbeddingService:
         Returns:
             List of search results with content and metadata
         """
+        return self.search_similar_batch([query], user_filter=user_filter, k=k)[0]
+
+    def search_similar_batch(
+        self, queries: List[str], user_filter: Optional[str] = None, k: int = 5
+    ) -> List[List[Dict[str, Any]]]:
+        """Search for chunks similar to each of several queries.
+
+        All queries are embedded in one request and searched in one Chroma
+        query.
+
+        Args:
+            queries: Search query texts
+            user_filter: Optional user external ID to filter results
+            k: Number of results to return per query
+
+        Returns:
+            One list of search results per query, in the same order as queries
+        """
+        if not queries:
+            return []
+
         try:
-            # Generate embedding for query
-            query_embeddings = self.generate_embeddings([query])
+            # Generate embeddings for all queries at once; queries bypass the
+            # cache so user search text is never written to disk
+            query_embeddings = self.generate_embeddings(queries, use_cache=False)
             if not query_embeddings:
-                return []
-
-            query_embedding = query_embeddings[0]
+                return [[] for _ in queries]
 
             # Prepare where clause for user filtering
             where_clause = {}
@@ -268,7 +1081,7 @@ class EmbeddingService:
             # Search in Chroma with error recovery
             try:
                 results = self.collection.query(
-                    query_embeddings=[query_embedding],
+                    query_embeddings=query_embeddings,
                     n_results=k,
                     where=where_clause if where_clause else None,
                     include=["documents", "metadatas", "distances"],
@@ -284,7 +1097,7 @@ class EmbeddingService:
                     self.refresh_collection()
 
                     results = self.collection.query(
-                        query_embeddings=[query_embedding],
+                        query_embeddings=query_embeddings,
                         n_results=k,
                         where=where_clause if where_clause else None,
                         include=["documents", "metadatas", "distances"],
@@ -295,24 +1108,37 @@ class EmbeddingService:
                     raise
 
             # Format results
-            search_results = []
-            if results["documents"] and results["documents"][0]:
-                for i in range(len(results["documents"][0])):
-                    # Convert distance to relevance score (0-1 range)
-                    # Use exponential decay to handle distances > 1.0
-                    distance = results["distances"][0][i]
-                    relevance_score = max(0.0, min(1.0, 1.0 / (1.0 + distance)))
-
-                    result = {
-                        "content": results["documents"][0][i],
-                        "metadata": results["metadatas"][0][i],
-                        "distance": distance,
-                        "relevance_score": relevance_score,
-                    }
-                    search_results.append(result)
-
-            logger.info(f"Found {len(search_results)} similar chunks for query")
-            return search_results
+            batch_results = []
+            for documents, metadatas, distances in zip(
+                results["documents"] or [[] for _ in queries],
+                results["metadatas"] or [[] for _ in queries],
+                results["distances"] or [[] for _ in queries],
+            ):
+                # Convert distances to relevance scores (0-1 range) in one pass.
+                # Use exponential decay to handle distances > 1.0
+                relevance_scores = np.clip(
+                    1.0 / (1.0 + np.asarray(distances, dtype=np.float64)), 0.0, 1.0
+                ).tolist()
+
+                batch_results.append(
+                    [
+                        {
+                            "content": document,
+                            "metadata": metadata,
+                            "distance": distance,
+                            "relevance_score": relevance_score,
+                        }
+                        for document, metadata, distance, relevance_score in zip(
+                            documents, metadatas, distances, relevance_scores
+                        )
+                    ]
+                )
+
+            logger.info(
+                f"Found {sum(len(r) for r in batch_results)} similar chunks "
+                f"for {len(queries)} query(ies)"
+            )
+            return batch_results
 
         except Exception as e:
             logger.error(f"Failed to search similar chunks: {e}")
@@ -0,0 +1,70 @@
+"""Async rate limiting for OpenAI API requests."""
+
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTokenBucket:
+    """Token bucket enforcing requests-per-minute and tokens-per-minute budgets.
+
+    Both budgets refill continuously. Callers that would exceed either budget
+    wait until enough capacity is available, in the order they arrived.
+    """
+
+    def __init__(self, rpm: int, tpm: int):
+        """Initialize the bucket with full capacity.
+
+        Args:
+            rpm: Maximum requests per minute
+            tpm: Maximum tokens per minute
+        """
+        if rpm <= 0 or tpm <= 0:
+            raise ValueError("rpm and tpm must be positive")
+
+        self.rpm = rpm
+        self.tpm = tpm
+        self._request_allowance = float(rpm)
+        self._token_allowance = float(tpm)
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """Add capacity for the time elapsed since the last refill."""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+
+        self._request_allowance = min(
+            float(self.rpm), self._request_allowance + elapsed * self.rpm / 60
+        )
+        self._token_allowance = min(
+            float(self.tpm), self._token_allowance + elapsed * self.tpm / 60
+        )
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """Wait until one request using the given number of tokens is allowed.
+
+        Args:
+            tokens: Estimated tokens the request will consume
+        """
+        # A request larger than the whole budget can still go once the bucket is full
+        tokens = min(tokens, self.tpm)
+
+        async with self._lock:
+            while True:
+                self._refill()
+
+                if self._request_allowance >= 1 and self._token_allowance >= tokens:
+                    self._request_allowance -= 1
+                    self._token_allowance -= tokens
+                    return
+
+                request_wait = max(0.0, 1 - self._request_allowance) * 60 / self.rpm
+                token_wait = max(0.0, tokens - self._token_allowance) * 60 / self.tpm
+                wait_seconds = max(request_wait, token_wait)
+
+                logger.debug(f"Rate limit reached, waiting {wait_seconds:.2f}s")
+                await asyncio.sleep(wait_seconds)
@@ -1,10 +1,14 @@
 """Database service for healthcare agent."""
 
 import logging
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import List, Optional
 
-from sqlmodel import Session, SQLModel, create_engine, select
+from sqlalchemy import Engine, event
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, SQLModel, create_engine, insert, select
 
 from healthcare.config.config import Config
 from healthcare.storage.models import (
@@ -15,16 +19,50 @@ from healthcare.storage.models import (
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of external ID to user lookups kept per DatabaseService
+USER_CACHE_SIZE = 1024
+
+# Applied to every new SQLite connection: WAL journaling with NORMAL sync
+# fsyncs on checkpoints instead of every commit, and temp tables and a 64 MB
+# page cache stay in memory
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+)
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Configure a new SQLite connection for fast commits."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
 
 class DatabaseService:
     """Service for managing database operations."""
 
-    def __init__(self, config: Config):
-        """Initialize database service with configuration."""
+    def __init__(self, config: Config, engine: Optional[Engine] = None):
+        """Initialize database service with configuration.
+
+        Args:
+            config: Application configuration
+            engine: Optional pre-built engine (for testing); the caller keeps
+                ownership and close() leaves it open
+        """
         self.config = config
         self.db_path = config.medical_db_path
-        self.engine = None
-        self._initialize_engine()
+        self.engine = engine
+        self._owns_engine = engine is None
+        # Users are never deleted, so a resolved external ID stays valid
+        self._user_cache: OrderedDict[str, User] = OrderedDict()
+        self._user_cache_lock = threading.Lock()
+        if self._owns_engine:
+            self._initialize_engine()
 
     def _initialize_engine(self) -> None:
         """Initialize SQLite database engine."""
@@ -38,6 +76,7 @@ class DatabaseService:
             connect_args={"check_same_thread": False},
             echo=False,  # Set to True for SQL debugging
         )
+        event.listen(self.engine, "connect", _apply_sqlite_pragmas)
         logger.info(f"Database engine initialized: {database_url}")
 
     def create_tables(self) -> None:
@@ -57,6 +96,12 @@ class DatabaseService:
 
     def get_or_create_user(self, external_id: str) -> User:
         """Get existing user or create new one."""
+        with self._user_cache_lock:
+            user = self._user_cache.get(external_id)
+            if user is not None:
+                self._user_cache.move_to_end(external_id)
+                return user
+
         with self.get_session() as session:
             # Try to find existing user
             statement = select(User).where(User.external_id == external_id)
@@ -64,15 +109,60 @@ class DatabaseService:
 
             if user:
                 logger.debug(f"Found existing user: {external_id}")
-                return user
+            else:
+                # Create new user
+                user = User(external_id=external_id)
+                session.add(user)
+                session.commit()
+                session.refresh(user)
+                logger.info(f"Created new user: {external_id}")
+
+        self._remember_user(user)
+        return user
+
+    def _remember_user(self, user: User) -> None:
+        """Add a user to the lookup cache, evicting the least recently used."""
+        with self._user_cache_lock:
+            self._user_cache[user.external_id] = user
+            self._user_cache.move_to_end(user.external_id)
+            if len(self._user_cache) > USER_CACHE_SIZE:
+                self._user_cache.popitem(last=False)
+
+    def bulk_get_or_create_users(self, external_ids: List[str]) -> List[User]:
+        """Get or create several users with a single upsert.
+
+        Args:
+            external_ids: External user identifiers
+
+        Returns:
+            One user per distinct external ID, in input order
+        """
+        external_ids = list(dict.fromkeys(external_ids))
+        if not external_ids:
+            return []
+
+        rows = [
+            User(external_id=external_id).model_dump(exclude={"id"})
+            for external_id in external_ids
+        ]
+        statement = sqlite_insert(User).values(rows)
+        # A no-op update makes RETURNING yield existing users as well
+        statement = statement.on_conflict_do_update(
+            index_elements=[User.external_id],
+            set_={"external_id": statement.excluded.external_id},
+        ).returning(User)
 
-            # Create new user
-            user = User(external_id=external_id)
-            session.add(user)
+        with self.get_session() as session:
+            users = {user.external_id: user for user in session.scalars(statement)}
+            # Detach before committing so the returned rows stay loaded
+            session.expunge_all()
             session.commit()
-            session.refresh(user)
-            logger.info(f"Created new user: {external_id}")
-            return user
+
+        for user in users.values():
+            self._remember_user(user)
+
+        logger.info(f"Got or created {len(users)} users")
+        return [users[external_id] for external_id in external_ids]
 
     def create_medical_report(self, user_id: int, report_data: dict) -> MedicalReport:
         """Create a new medical report record."""
@@ -98,20 +188,67 @@ class DatabaseService:
             logger.info(f"Created medical report: {report.id}")
             return report
 
+    def bulk_create_medical_reports(self, reports: List[dict]) -> List[MedicalReport]:
+        """Create several medical report records with a single upsert.
+
+        Like create_medical_report, a report whose user already has the same
+        file hash is not duplicated; the existing record is returned instead.
+
+        Args:
+            reports: Report fields, each including user_id
+
+        Returns:
+            One report per distinct (user_id, file_hash), in input order
+        """
+        rows = {}
+        for report_data in reports:
+            row = MedicalReport(**report_data).model_dump(exclude={"id"})
+            rows.setdefault((row["user_id"], row["file_hash"]), row)
+        if not rows:
+            return []
+
+        statement = sqlite_insert(MedicalReport).values(list(rows.values()))
+        # A no-op update makes RETURNING yield existing reports as well
+        statement = statement.on_conflict_do_update(
+            index_elements=[MedicalReport.user_id, MedicalReport.file_hash],
+            set_={"file_hash": statement.excluded.file_hash},
+        ).returning(MedicalReport)
+
+        with self.get_session() as session:
+            created = {
+                (report.user_id, report.file_hash): report
+                for report in session.scalars(statement)
+            }
+            # Detach before committing so the returned rows stay loaded
+            session.expunge_all()
+            session.commit()
+
+        logger.info(f"Created or found {len(created)} medical reports")
+        return [created[key] for key in rows]
+
     def create_report_assets(
         self, report_id: int, assets: List[dict]
     ) -> List[ReportAsset]:
         """Create report asset records."""
-        created_assets = []
-        with self.get_session() as session:
-            for asset_data in assets:
-                asset = ReportAsset(report_id=report_id, **asset_data)
-                session.add(asset)
-                created_assets.append(asset)
+        if not assets:
+            return []
 
+        # Build rows through the model so field defaults like created_at apply
+        rows = [
+            ReportAsset(report_id=report_id, **asset_data).model_dump(exclude={"id"})
+            for asset_data in assets
+        ]
+        with self.get_session() as session:
+            # One multi-row INSERT ... RETURNING instead of an INSERT and a
+            # refresh SELECT per asset. SQLite assigns ids in VALUES order, so
+            # sorting by id restores the input order.
+            created_assets = sorted(
+                session.scalars(insert(ReportAsset).returning(ReportAsset), rows),
+                key=lambda asset: asset.id,
+            )
+            # Detach before committing so the returned rows stay loaded
+            session.expunge_all()
             session.commit()
-            for asset in created_assets:
-                session.refresh(asset)
 
             logger.info(f"Created {len(created_assets)} assets for report {report_id}")
             return created_assets
@@ -137,6 +274,8 @@ class DatabaseService:
 
     def close(self) -> None:
         """Close database connections."""
-        if self.engine:
+        with self._user_cache_lock:
+            self._user_cache.clear()
+        if self.engine and self._owns_engine:
             self.engine.dispose()
             logger.info("Database connections closed")
@@ -40,7 +40,7 @@ class ReportAsset(SQLModel, table=True):
     """Model for tracking report assets like images and tables."""
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    report_id: int = Field(foreign_key="medicalreport.id")
+    report_id: int = Field(foreign_key="medicalreport.id", index=True)
     kind: str  # "image" | "table"
     path: str
     alt_text: Optional[str] = None
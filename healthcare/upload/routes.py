@@ -1,10 +1,10 @@
 """FastAPI routes for PDF upload endpoints."""
 
-import json
 import logging
 from pathlib import Path
 from typing import Annotated
 
+import orjson
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
 from fastapi.responses import JSONResponse
 
@@ -128,7 +128,7 @@ async def upload_pdf(
                 "language": "en",  # Default language
                 "markdown_path": str(markdown_path),
                 "images_dir": str(images_dir),
-                "meta_json": json.dumps(conversion_result.manifest),
+                "meta_json": orjson.dumps(conversion_result.manifest).decode(),
             }
 
             medical_report = db_service.create_medical_report(
@@ -220,9 +220,9 @@ async def upload_pdf(
                 "language": "en",
                 "markdown_path": "",  # Empty - conversion failed
                 "images_dir": "",  # Empty - conversion failed
-                "meta_json": json.dumps(
+                "meta_json": orjson.dumps(
                     {"error": "Conversion failed", "figures": [], "tables": []}
-                ),
+                ).decode(),
             }
 
             medical_report = db_service.create_medical_report(
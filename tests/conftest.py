@@ -0,0 +1,75 @@
+"""Shared pytest fixtures for the test suite."""
+
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _test_env():
+    """Provide a test OpenAI API key for the whole session (per xdist worker)."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("OPENAI_API_KEY", "test-key")
+        yield
+
+
+@pytest.fixture(scope="session")
+def app():
+    """Import the FastAPI app once, after the session test environment is set."""
+    from healthcare.main import app as healthcare_app
+
+    return healthcare_app
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    """Share one test client for the app across the session.
+
+    The lifespan is not entered, so no services or data directories are
+    created at startup. Modules that need them define their own client.
+    """
+    return TestClient(app)
+
+
+@pytest.fixture(scope="session")
+def ramdisk_dir():
+    """Locate a RAM-backed directory for scratch files written by tests.
+
+    PYTEST_RAMDISK overrides the default of /dev/shm. Returns None when the
+    directory is missing or not writable, so tempfile falls back to the
+    system temp directory.
+    """
+    path = os.environ.get("PYTEST_RAMDISK", "/dev/shm")
+    if os.path.isdir(path) and os.access(path, os.W_OK):
+        return path
+    return None
+
+
+@pytest.fixture(scope="module")
+def sqlite_engine():
+    """Provide one in-memory SQLite engine shared by every test in a module.
+
+    StaticPool hands out the same connection each time, so all sessions see
+    one database and its page cache stays warm across tests.
+    """
+    engine = create_engine(
+        "sqlite://",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+
+    # pysqlite defers BEGIN until the first write, which would let a RELEASE
+    # SAVEPOINT commit the outer transaction; let SQLAlchemy emit BEGIN itself
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+    yield engine
+    engine.dispose()
@@ -2,8 +2,6 @@
 
 import json
 import os
-import tempfile
-from pathlib import Path
 from unittest.mock import Mock, patch
 
 import pytest
@@ -20,16 +18,15 @@ IS_CI = os.getenv("CI", "false").lower() in ("true", "1", "yes")
 class TestAgentIntegration:
     """Integration test suite for agent workflow with medical toolkit."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Set up test fixtures; pytest cleans up tmp_path itself."""
         # Create test FastAPI app with agent router
         self.app = FastAPI()
         self.app.include_router(agent_router)
         self.client = TestClient(self.app)
 
-        # Create temporary directory for test data
-        self.temp_dir = tempfile.mkdtemp()
-        self.test_data_dir = Path(self.temp_dir)
+        self.test_data_dir = tmp_path
 
         # Mock configuration
         self.mock_config = Config(
@@ -42,12 +39,6 @@ class TestAgentIntegration:
             medical_db_path=self.test_data_dir / "medical.db",
         )
 
-    def teardown_method(self):
-        """Clean up test fixtures."""
-        import shutil
-
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-
     @pytest.mark.slow
     @patch("healthcare.agent.agent_service.HealthcareAgent")
     def test_agent_chat_with_medical_toolkit(self, mock_healthcare_agent):
@@ -1,6 +1,7 @@
 """Unit tests for healthcare agent service."""
 
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
@@ -9,8 +10,40 @@ from healthcare.agent.agent_service import (
     HealthcareAgent,
     create_healthcare_agent_service,
 )
+from healthcare.agent.toolkit import MedicalToolkit
 from healthcare.config.config import Config
 
+EXPECTED_STATS = {
+    "agent_name": "Healthcare Consultant",
+    "model": "gpt-5-mini",
+    "embedding_model": "text-embedding-3-large",
+    "vector_db": "ChromaDB",
+    "storage": "SQLite",
+    "knowledge_base": "medical_reports",
+    "toolkit_functions": [],
+}
+
+SESSION_MEMORY = [
+    {"role": "user", "content": "Hello"},
+    {"role": "assistant", "content": "Hi there!"},
+]
+
+
+def _storage_with_session():
+    """Build agent storage holding a single session with two messages."""
+    storage = Mock()
+    storage.get_all_sessions.return_value = [
+        SimpleNamespace(created_at="2024-01-15T10:30:00", memory=SESSION_MEMORY)
+    ]
+    return storage
+
+
+def _empty_storage():
+    """Build agent storage without any sessions."""
+    storage = Mock()
+    storage.get_all_sessions.return_value = []
+    return storage
+
 
 class TestHealthcareAgent:
     """Test suite for HealthcareAgent class."""
@@ -104,8 +137,7 @@ class TestHealthcareAgent:
         """Test successful query processing."""
         # Setup mock agent
         mock_agent_instance = Mock()
-        mock_response = Mock()
-        mock_response.content = "This is the agent's response"
+        mock_response = SimpleNamespace(content="This is the agent's response")
         mock_agent_instance.run.return_value = mock_response
         mock_agent.return_value = mock_agent_instance
 
@@ -129,8 +161,7 @@ class TestHealthcareAgent:
         """Test query processing with custom session ID."""
         # Setup mock agent
         mock_agent_instance = Mock()
-        mock_response = Mock()
-        mock_response.content = "Response with custom session"
+        mock_response = SimpleNamespace(content="Response with custom session")
         mock_agent_instance.run.return_value = mock_response
         mock_agent.return_value = mock_agent_instance
 
@@ -167,64 +198,34 @@ class TestHealthcareAgent:
         with pytest.raises(ValueError, match="User external ID is required"):
             self.agent_service.get_conversation_history("   ")
 
-    @patch("healthcare.agent.agent_service.Agent")
-    def test_get_conversation_history_success(self, mock_agent):
-        """Test successful conversation history retrieval."""
-        # Setup mock agent with storage
-        mock_agent_instance = Mock()
-        mock_storage = Mock()
-        mock_session = Mock()
-        mock_session.created_at = "2024-01-15T10:30:00"
-        mock_session.memory = [
-            {"role": "user", "content": "Hello"},
-            {"role": "assistant", "content": "Hi there!"},
-        ]
-        mock_storage.get_all_sessions.return_value = [mock_session]
-        mock_agent_instance.storage = mock_storage
-        mock_agent.return_value = mock_agent_instance
-
-        # Get conversation history
-        history = self.agent_service.get_conversation_history("user123")
-
-        # Verify history
-        assert len(history) == 2
-        assert history[0]["role"] == "user"
-        assert history[0]["content"] == "Hello"
-        assert history[1]["role"] == "assistant"
-        assert history[1]["content"] == "Hi there!"
-
-        # Verify storage was called correctly
-        mock_storage.get_all_sessions.assert_called_once_with(user_id="user123")
-
-    @patch("healthcare.agent.agent_service.Agent")
-    def test_get_conversation_history_no_sessions(self, mock_agent):
-        """Test conversation history retrieval with no sessions."""
-        # Setup mock agent with empty storage
-        mock_agent_instance = Mock()
-        mock_storage = Mock()
-        mock_storage.get_all_sessions.return_value = []
-        mock_agent_instance.storage = mock_storage
-        mock_agent.return_value = mock_agent_instance
+    @pytest.fixture
+    def patched_agent(self):
+        """Patch the Agno Agent class used by the service."""
+        with patch("healthcare.agent.agent_service.Agent") as mock_agent:
+            yield mock_agent
+
+    @pytest.mark.parametrize(
+        "storage_factory,expected",
+        [
+            (_storage_with_session, SESSION_MEMORY),
+            (_empty_storage, []),
+            (lambda: None, []),
+        ],
+        ids=["success", "no_sessions", "no_storage"],
+    )
+    def test_get_conversation_history(self, patched_agent, storage_factory, expected):
+        """Test conversation history retrieval for different storage states."""
+        storage = storage_factory()
+        patched_agent.return_value.storage = storage
 
         # Get conversation history
         history = self.agent_service.get_conversation_history("user123")
 
-        # Verify empty history
-        assert history == []
-
-    @patch("healthcare.agent.agent_service.Agent")
-    def test_get_conversation_history_no_storage(self, mock_agent):
-        """Test conversation history retrieval with no storage."""
-        # Setup mock agent without storage
-        mock_agent_instance = Mock()
-        mock_agent_instance.storage = None
-        mock_agent.return_value = mock_agent_instance
-
-        # Get conversation history
-        history = self.agent_service.get_conversation_history("user123")
+        assert history == expected
 
-        # Verify empty history
-        assert history == []
+        # Verify storage was queried for the user's sessions
+        if storage is not None:
+            storage.get_all_sessions.assert_called_once_with(user_id="user123")
 
     def test_clear_conversation_history_invalid_user(self):
         """Test clear_conversation_history with invalid user ID."""
@@ -287,30 +288,23 @@ class TestHealthcareAgent:
         """Test get_agent_stats when agent is not initialized."""
         stats = self.agent_service.get_agent_stats()
 
-        assert stats["agent_name"] == "Healthcare Consultant"
-        assert stats["model"] == "gpt-5-mini"
-        assert stats["embedding_model"] == "text-embedding-3-large"
-        assert stats["vector_db"] == "ChromaDB"
-        assert stats["storage"] == "SQLite"
-        assert stats["knowledge_base"] == "medical_reports"
-        assert stats["toolkit_functions"] == []
+        assert stats == EXPECTED_STATS
 
-    def test_get_agent_stats_with_agent(self):
-        """Test get_agent_stats when agent is initialized."""
-        # Import the actual class for instance checking
-        from healthcare.agent.toolkit import MedicalToolkit
-
-        # Create a real MedicalToolkit instance with mocks
-        mock_toolkit_instance = MedicalToolkit(
-            config=self.config,
-            db_service=self.mock_db_service,
-            search_service=self.mock_search_service,
-            report_service=self.mock_report_service,
+    @pytest.fixture(scope="class")
+    def toolkit(self):
+        """Create a real MedicalToolkit with mocked services, shared by the class."""
+        return MedicalToolkit(
+            config=Mock(),
+            db_service=Mock(),
+            search_service=Mock(),
+            report_service=Mock(),
         )
 
+    def test_get_agent_stats_with_agent(self, toolkit):
+        """Test get_agent_stats when agent is initialized."""
         # Create mock agent with the toolkit
         mock_agent_instance = Mock()
-        mock_agent_instance.tools = [mock_toolkit_instance]
+        mock_agent_instance.tools = [toolkit]
 
         # Set the agent directly
         self.agent_service._agent = mock_agent_instance
@@ -318,6 +312,8 @@ class TestHealthcareAgent:
         # Get stats
         stats = self.agent_service.get_agent_stats()
 
+        # Same structure as the uninitialized case, with toolkit functions filled in
+        assert EXPECTED_STATS.keys() <= stats.keys()
         assert stats["agent_name"] == "Healthcare Consultant"
         assert stats["model"] == "gpt-5-mini"
         assert len(stats["toolkit_functions"]) == 5
@@ -325,24 +321,6 @@ class TestHealthcareAgent:
         assert "list_reports" in stats["toolkit_functions"]
         assert "search_medical_data" in stats["toolkit_functions"]
 
-    def test_get_agent_stats_error(self):
-        """Test get_agent_stats error handling is robust."""
-        # The get_agent_stats method is designed to be robust and gracefully handle errors
-        # It catches exceptions and returns error information in the response
-        # This test verifies the method doesn't crash on unexpected errors
-
-        # Test that the method is robust enough to handle config errors
-        stats = self.agent_service.get_agent_stats()
-
-        # Should return basic stats structure even if there are issues
-        assert "agent_name" in stats
-        assert "model" in stats
-        assert "embedding_model" in stats
-        assert "vector_db" in stats
-        assert "storage" in stats
-        assert "knowledge_base" in stats
-        assert "toolkit_functions" in stats
-
 
 class TestCreateHealthcareAgentService:
     """Test suite for create_healthcare_agent_service factory function."""
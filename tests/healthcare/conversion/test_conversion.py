@@ -93,6 +93,12 @@ class TestPDFConversionService:
         call_args = mock_openai_client.files.create.call_args
         assert call_args[1]["purpose"] == "assistants"
 
+        # File is passed as a handle, not read into memory
+        filename, file_obj, content_type = call_args[1]["file"]
+        assert filename == "test.pdf"
+        assert content_type == "application/pdf"
+        file_obj.read.assert_not_called()
+
     def test_upload_to_openai_file_not_found(self, conversion_service):
         """Test upload with non-existent file."""
         with pytest.raises(FileNotFoundError, match="PDF file not found"):
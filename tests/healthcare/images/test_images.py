@@ -1,7 +1,11 @@
 """Unit tests for image extraction service."""
 
 import io
+import random
+import time
+from dataclasses import FrozenInstanceError, replace
 from pathlib import Path
+from types import MappingProxyType, SimpleNamespace
 from unittest.mock import MagicMock, Mock, patch
 
 import pikepdf
@@ -10,6 +14,83 @@ from PIL import Image
 
 from healthcare.images import AssetMetadata, ImageExtractionService
 
+# Read-only PDF page with a single JPEG image XObject
+_IMG_OBJ = MappingProxyType({"/Subtype": "/Image", "/Filter": "/DCTDecode"})
+_PAGE = MappingProxyType(
+    {"/Resources": MappingProxyType({"/XObject": MappingProxyType({"Im1": _IMG_OBJ})})}
+)
+
+
+class _FlateObj(dict):
+    """PDF image object stub: dictionary entries plus decompressed stream bytes."""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, entries, data):
+        super().__init__(entries)
+        self._data = data
+
+    def read_bytes(self):
+        return self._data
+
+
+@pytest.fixture(scope="session")
+def rgb_buffer():
+    """Decompressed pixel data for a 100x100 RGB image."""
+    return b"\x00" * (100 * 100 * 3)
+
+
+@pytest.fixture(scope="session")
+def gray_buffer():
+    """Decompressed pixel data for a 50x50 grayscale image."""
+    return b"\x00" * (50 * 50 * 1)
+
+
+def _image(stored_path, page_number, index=None):
+    """Build extracted image metadata for manifest linking tests."""
+    return AssetMetadata(
+        kind="image",
+        original_path=None,
+        stored_path=Path(stored_path),
+        page_number=page_number,
+        index=index,
+    )
+
+
+_SINGLE_IMAGE = (_image("img1.png", 1),)
+_TWO_PAGE_IMAGES = (
+    _image("page-001-img-01.png", 1, 1),
+    _image("page-002-img-01.png", 2, 1),
+)
+_TWO_PAGE_MANIFEST = {
+    "figures": [
+        {"page": 1, "caption": "Figure 1: X-ray image"},
+        {"page": 2, "caption": "Figure 2: Blood test chart"},
+    ]
+}
+
+# (extracted images, manifest, expected (stored path, caption) pairs)
+_LINK_TO_MANIFEST_CASES = [
+    pytest.param(_SINGLE_IMAGE, None, {(Path("img1.png"), None)}, id="no_manifest"),
+    pytest.param(_SINGLE_IMAGE, {}, {(Path("img1.png"), None)}, id="empty_manifest"),
+    pytest.param(
+        _TWO_PAGE_IMAGES,
+        _TWO_PAGE_MANIFEST,
+        {
+            (Path("page-001-img-01.png"), "Figure 1: X-ray image"),
+            (Path("page-002-img-01.png"), "Figure 2: Blood test chart"),
+        },
+        id="with_figures",
+    ),
+    pytest.param(
+        # Index doesn't match, but only one figure on page
+        (_image("page-001-img-01.png", 1, 2),),
+        {"figures": [{"page": 1, "caption": "Single figure on page 1"}]},
+        {(Path("page-001-img-01.png"), "Single figure on page 1")},
+        id="single_figure_per_page",
+    ),
+]
+
 
 class TestAssetMetadata:
     """Test AssetMetadata dataclass."""
@@ -34,6 +115,16 @@ class TestAssetMetadata:
         assert asset.caption == "Figure 1: Test"
         assert asset.index == 1
 
+    def test_asset_metadata_is_frozen(self):
+        """Test AssetMetadata instances are immutable and hashable."""
+        asset = AssetMetadata(
+            kind="image", original_path=None, stored_path=Path("stored.png")
+        )
+
+        with pytest.raises(FrozenInstanceError):
+            asset.caption = "Figure 1"
+        assert asset in {asset}
+
     def test_asset_metadata_optional_fields(self):
         """Test AssetMetadata with minimal required fields."""
         asset = AssetMetadata(
@@ -58,8 +149,18 @@ class TestImageExtractionService:
         self.test_pdf_path = Path("test.pdf")
         self.test_output_dir = Path("test_output")
 
+    @pytest.fixture(autouse=True)
+    def pdf_open(self, monkeypatch):
+        """Replace pikepdf.Pdf.open so no test in this class opens a real PDF."""
+        fake_open = MagicMock()
+        monkeypatch.setattr("pikepdf.Pdf.open", fake_open)
+        return fake_open
+
     def test_service_initialization(self):
         """Test service initialization."""
+        assert (
+            self.service.supported_formats is ImageExtractionService.SUPPORTED_FORMATS
+        )
         assert self.service.supported_formats == {
             ".png",
             ".jpg",
@@ -68,15 +169,10 @@ class TestImageExtractionService:
             ".bmp",
         }
 
-    @patch("pikepdf.Pdf.open")
     @patch("pathlib.Path.mkdir")
-    def test_extract_images_pikepdf_success(self, mock_mkdir, mock_pdf_open):
+    def test_extract_images_pikepdf_success(self, mock_mkdir, pdf_open):
         """Test successful image extraction using pikepdf."""
-        # Mock PDF with pages
-        mock_pdf = MagicMock()
-        mock_page = MagicMock()
-        mock_pdf.pages = [mock_page]
-        mock_pdf_open.return_value.__enter__.return_value = mock_pdf
+        pdf_open.return_value.__enter__.return_value = SimpleNamespace(pages=[_PAGE])
 
         # Mock page image extraction
         with patch.object(self.service, "_extract_page_images") as mock_extract:
@@ -96,12 +192,12 @@ class TestImageExtractionService:
             assert len(result) == 1
             assert result[0].kind == "image"
             assert result[0].page_number == 1
+            mock_extract.assert_called_once_with(_PAGE, 1, self.test_output_dir)
             mock_mkdir.assert_called_once_with(parents=True, exist_ok=True)
 
-    @patch("pikepdf.Pdf.open")
-    def test_extract_images_pikepdf_failure(self, mock_pdf_open):
+    def test_extract_images_pikepdf_failure(self, pdf_open):
         """Test image extraction failure handling."""
-        mock_pdf_open.side_effect = Exception("PDF open failed")
+        pdf_open.side_effect = Exception("PDF open failed")
 
         with pytest.raises(Exception, match="PDF open failed"):
             self.service.extract_images_pikepdf(
@@ -122,10 +218,6 @@ class TestImageExtractionService:
 
     def test_extract_page_images_with_images(self):
         """Test page with image XObjects."""
-        # Mock page with image XObjects
-        mock_img_obj = {"/Subtype": "/Image"}
-        mock_page = {"/Resources": {"/XObject": {"Im1": mock_img_obj}}}
-
         with patch.object(self.service, "_extract_image_object") as mock_extract:
             mock_asset = AssetMetadata(
                 kind="image",
@@ -136,61 +228,43 @@ class TestImageExtractionService:
             )
             mock_extract.return_value = mock_asset
 
-            result = self.service._extract_page_images(
-                mock_page, 1, self.test_output_dir
-            )
+            result = self.service._extract_page_images(_PAGE, 1, self.test_output_dir)
 
             assert len(result) == 1
             assert result[0] == mock_asset
-            mock_extract.assert_called_once()
+            mock_extract.assert_called_once_with(_IMG_OBJ, 1, 1, self.test_output_dir)
 
-    @patch("pathlib.Path.exists")
-    @patch("pathlib.Path.stat")
-    def test_extract_image_object_success(self, mock_stat, mock_exists):
+    def test_extract_image_object_success(self, tmp_path):
         """Test successful image object extraction."""
-        mock_exists.return_value = True
-        mock_stat.return_value.st_size = 1000  # Non-zero size
-
         mock_img_obj = {"/Filter": "/DCTDecode"}
 
         with patch.object(self.service, "_save_jpeg_image") as mock_save:
-            result = self.service._extract_image_object(
-                mock_img_obj, 1, 1, self.test_output_dir
-            )
+            mock_save.side_effect = lambda obj, path: path.write_bytes(b"x" * 1000)
+            result = self.service._extract_image_object(mock_img_obj, 1, 1, tmp_path)
 
             assert result is not None
             assert result.kind == "image"
             assert result.page_number == 1
             assert result.index == 1
-            assert "page-001-img-01.png" in str(result.stored_path)
+            assert result.stored_path == tmp_path / "page-001-img-01.png"
             mock_save.assert_called_once()
 
-    @patch("pathlib.Path.exists")
-    def test_extract_image_object_file_not_saved(self, mock_exists):
+    def test_extract_image_object_file_not_saved(self, tmp_path):
         """Test image object extraction when file is not saved."""
-        mock_exists.return_value = False
         mock_img_obj = {"/Filter": "/DCTDecode"}
 
         with patch.object(self.service, "_save_jpeg_image"):
-            result = self.service._extract_image_object(
-                mock_img_obj, 1, 1, self.test_output_dir
-            )
+            result = self.service._extract_image_object(mock_img_obj, 1, 1, tmp_path)
 
             assert result is None
 
-    @patch("pathlib.Path.exists")
-    @patch("pathlib.Path.stat")
-    def test_extract_image_object_zero_size_file(self, mock_stat, mock_exists):
+    def test_extract_image_object_zero_size_file(self, tmp_path):
         """Test image object extraction when saved file has zero size."""
-        mock_exists.return_value = True
-        mock_stat.return_value.st_size = 0  # Zero size
-
         mock_img_obj = {"/Filter": "/DCTDecode"}
 
-        with patch.object(self.service, "_save_jpeg_image"):
-            result = self.service._extract_image_object(
-                mock_img_obj, 1, 1, self.test_output_dir
-            )
+        with patch.object(self.service, "_save_jpeg_image") as mock_save:
+            mock_save.side_effect = lambda obj, path: path.touch()
+            result = self.service._extract_image_object(mock_img_obj, 1, 1, tmp_path)
 
             assert result is None
 
@@ -223,57 +297,35 @@ class TestImageExtractionService:
         mock_img.save.assert_called_once_with(output_path, "PNG")
 
     @patch("PIL.Image.frombytes")
-    def test_save_flate_image_rgb(self, mock_frombytes):
+    def test_save_flate_image_rgb(self, mock_frombytes, rgb_buffer):
         """Test FlateDecode RGB image saving."""
-        # Create a MagicMock that supports dictionary access
-        mock_img_obj_with_data = MagicMock()
-        mock_img_obj_with_data.__getitem__.side_effect = lambda key: {
-            "/Width": 100,
-            "/Height": 100,
-            "/ColorSpace": "/DeviceRGB",
-        }[key]
-        mock_img_obj_with_data.get.side_effect = lambda key, default=None: {
-            "/Width": 100,
-            "/Height": 100,
-            "/ColorSpace": "/DeviceRGB",
-        }.get(key, default)
-        mock_img_obj_with_data.read_bytes.return_value = b"x" * (100 * 100 * 3)
+        img_obj = _FlateObj(
+            {"/Width": 100, "/Height": 100, "/ColorSpace": "/DeviceRGB"}, rgb_buffer
+        )
 
         mock_img = Mock()
         mock_frombytes.return_value = mock_img
 
         output_path = Path("test.png")
-        self.service._save_flate_image(mock_img_obj_with_data, output_path)
+        self.service._save_flate_image(img_obj, output_path)
 
-        mock_frombytes.assert_called_once_with(
-            "RGB", (100, 100), b"x" * (100 * 100 * 3)
-        )
+        mock_frombytes.assert_called_once_with("RGB", (100, 100), rgb_buffer)
         mock_img.save.assert_called_once_with(output_path, "PNG")
 
     @patch("PIL.Image.frombytes")
-    def test_save_flate_image_grayscale(self, mock_frombytes):
+    def test_save_flate_image_grayscale(self, mock_frombytes, gray_buffer):
         """Test FlateDecode grayscale image saving."""
-        # Create a MagicMock that supports dictionary access
-        mock_img_obj_with_data = MagicMock()
-        mock_img_obj_with_data.__getitem__.side_effect = lambda key: {
-            "/Width": 50,
-            "/Height": 50,
-            "/ColorSpace": "/DeviceGray",
-        }[key]
-        mock_img_obj_with_data.get.side_effect = lambda key, default=None: {
-            "/Width": 50,
-            "/Height": 50,
-            "/ColorSpace": "/DeviceGray",
-        }.get(key, default)
-        mock_img_obj_with_data.read_bytes.return_value = b"x" * (50 * 50 * 1)
+        img_obj = _FlateObj(
+            {"/Width": 50, "/Height": 50, "/ColorSpace": "/DeviceGray"}, gray_buffer
+        )
 
         mock_img = Mock()
         mock_frombytes.return_value = mock_img
 
         output_path = Path("test.png")
-        self.service._save_flate_image(mock_img_obj_with_data, output_path)
+        self.service._save_flate_image(img_obj, output_path)
 
-        mock_frombytes.assert_called_once_with("L", (50, 50), b"x" * (50 * 50 * 1))
+        mock_frombytes.assert_called_once_with("L", (50, 50), gray_buffer)
         mock_img.save.assert_called_once_with(output_path, "PNG")
 
     @patch("pikepdf.PdfImage")
@@ -289,76 +341,27 @@ class TestImageExtractionService:
         mock_pdf_image.assert_called_once_with(mock_img_obj)
         mock_pil_img.save.assert_called_once_with(output_path, "PNG")
 
-    def test_link_to_manifest_no_manifest(self):
-        """Test linking images when no manifest is provided."""
-        images = [
-            AssetMetadata(
-                kind="image",
-                original_path=None,
-                stored_path=Path("img1.png"),
-                page_number=1,
-            )
-        ]
-
-        result = self.service.link_to_manifest(images, None)
-        assert result == images
-
-        result = self.service.link_to_manifest(images, {})
-        assert result == images
-
-    def test_link_to_manifest_with_figures(self):
-        """Test linking images to manifest figures."""
-        images = [
-            AssetMetadata(
-                kind="image",
-                original_path=None,
-                stored_path=Path("page-001-img-01.png"),
-                page_number=1,
-                index=1,
-            ),
-            AssetMetadata(
-                kind="image",
-                original_path=None,
-                stored_path=Path("page-002-img-01.png"),
-                page_number=2,
-                index=1,
-            ),
-        ]
+    @pytest.mark.parametrize("images, manifest, expected", _LINK_TO_MANIFEST_CASES)
+    def test_link_to_manifest(self, images, manifest, expected):
+        """Test linking images to manifest figures by page and index."""
+        result = self.service.link_to_manifest(list(images), manifest)
 
-        manifest = {
-            "figures": [
-                {"page": 1, "caption": "Figure 1: X-ray image"},
-                {"page": 2, "caption": "Figure 2: Blood test chart"},
-            ]
-        }
-
-        result = self.service.link_to_manifest(images, manifest)
+        assert len(result) == len(images)
+        assert {(a.stored_path, a.caption) for a in result} == expected
+        assert all(a.alt_text == a.caption for a in result)
 
-        assert len(result) == 2
-        assert result[0].caption == "Figure 1: X-ray image"
-        assert result[0].alt_text == "Figure 1: X-ray image"
-        assert result[1].caption == "Figure 2: Blood test chart"
-        assert result[1].alt_text == "Figure 2: Blood test chart"
-
-    def test_link_to_manifest_single_figure_per_page(self):
-        """Test linking when there's only one figure per page."""
-        images = [
-            AssetMetadata(
-                kind="image",
-                original_path=None,
-                stored_path=Path("page-001-img-01.png"),
-                page_number=1,
-                index=2,  # Index doesn't match, but only one figure on page
-            )
-        ]
-
-        manifest = {"figures": [{"page": 1, "caption": "Single figure on page 1"}]}
-
-        result = self.service.link_to_manifest(images, manifest)
+    def test_link_to_manifest_leaves_input_unchanged(self):
+        """Test linking returns new metadata instead of modifying the input."""
+        result = self.service.link_to_manifest(
+            list(_TWO_PAGE_IMAGES), _TWO_PAGE_MANIFEST
+        )
 
-        assert len(result) == 1
-        assert result[0].caption == "Single figure on page 1"
-        assert result[0].alt_text == "Single figure on page 1"
+        assert all(image.caption is None for image in _TWO_PAGE_IMAGES)
+        assert result[0] == replace(
+            _TWO_PAGE_IMAGES[0],
+            caption="Figure 1: X-ray image",
+            alt_text="Figure 1: X-ray image",
+        )
 
     @patch.object(ImageExtractionService, "extract_images_pikepdf")
     @patch.object(ImageExtractionService, "link_to_manifest")
@@ -402,3 +405,69 @@ class TestImageExtractionService:
 
         # Should return empty list on failure
         assert result == []
+
+
+def _random_document(rng, n_pages):
+    """Generate extracted images and a manifest for a random multi-page document."""
+    images = []
+    figures = []
+    for page in range(1, n_pages + 1):
+        for index in range(1, rng.randint(0, 3) + 1):
+            images.append(_image(f"page-{page:03d}-img-{index:02d}.png", page, index))
+        for number in range(rng.randint(0, 3)):
+            figures.append({"page": page, "caption": f"Page {page} figure {number}"})
+    rng.shuffle(figures)
+    return images, {"figures": figures}
+
+
+def _expected_caption(image, figures):
+    """Caption link_to_manifest should assign, derived independently."""
+    page_figures = [f for f in figures if f["page"] == image.page_number]
+    if image.index and image.index <= len(page_figures):
+        return page_figures[image.index - 1]["caption"]
+    if len(page_figures) == 1:
+        return page_figures[0]["caption"]
+    return None
+
+
+def _best_time_ns(func, repeats=5):
+    """Fastest of several timed calls, to dampen scheduler noise."""
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        func()
+        elapsed = time.perf_counter_ns() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+class TestLinkToManifestScaling:
+    """Randomized stress tests for link_to_manifest."""
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_random_documents_match_reference(self, seed):
+        """Test linking random documents agrees with a reference implementation."""
+        rng = random.Random(seed)
+        images, manifest = _random_document(rng, rng.randint(1, 30))
+
+        result = ImageExtractionService().link_to_manifest(images, manifest)
+
+        assert [a.stored_path for a in result] == [a.stored_path for a in images]
+        for linked in result:
+            expected = _expected_caption(linked, manifest["figures"])
+            assert linked.caption == expected
+            assert linked.alt_text == expected
+
+    @pytest.mark.slow
+    def test_linking_scales_linearly(self):
+        """Test 10x more pages costs roughly 10x the time, not 100x."""
+        service = ImageExtractionService()
+        rng = random.Random(0)
+        small = _random_document(rng, 1_000)
+        large = _random_document(rng, 10_000)
+
+        small_ns = _best_time_ns(lambda: service.link_to_manifest(*small))
+        large_ns = _best_time_ns(lambda: service.link_to_manifest(*large))
+
+        # Linear growth gives a ratio near 10; quadratic would be near 100
+        assert large_ns / small_ns < 30
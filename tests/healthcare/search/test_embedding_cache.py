@@ -0,0 +1,77 @@
+"""Unit tests for embedding cache."""
+
+import pytest
+
+from healthcare.search.embedding_cache import EmbeddingCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create an embedding cache in a temporary directory."""
+    return EmbeddingCache(tmp_path / "cache" / "embedding_cache.db")
+
+
+class TestEmbeddingCache:
+    """Test cases for EmbeddingCache."""
+
+    def test_initialization_creates_database(self, cache):
+        """Test that the database file and parent directory are created."""
+        assert cache.db_path.exists()
+
+    def test_get_many_empty_cache(self, cache):
+        """Test lookups on an empty cache return nothing."""
+        assert cache.get_many("model", ["first", "second"]) == {}
+        assert cache.get_many("model", []) == {}
+
+    def test_set_and_get_round_trip(self, cache):
+        """Test stored embeddings are returned for the same model and text."""
+        cache.set_many("model", {"first": [0.5, 0.25], "second": [1.0, -1.0]})
+
+        found = cache.get_many("model", ["first", "second", "missing"])
+
+        assert found == {"first": [0.5, 0.25], "second": [1.0, -1.0]}
+
+    def test_keys_include_model(self, cache):
+        """Test embeddings from one model are not returned for another."""
+        cache.set_many("model-a", {"text": [0.5]})
+
+        assert cache.get_many("model-b", ["text"]) == {}
+
+    def test_set_many_overwrites(self, cache):
+        """Test storing an embedding again replaces the cached vector."""
+        cache.set_many("model", {"text": [0.5]})
+        cache.set_many("model", {"text": [0.75]})
+
+        assert cache.get_many("model", ["text"]) == {"text": [0.75]}
+
+    def test_persists_across_instances(self, cache):
+        """Test cached embeddings survive reopening the database."""
+        cache.set_many("model", {"text": [0.5]})
+
+        reopened = EmbeddingCache(cache.db_path)
+
+        assert reopened.get_many("model", ["text"]) == {"text": [0.5]}
+
+    def test_get_many_large_lookup(self, cache):
+        """Test lookups larger than one SQL batch return every hit."""
+        embeddings = {f"text {i}": [float(i)] for i in range(1200)}
+        cache.set_many("model", embeddings)
+
+        assert cache.get_many("model", list(embeddings)) == embeddings
+
+    def test_invalid_max_entries(self, tmp_path):
+        """Test that a non-positive size bound is rejected."""
+        with pytest.raises(ValueError, match="must be positive"):
+            EmbeddingCache(tmp_path / "embedding_cache.db", max_entries=0)
+
+    def test_evicts_oldest_beyond_max_entries(self, tmp_path):
+        """Test the cache keeps only the most recently written embeddings."""
+        cache = EmbeddingCache(tmp_path / "embedding_cache.db", max_entries=2)
+        cache.set_many("model", {"first": [1.0], "second": [2.0]})
+        # Rewriting an entry makes it the most recent
+        cache.set_many("model", {"first": [1.0]})
+        cache.set_many("model", {"third": [3.0]})
+
+        found = cache.get_many("model", ["first", "second", "third"])
+
+        assert found == {"first": [1.0], "third": [3.0]}
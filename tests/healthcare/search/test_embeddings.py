@@ -1,14 +1,28 @@
 """Unit tests for embedding service."""
 
+import asyncio
 import json
+import sqlite3
 import tempfile
+from contextlib import closing
 from pathlib import Path
-from unittest.mock import MagicMock, Mock, patch
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
+import httpx
+import numpy as np
+import openai
 import pytest
+from tenacity import wait_none
 
 from healthcare.config.config import Config
-from healthcare.search.embeddings import EmbeddingService
+from healthcare.search.embeddings import (
+    EmbeddingService,
+    _encode,
+    _get_encoding,
+    get_chroma_client,
+)
+from tests.utils import _assert_nonempty_strings
 
 
 @pytest.fixture
@@ -26,6 +40,25 @@ def test_config():
         yield config
 
 
+@pytest.fixture(autouse=True)
+def no_tokenizer():
+    """Estimate token counts so tests don't depend on tiktoken being installed."""
+    with patch("healthcare.search.embeddings._get_encoding", return_value=None):
+        yield
+
+
+@pytest.fixture
+def word_tokenizer():
+    """Tokenize on whitespace, one token ID per word."""
+    encoding = Mock()
+    encoding.encode.side_effect = lambda text: [len(word) for word in text.split()]
+
+    _encode.cache_clear()
+    with patch("healthcare.search.embeddings._get_encoding", return_value=encoding):
+        yield encoding
+    _encode.cache_clear()
+
+
 @pytest.fixture
 def mock_openai_client():
     """Create mock OpenAI client."""
@@ -45,29 +78,108 @@ def mock_openai_client():
     return client
 
 
+@pytest.fixture
+def mock_async_openai_client():
+    """Create mock async OpenAI client that tracks concurrent requests."""
+    client = AsyncMock(spec=openai.AsyncOpenAI)
+    client.in_flight = 0
+    client.max_in_flight = 0
+
+    async def mock_create_embeddings(*args, **kwargs):
+        client.in_flight += 1
+        client.max_in_flight = max(client.max_in_flight, client.in_flight)
+        # Yield so other batches can start before this one finishes
+        await asyncio.sleep(0)
+        client.in_flight -= 1
+
+        input_chunks = kwargs.get("input", [])
+        embedding_response = Mock()
+        embedding_response.data = [
+            Mock(embedding=[float(len(chunk))]) for chunk in input_chunks
+        ]
+        return embedding_response
+
+    client.embeddings.create = AsyncMock(side_effect=mock_create_embeddings)
+
+    return client
+
+
+@pytest.fixture
+def batch_api_client(mock_async_openai_client):
+    """Extend the async client mock with a Batch API that completes on the second poll."""
+    client = mock_async_openai_client
+    client.submitted_requests = []
+
+    async def mock_create_file(*args, **kwargs):
+        _, content, _ = kwargs["file"]
+        client.submitted_requests = [
+            json.loads(line) for line in content.decode().splitlines()
+        ]
+        return SimpleNamespace(id="file-batch-input")
+
+    async def mock_file_content(file_id):
+        # Answer in reverse order, as the Batch API does not preserve it
+        lines = [
+            json.dumps(
+                {
+                    "custom_id": request["custom_id"],
+                    "response": {
+                        "status_code": 200,
+                        "body": {
+                            "data": [
+                                {"index": i, "embedding": [float(len(chunk))]}
+                                for i, chunk in enumerate(request["body"]["input"])
+                            ]
+                        },
+                    },
+                }
+            )
+            for request in reversed(client.submitted_requests)
+        ]
+        return SimpleNamespace(text="\n".join(lines))
+
+    client.files.create = AsyncMock(side_effect=mock_create_file)
+    client.files.content = AsyncMock(side_effect=mock_file_content)
+    client.files.delete = AsyncMock()
+    client.batches.create = AsyncMock(
+        return_value=SimpleNamespace(
+            id="batch-1", status="validating", output_file_id=None
+        )
+    )
+    client.batches.retrieve = AsyncMock(
+        side_effect=[
+            SimpleNamespace(id="batch-1", status="in_progress", output_file_id=None),
+            SimpleNamespace(
+                id="batch-1", status="completed", output_file_id="file-batch-output"
+            ),
+        ]
+    )
+    client.batches.cancel = AsyncMock()
+
+    return client
+
+
 @pytest.fixture
 def mock_chroma_client():
     """Create mock Chroma client."""
-    with patch("chromadb.PersistentClient") as mock_client_class:
-        mock_client = Mock()
-        mock_collection = Mock()
+    mock_client = Mock()
+    mock_collection = Mock()
 
-        # Configure collection
-        mock_collection.name = "medical_reports"
-        mock_collection.count.return_value = 0
-        mock_collection.add = Mock()
-        mock_collection.query.return_value = {
-            "documents": [["test document"]],
-            "metadatas": [[{"report_id": 1}]],
-            "distances": [[0.2]],
-        }
-        mock_collection.get.return_value = {"ids": ["1_0"]}
-        mock_collection.delete = Mock()
+    # Configure collection
+    mock_collection.name = "medical_reports"
+    mock_collection.count.return_value = 0
+    mock_collection.add = Mock()
+    mock_collection.query.return_value = {
+        "documents": [["test document"]],
+        "metadatas": [[{"report_id": 1}]],
+        "distances": [[0.2]],
+    }
+    mock_collection.get.return_value = {"ids": []}
+    mock_collection.delete = Mock()
 
-        mock_client.get_or_create_collection.return_value = mock_collection
-        mock_client_class.return_value = mock_client
+    mock_client.get_or_create_collection.return_value = mock_collection
 
-        yield mock_client, mock_collection
+    return mock_client, mock_collection
 
 
 class TestEmbeddingService:
@@ -77,18 +189,55 @@ class TestEmbeddingService:
         """Test service initialization."""
         mock_client, mock_collection = mock_chroma_client
 
-        service = EmbeddingService(test_config, mock_openai_client)
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
 
         assert service.config == test_config
         assert service.openai_client == mock_openai_client
         assert service.chroma_client == mock_client
         assert service.collection == mock_collection
 
+    def test_initialization_shares_chroma_client(self, test_config, mock_openai_client):
+        """Test services for the same directory share one Chroma client."""
+        get_chroma_client.cache_clear()
+        try:
+            with patch("chromadb.PersistentClient") as mock_client_class:
+                first = EmbeddingService(test_config, mock_openai_client)
+                second = EmbeddingService(test_config, mock_openai_client)
+
+            mock_client_class.assert_called_once()
+            assert first.chroma_client is second.chroma_client
+            assert test_config.chroma_dir.exists()
+        finally:
+            get_chroma_client.cache_clear()
+
+    def test_initialization_ephemeral_chroma(self, test_config, mock_openai_client):
+        """Test ephemeral mode keeps Chroma in memory without touching disk."""
+        test_config.chroma_mode = "ephemeral"
+        get_chroma_client.cache_clear()
+        try:
+            with (
+                patch("chromadb.EphemeralClient") as mock_ephemeral,
+                patch("chromadb.PersistentClient") as mock_persistent,
+            ):
+                service = EmbeddingService(test_config, mock_openai_client)
+
+            mock_ephemeral.assert_called_once()
+            mock_persistent.assert_not_called()
+            assert service.chroma_client is mock_ephemeral.return_value
+            assert not test_config.chroma_dir.exists()
+        finally:
+            get_chroma_client.cache_clear()
+
     def test_chunk_markdown_simple(
         self, test_config, mock_openai_client, mock_chroma_client
     ):
         """Test simple markdown chunking."""
-        service = EmbeddingService(test_config, mock_openai_client)
+        mock_client, _ = mock_chroma_client
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
 
         markdown = (
             "# Header\n\nFirst paragraph.\n\nSecond paragraph.\n\nThird paragraph."
@@ -98,8 +247,7 @@ class TestEmbeddingService:
         # The chunking algorithm combines content within chunk size limit
         # So we should expect fewer chunks than paragraphs when they're small
         assert len(chunks) > 0
-        assert all(isinstance(chunk, str) for chunk in chunks)
-        assert all(len(chunk.strip()) > 0 for chunk in chunks)
+        _assert_nonempty_strings(chunks)
 
         # Verify all original content is preserved
         combined_content = "\n\n".join(chunks)
@@ -112,7 +260,10 @@ class TestEmbeddingService:
         self, test_config, mock_openai_client, mock_chroma_client
     ):
         """Test chunking with size limits."""
-        service = EmbeddingService(test_config, mock_openai_client)
+        mock_client, _ = mock_chroma_client
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
 
         # Create content that exceeds chunk size
         large_paragraph = "This is a very long paragraph. " * 50  # ~1500 chars
@@ -131,11 +282,32 @@ class TestEmbeddingService:
             len(reasonable_chunks) >= len(chunks) - 1
         )  # At most one chunk can exceed the flexible limit
 
+    def test_chunk_markdown_packing_boundaries(
+        self, test_config, mock_openai_client, mock_chroma_client
+    ):
+        """Test paragraphs are packed greedily up to the chunk size."""
+        mock_client, _ = mock_chroma_client
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
+
+        # chunk_size is 500: the first two paragraphs fit together, the third
+        # would push the chunk past the limit
+        first, second, third = "a" * 240, "b" * 240, "c" * 30
+        markdown = f"{first}\n\n\n{second}\n\n  \n\n{third}\n"
+
+        chunks = service.chunk_markdown(markdown)
+
+        assert chunks == [f"{first}\n\n{second}", third]
+
     def test_chunk_markdown_empty(
         self, test_config, mock_openai_client, mock_chroma_client
     ):
         """Test chunking empty content."""
-        service = EmbeddingService(test_config, mock_openai_client)
+        mock_client, _ = mock_chroma_client
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
 
         assert service.chunk_markdown("") == []
         assert service.chunk_markdown("   ") == []
@@ -145,7 +317,10 @@ class TestEmbeddingService:
         self, test_config, mock_openai_client, mock_chroma_client
     ):
         """Test successful embedding generation."""
-        service = EmbeddingService(test_config, mock_openai_client)
+        mock_client, _ = mock_chroma_client
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
 
         chunks = ["First chunk", "Second chunk"]
         embeddings = service.generate_embeddings(chunks)
@@ -166,7 +341,10 @@ class TestEmbeddingService:
         self, test_config, mock_openai_client, mock_chroma_client
     ):
         """Test embedding generation with empty input."""
-        service = EmbeddingService(test_config, mock_openai_client)
+        mock_client, _ = mock_chroma_client
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
 
         embeddings = service.generate_embeddings([])
         assert embeddings == []
@@ -176,7 +354,10 @@ class TestEmbeddingService:
         self, test_config, mock_openai_client, mock_chroma_client
     ):
         """Test embedding generation with API error."""
-        service = EmbeddingService(test_config, mock_openai_client)
+        mock_client, _ = mock_chroma_client
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
 
         # Mock API error
         mock_openai_client.embeddings.create.side_effect = Exception("API Error")
@@ -187,12 +368,481 @@ class TestEmbeddingService:
         ):  # Don't match specific message due to retry wrapper
             service.generate_embeddings(["test chunk"])
 
+    def test_generate_embeddings_uses_cache(
+        self, test_config, mock_openai_client, mock_chroma_client
+    ):
+        """Test cached chunks are not re-embedded."""
+        mock_client, _ = mock_chroma_client
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
+
+        service.generate_embeddings(["First chunk", "Second chunk"])
+        embeddings = service.generate_embeddings(
+            ["Second chunk", "Third chunk", "Third chunk"]
+        )
+
+        assert len(embeddings) == 3
+        assert mock_openai_client.embeddings.create.call_count == 2
+        # Only the new chunk is sent, once
+        assert mock_openai_client.embeddings.create.call_args.kwargs["input"] == [
+            "Third chunk"
+        ]
+
+    def test_generate_embeddings_cache_disabled(
+        self, test_config, mock_openai_client, mock_chroma_client
+    ):
+        """Test every call hits the API when the cache is disabled."""
+        mock_client, _ = mock_chroma_client
+        test_config.embedding_cache_enabled = False
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
+
+        service.generate_embeddings(["First chunk"])
+        service.generate_embeddings(["First chunk"])
+
+        assert mock_openai_client.embeddings.create.call_count == 2
+        assert not (test_config.base_data_dir / "embedding_cache.db").exists()
+
+    def test_search_queries_bypass_cache(
+        self, test_config, mock_openai_client, mock_chroma_client
+    ):
+        """Test search queries are neither read from nor written to the cache."""
+        mock_client, _ = mock_chroma_client
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
+        service.generate_embeddings(["Report chunk"])
+
+        service.search_similar("Report chunk")
+        service.search_similar_batch(["private question", "another question"])
+
+        assert mock_openai_client.embeddings.create.call_count == 3
+        with closing(sqlite3.connect(service.embedding_cache.db_path)) as conn:
+            (rows,) = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        assert rows == 1
+
+    def test_generate_embeddings_batched_splits_by_batch_size(
+        self, test_config, mock_openai_client, mock_chroma_client
+    ):
+        """Test batched embedding generation respects the input limit."""
+        mock_client, _ = mock_chroma_client
+        test_config.embedding_batch_size = 2
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
+
+        chunks = ["First chunk", "Second chunk", "Third chunk"]
+        embeddings = service.generate_embeddings_batched(chunks)
+
+        assert len(embeddings) == 3
+        assert mock_openai_client.embeddings.create.call_count == 2
+        batch_inputs = [
+            call.kwargs["input"]
+            for call in mock_openai_client.embeddings.create.call_args_list
+        ]
+        assert batch_inputs == [["First chunk", "Second chunk"], ["Third chunk"]]
+
+    def test_generate_embeddings_batched_splits_by_token_budget(
+        self, test_config, mock_openai_client, mock_chroma_client
+    ):
+        """Test batched embedding generation respects the token budget."""
+        mock_client, _ = mock_chroma_client
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
+
+        chunks = ["x" * 300, "y" * 300, "z" * 300]
+        embeddings = service.generate_embeddings_batched(chunks, max_batch_tokens=250)
+
+        assert len(embeddings) == 3
+        assert mock_openai_client.embeddings.create.call_count == 2
+
+    def test_generate_embeddings_sends_token_ids(
+        self, test_config, mock_openai_client, mock_chroma_client, word_tokenizer
+    ):
+        """Test chunks are sent as token IDs when a tokenizer is available."""
+        mock_client, _ = mock_chroma_client
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
+
+        service.generate_embeddings(["one three", "fourteen"])
+
+        call_kwargs = mock_openai_client.embeddings.create.call_args.kwargs
+        assert call_kwargs["input"] == [[3, 5], [8]]
+
+    def test_pack_batches_uses_exact_token_counts(
+        self, test_config, mock_openai_client, mock_chroma_client, word_tokenizer
+    ):
+        """Test batch packing uses tokenizer counts and encodes each chunk once."""
+        mock_client, _ = mock_chroma_client
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
+
+        # Each chunk is 2 tokens, far fewer than its character estimate
+        chunks = ["alpha beta", "gamma delta", "epsilon zeta"]
+        batches = service._pack_batches(chunks, max_batch_tokens=4)
+        service.generate_embeddings_batched(chunks, max_batch_tokens=4)
+
+        assert batches == [chunks[:2], chunks[2:]]
+        assert word_tokenizer.encode.call_count == 3
+
+    def test_get_encoding_without_tiktoken(self):
+        """Test token counting falls back to estimates without tiktoken."""
+        with patch("healthcare.search.embeddings.tiktoken", None):
+            assert _get_encoding.__wrapped__("text-embedding-3-large") is None
+
+    def test_generate_embeddings_batched_empty(
+        self, test_config, mock_openai_client, mock_chroma_client
+    ):
+        """Test batched embedding generation with empty input."""
+        mock_client, _ = mock_chroma_client
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
+
+        assert service.generate_embeddings_batched([]) == []
+        mock_openai_client.embeddings.create.assert_not_called()
+
+    async def test_agenerate_embeddings_preserves_order(
+        self,
+        test_config,
+        mock_openai_client,
+        mock_async_openai_client,
+        mock_chroma_client,
+    ):
+        """Test concurrent embedding generation returns vectors in chunk order."""
+        mock_client, _ = mock_chroma_client
+        test_config.embedding_batch_size = 1
+        service = EmbeddingService(
+            test_config,
+            mock_openai_client,
+            mock_async_openai_client,
+            chroma_client=mock_client,
+        )
+
+        # Make earlier batches finish last
+        create = mock_async_openai_client.embeddings.create
+        respond = create.side_effect
+        completed = []
+
+        async def respond_in_reverse(*args, **kwargs):
+            for _ in range(10 - len(kwargs["input"][0])):
+                await asyncio.sleep(0)
+            response = await respond(*args, **kwargs)
+            completed.extend(kwargs["input"])
+            return response
+
+        create.side_effect = respond_in_reverse
+
+        chunks = ["a", "bb", "ccc", "dddd"]
+        embeddings = await service.agenerate_embeddings(chunks)
+
+        assert completed == ["dddd", "ccc", "bb", "a"]
+        assert embeddings == [[1.0], [2.0], [3.0], [4.0]]
+        assert create.await_count == 4
+        mock_openai_client.embeddings.create.assert_not_called()
+
+    async def test_agenerate_embeddings_respects_concurrency_limit(
+        self,
+        test_config,
+        mock_openai_client,
+        mock_async_openai_client,
+        mock_chroma_client,
+    ):
+        """Test concurrent embedding generation caps in-flight requests."""
+        mock_client, _ = mock_chroma_client
+        test_config.embedding_batch_size = 1
+        test_config.embedding_concurrency = 2
+        service = EmbeddingService(
+            test_config,
+            mock_openai_client,
+            mock_async_openai_client,
+            chroma_client=mock_client,
+        )
+
+        await service.agenerate_embeddings([f"chunk {i}" for i in range(6)])
+
+        assert mock_async_openai_client.max_in_flight == 2
+
+    async def test_agenerate_embeddings_retries_rate_limit(
+        self,
+        test_config,
+        mock_openai_client,
+        mock_async_openai_client,
+        mock_chroma_client,
+    ):
+        """Test that rate limit errors are retried with backoff."""
+        mock_client, _ = mock_chroma_client
+        service = EmbeddingService(
+            test_config,
+            mock_openai_client,
+            mock_async_openai_client,
+            chroma_client=mock_client,
+        )
+
+        rate_limit_error = openai.RateLimitError(
+            "Rate limit exceeded",
+            response=httpx.Response(
+                429, request=httpx.Request("POST", "https://api.openai.com")
+            ),
+            body=None,
+        )
+        create = mock_async_openai_client.embeddings.create
+        create_embeddings = create.side_effect
+        errors = iter([rate_limit_error])
+
+        async def fail_first_attempt(*args, **kwargs):
+            error = next(errors, None)
+            if error:
+                raise error
+            return await create_embeddings(*args, **kwargs)
+
+        create.side_effect = fail_first_attempt
+
+        with patch.object(EmbeddingService._aembed_batch.retry, "wait", wait_none()):
+            embeddings = await service.agenerate_embeddings(["chunk"])
+
+        assert embeddings == [[5.0]]
+        assert create.await_count == 2
+
+    async def test_agenerate_embeddings_uses_cache(
+        self,
+        test_config,
+        mock_openai_client,
+        mock_async_openai_client,
+        mock_chroma_client,
+    ):
+        """Test concurrent embedding generation skips cached chunks."""
+        mock_client, _ = mock_chroma_client
+        service = EmbeddingService(
+            test_config,
+            mock_openai_client,
+            mock_async_openai_client,
+            chroma_client=mock_client,
+        )
+
+        await service.agenerate_embeddings(["a", "bb"])
+        embeddings = await service.agenerate_embeddings(["bb", "ccc"])
+
+        assert embeddings == [[2.0], [3.0]]
+        create = mock_async_openai_client.embeddings.create
+        assert create.await_count == 2
+        assert create.call_args.kwargs["input"] == ["ccc"]
+
+    async def test_agenerate_embeddings_empty(
+        self,
+        test_config,
+        mock_openai_client,
+        mock_async_openai_client,
+        mock_chroma_client,
+    ):
+        """Test concurrent embedding generation with empty input."""
+        mock_client, _ = mock_chroma_client
+        service = EmbeddingService(
+            test_config,
+            mock_openai_client,
+            mock_async_openai_client,
+            chroma_client=mock_client,
+        )
+
+        assert await service.agenerate_embeddings([]) == []
+        mock_async_openai_client.embeddings.create.assert_not_called()
+
+    async def test_agenerate_embeddings_via_batch(
+        self,
+        test_config,
+        mock_openai_client,
+        batch_api_client,
+        mock_chroma_client,
+    ):
+        """Test Batch API embedding restores chunk order from unordered output."""
+        mock_client, _ = mock_chroma_client
+        test_config.embedding_batch_size = 2
+        service = EmbeddingService(
+            test_config, mock_openai_client, batch_api_client, chroma_client=mock_client
+        )
+
+        with patch(
+            "healthcare.search.embeddings.asyncio.sleep", new_callable=AsyncMock
+        ) as mock_sleep:
+            embeddings = await service.agenerate_embeddings_via_batch(
+                ["a", "bb", "ccc", "dddd", "eeeee"]
+            )
+
+        assert embeddings == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+
+        # Five chunks are packed into three request lines
+        assert len(batch_api_client.submitted_requests) == 3
+        assert batch_api_client.submitted_requests[0]["body"]["input"] == ["a", "bb"]
+        assert batch_api_client.files.create.call_args.kwargs["purpose"] == "batch"
+        batch_api_client.batches.create.assert_awaited_once_with(
+            input_file_id="file-batch-input",
+            endpoint="/v1/embeddings",
+            completion_window="24h",
+        )
+
+        # Polled until complete, then both files were cleaned up
+        assert mock_sleep.await_count == 2
+        assert batch_api_client.files.delete.await_count == 2
+        batch_api_client.embeddings.create.assert_not_called()
+
+    async def test_agenerate_embeddings_via_batch_failed_job(
+        self,
+        test_config,
+        mock_openai_client,
+        batch_api_client,
+        mock_chroma_client,
+    ):
+        """Test a failed batch job raises."""
+        mock_client, _ = mock_chroma_client
+        batch_api_client.batches.retrieve.side_effect = None
+        batch_api_client.batches.retrieve.return_value = SimpleNamespace(
+            id="batch-1", status="failed", output_file_id=None
+        )
+        service = EmbeddingService(
+            test_config, mock_openai_client, batch_api_client, chroma_client=mock_client
+        )
+
+        with patch(
+            "healthcare.search.embeddings.asyncio.sleep", new_callable=AsyncMock
+        ):
+            with pytest.raises(RuntimeError, match="ended with status failed"):
+                await service.agenerate_embeddings_via_batch(["a", "bb"])
+
+        # The uploaded requests are removed even though the job failed
+        batch_api_client.files.delete.assert_awaited_once_with("file-batch-input")
+
+    async def test_agenerate_embeddings_via_batch_timeout(
+        self,
+        test_config,
+        mock_openai_client,
+        batch_api_client,
+        mock_chroma_client,
+    ):
+        """Test a batch job that outlives the poll deadline is cancelled."""
+        mock_client, _ = mock_chroma_client
+        service = EmbeddingService(
+            test_config, mock_openai_client, batch_api_client, chroma_client=mock_client
+        )
+
+        with (
+            patch("healthcare.search.embeddings._BATCH_POLL_TIMEOUT", 0),
+            patch("healthcare.search.embeddings.asyncio.sleep", new_callable=AsyncMock),
+        ):
+            with pytest.raises(RuntimeError, match="did not finish within 0 seconds"):
+                await service.agenerate_embeddings_via_batch(["a", "bb"])
+
+        batch_api_client.batches.cancel.assert_awaited_once_with("batch-1")
+        batch_api_client.batches.retrieve.assert_not_called()
+        batch_api_client.files.delete.assert_awaited_once_with("file-batch-input")
+
+    async def test_agenerate_embeddings_uses_batch_api_for_large_ingest(
+        self,
+        test_config,
+        mock_openai_client,
+        batch_api_client,
+        mock_chroma_client,
+    ):
+        """Test large ingests switch to the Batch API when it is enabled."""
+        mock_client, _ = mock_chroma_client
+        test_config.embedding_use_batch_api = True
+        test_config.embedding_batch_api_min_chunks = 3
+        service = EmbeddingService(
+            test_config, mock_openai_client, batch_api_client, chroma_client=mock_client
+        )
+
+        with patch(
+            "healthcare.search.embeddings.asyncio.sleep", new_callable=AsyncMock
+        ):
+            # Below the threshold: regular embeddings requests
+            assert await service.agenerate_embeddings(["a", "bb"]) == [[1.0], [2.0]]
+            batch_api_client.batches.create.assert_not_called()
+
+            embeddings = await service.agenerate_embeddings(["ccc", "dddd", "eeeee"])
+
+        assert embeddings == [[3.0], [4.0], [5.0]]
+        batch_api_client.batches.create.assert_awaited_once()
+
+    async def test_aprocess_report_embeddings_uses_batch_api_for_large_report(
+        self,
+        test_config,
+        mock_openai_client,
+        batch_api_client,
+        mock_chroma_client,
+    ):
+        """Test the Batch API threshold applies to the whole report, not per batch."""
+        mock_client, mock_collection = mock_chroma_client
+        test_config.embedding_batch_size = 2
+        test_config.embedding_use_batch_api = True
+        test_config.embedding_batch_api_min_chunks = 5
+        service = EmbeddingService(
+            test_config, mock_openai_client, batch_api_client, chroma_client=mock_client
+        )
+        chunks = ["a", "bb", "ccc", "dddd", "eeeee"]
+
+        with (
+            patch.object(service, "chunk_markdown", return_value=chunks),
+            patch("healthcare.search.embeddings.asyncio.sleep", new_callable=AsyncMock),
+        ):
+            await service.aprocess_report_embeddings("markdown", {"report_id": 7})
+
+        # Every pipeline batch holds fewer chunks than the threshold
+        batch_api_client.batches.create.assert_awaited_once()
+        batch_api_client.embeddings.create.assert_not_called()
+        stored = {
+            document: embedding
+            for call in mock_collection.add.call_args_list
+            for document, embedding in zip(
+                call.kwargs["documents"], call.kwargs["embeddings"].tolist()
+            )
+        }
+        assert stored == {chunk: [float(len(chunk))] for chunk in chunks}
+
+    async def test_aprocess_reports_embeddings_batch_api_spans_reports(
+        self,
+        test_config,
+        mock_openai_client,
+        batch_api_client,
+        mock_chroma_client,
+    ):
+        """Test the Batch API threshold counts the chunks of all reports."""
+        mock_client, mock_collection = mock_chroma_client
+        test_config.embedding_use_batch_api = True
+        test_config.embedding_batch_api_min_chunks = 2
+        service = EmbeddingService(
+            test_config, mock_openai_client, batch_api_client, chroma_client=mock_client
+        )
+
+        with patch(
+            "healthcare.search.embeddings.asyncio.sleep", new_callable=AsyncMock
+        ):
+            await service.aprocess_reports_embeddings(
+                [
+                    ("# Report\n\nThe first finding.", {"report_id": 1}),
+                    ("# Report\n\nThe second finding.", {"report_id": 2}),
+                ]
+            )
+
+        # One chunk per report: only the two together reach the threshold
+        batch_api_client.batches.create.assert_awaited_once()
+        batch_api_client.embeddings.create.assert_not_called()
+        stored_ids = sorted(
+            call.kwargs["ids"][0] for call in mock_collection.add.call_args_list
+        )
+        assert stored_ids == ["1_0", "2_0"]
+
     def test_store_chunks_success(
         self, test_config, mock_openai_client, mock_chroma_client
     ):
         """Test successful chunk storage."""
         mock_client, mock_collection = mock_chroma_client
-        service = EmbeddingService(test_config, mock_openai_client)
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
 
         chunks = ["First chunk", "Second chunk"]
         embeddings = [[0.1, 0.2], [0.3, 0.4]]
@@ -209,7 +859,9 @@ class TestEmbeddingService:
         call_args = mock_collection.add.call_args
 
         assert call_args[1]["documents"] == chunks
-        assert call_args[1]["embeddings"] == embeddings
+        stored_embeddings = call_args[1]["embeddings"]
+        assert stored_embeddings.dtype == np.float32
+        np.testing.assert_allclose(stored_embeddings, embeddings, rtol=1e-6)
         assert len(call_args[1]["ids"]) == 2
         assert len(call_args[1]["metadatas"]) == 2
 
@@ -220,11 +872,44 @@ class TestEmbeddingService:
         assert metadata_0["chunk_index"] == 0
         assert metadata_0["content_type"] == "paragraph"
 
+    def test_store_chunks_in_batches(
+        self, test_config, mock_openai_client, mock_chroma_client
+    ):
+        """Test chunks are inserted in batches of chroma_batch_size."""
+        mock_client, mock_collection = mock_chroma_client
+        test_config.chroma_batch_size = 2
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
+
+        chunks = [f"Chunk {i}" for i in range(5)]
+        embeddings = [[float(i)] for i in range(5)]
+
+        service.store_chunks(chunks, embeddings, {"report_id": 123})
+
+        assert mock_collection.add.call_count == 3
+        batches = [call.kwargs for call in mock_collection.add.call_args_list]
+        assert [batch["documents"] for batch in batches] == [
+            chunks[0:2],
+            chunks[2:4],
+            chunks[4:5],
+        ]
+        assert [batch["ids"] for batch in batches] == [
+            ["123_0", "123_1"],
+            ["123_2", "123_3"],
+            ["123_4"],
+        ]
+        assert batches[2]["embeddings"].tolist() == [[4.0]]
+        assert batches[2]["metadatas"][0]["chunk_index"] == 4
+
     def test_store_chunks_mismatch_error(
         self, test_config, mock_openai_client, mock_chroma_client
     ):
         """Test store chunks with mismatched lengths."""
-        service = EmbeddingService(test_config, mock_openai_client)
+        mock_client, _ = mock_chroma_client
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
 
         chunks = ["First chunk", "Second chunk"]
         embeddings = [[0.1, 0.2]]  # Only one embedding
@@ -238,7 +923,9 @@ class TestEmbeddingService:
     ):
         """Test storing empty chunks."""
         mock_client, mock_collection = mock_chroma_client
-        service = EmbeddingService(test_config, mock_openai_client)
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
 
         service.store_chunks([], [], {})
         mock_collection.add.assert_not_called()
@@ -247,7 +934,10 @@ class TestEmbeddingService:
         self, test_config, mock_openai_client, mock_chroma_client
     ):
         """Test complete report processing."""
-        service = EmbeddingService(test_config, mock_openai_client)
+        mock_client, _ = mock_chroma_client
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
 
         markdown = "# Medical Report\n\nPatient shows signs of improvement.\n\nFollow-up recommended."
         metadata = {
@@ -265,23 +955,249 @@ class TestEmbeddingService:
         mock_collection = mock_chroma_client[1]
         mock_collection.add.assert_called_once()
 
+    def test_process_report_embeddings_idempotent(
+        self, test_config, mock_openai_client, mock_chroma_client
+    ):
+        """Test re-processing unchanged content skips embedding and storage."""
+        mock_client, mock_collection = mock_chroma_client
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
+
+        markdown = "# Medical Report\n\nPatient shows signs of improvement."
+        service.process_report_embeddings(markdown, {"report_id": 456})
+
+        stored_metadata = mock_collection.add.call_args.kwargs["metadatas"][0]
+        content_hash = stored_metadata["content_hash"]
+        lookup = mock_collection.get.call_args_list[0].kwargs["where"]
+        assert lookup == {"$and": [{"report_id": 456}, {"content_hash": content_hash}]}
+
+        # Chroma now holds chunks with this report's content hash
+        mock_collection.get.return_value = {"ids": ["456_0"]}
+        mock_openai_client.embeddings.create.reset_mock()
+        mock_collection.add.reset_mock()
+        mock_collection.delete.reset_mock()
+
+        service.process_report_embeddings(markdown, {"report_id": 456})
+
+        mock_openai_client.embeddings.create.assert_not_called()
+        mock_collection.add.assert_not_called()
+        mock_collection.delete.assert_not_called()
+
+    def test_process_report_embeddings_replaces_changed_content(
+        self, test_config, mock_openai_client, mock_chroma_client
+    ):
+        """Test changed content deletes the report's old chunks before storing."""
+        mock_client, mock_collection = mock_chroma_client
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
+
+        # No chunk matches the new hash, but old chunks exist for the report
+        mock_collection.get.side_effect = [{"ids": []}, {"ids": ["456_0", "456_1"]}]
+
+        service.process_report_embeddings("# Updated report", {"report_id": 456})
+
+        mock_collection.delete.assert_called_once_with(ids=["456_0", "456_1"])
+        mock_collection.add.assert_called_once()
+
     def test_process_report_embeddings_empty_content(
         self, test_config, mock_openai_client, mock_chroma_client
     ):
         """Test processing empty report content."""
-        service = EmbeddingService(test_config, mock_openai_client)
+        mock_client, _ = mock_chroma_client
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
 
         # Should not raise error, just log warning
         service.process_report_embeddings("", {"report_id": 123})
 
         mock_openai_client.embeddings.create.assert_not_called()
 
+    async def test_aprocess_report_embeddings_success(
+        self,
+        test_config,
+        mock_openai_client,
+        mock_async_openai_client,
+        mock_chroma_client,
+    ):
+        """Test complete async report processing."""
+        mock_client, mock_collection = mock_chroma_client
+        service = EmbeddingService(
+            test_config,
+            mock_openai_client,
+            mock_async_openai_client,
+            chroma_client=mock_client,
+        )
+
+        markdown = "# Medical Report\n\nPatient shows signs of improvement."
+        await service.aprocess_report_embeddings(markdown, {"report_id": 456})
+
+        mock_async_openai_client.embeddings.create.assert_awaited_once()
+        mock_collection.add.assert_called_once()
+
+    async def test_aprocess_report_embeddings_pipeline(
+        self,
+        test_config,
+        mock_openai_client,
+        mock_async_openai_client,
+        mock_chroma_client,
+    ):
+        """Test each embedded batch is stored with its position in the report."""
+        mock_client, mock_collection = mock_chroma_client
+        test_config.embedding_batch_size = 2
+        test_config.embedding_concurrency = 2
+        service = EmbeddingService(
+            test_config,
+            mock_openai_client,
+            mock_async_openai_client,
+            chroma_client=mock_client,
+        )
+        chunks = ["a", "bb", "ccc", "dddd", "eeeee"]
+
+        with patch.object(service, "chunk_markdown", return_value=chunks):
+            await service.aprocess_report_embeddings("markdown", {"report_id": 7})
+
+        assert mock_async_openai_client.embeddings.create.await_count == 3
+        assert mock_collection.add.call_count == 3
+
+        stored = {}
+        for call in mock_collection.add.call_args_list:
+            for chunk_id, document, embedding, chunk_metadata in zip(
+                call.kwargs["ids"],
+                call.kwargs["documents"],
+                call.kwargs["embeddings"].tolist(),
+                call.kwargs["metadatas"],
+            ):
+                stored[chunk_id] = (document, embedding, chunk_metadata["chunk_index"])
+
+        assert stored == {
+            f"7_{i}": (chunk, [float(len(chunk))], i) for i, chunk in enumerate(chunks)
+        }
+
+    async def test_aprocess_report_embeddings_pipeline_error(
+        self,
+        test_config,
+        mock_openai_client,
+        mock_async_openai_client,
+        mock_chroma_client,
+    ):
+        """Test a failed batch stops the pipeline and raises the original error."""
+        mock_client, mock_collection = mock_chroma_client
+        test_config.embedding_batch_size = 1
+        mock_async_openai_client.embeddings.create.side_effect = ValueError("boom")
+        service = EmbeddingService(
+            test_config,
+            mock_openai_client,
+            mock_async_openai_client,
+            chroma_client=mock_client,
+        )
+
+        with patch.object(service, "chunk_markdown", return_value=["a", "b", "c"]):
+            with pytest.raises(ValueError, match="boom"):
+                await service.aprocess_report_embeddings("markdown", {"report_id": 7})
+
+        mock_collection.add.assert_not_called()
+
+    async def test_aprocess_reports_embeddings_parallel(
+        self,
+        test_config,
+        mock_openai_client,
+        mock_async_openai_client,
+        mock_chroma_client,
+    ):
+        """Test reports are embedded concurrently rather than one after another."""
+        mock_client, mock_collection = mock_chroma_client
+        service = EmbeddingService(
+            test_config,
+            mock_openai_client,
+            mock_async_openai_client,
+            chroma_client=mock_client,
+        )
+
+        # Each request waits until the other report's request has started,
+        # which only completes if both are in flight at once
+        started = {1: asyncio.Event(), 2: asyncio.Event()}
+        create = mock_async_openai_client.embeddings.create
+        respond = create.side_effect
+
+        async def wait_for_other_report(*args, **kwargs):
+            report_id = 1 if "first" in kwargs["input"][0] else 2
+            started[report_id].set()
+            await asyncio.wait_for(started[3 - report_id].wait(), timeout=1)
+            return await respond(*args, **kwargs)
+
+        create.side_effect = wait_for_other_report
+
+        await service.aprocess_reports_embeddings(
+            [
+                ("# Report\n\nThe first finding.", {"report_id": 1}),
+                ("# Report\n\nThe second finding.", {"report_id": 2}),
+            ]
+        )
+
+        assert create.await_count == 2
+        stored_ids = sorted(
+            call.kwargs["ids"][0] for call in mock_collection.add.call_args_list
+        )
+        assert stored_ids == ["1_0", "2_0"]
+
+    async def test_aprocess_reports_embeddings_error(
+        self,
+        test_config,
+        mock_openai_client,
+        mock_async_openai_client,
+        mock_chroma_client,
+    ):
+        """Test a failing report raises its original error."""
+        mock_client, _ = mock_chroma_client
+        mock_async_openai_client.embeddings.create.side_effect = ValueError("boom")
+        service = EmbeddingService(
+            test_config,
+            mock_openai_client,
+            mock_async_openai_client,
+            chroma_client=mock_client,
+        )
+
+        with pytest.raises(ValueError, match="boom"):
+            await service.aprocess_reports_embeddings(
+                [("# Report", {"report_id": 1}), ("# Other", {"report_id": 2})]
+            )
+
+    def test_process_reports_embeddings_shares_requests(
+        self, test_config, mock_openai_client, mock_chroma_client
+    ):
+        """Test multi-report processing embeds all chunks in one request."""
+        mock_client, mock_collection = mock_chroma_client
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
+
+        reports = [
+            ("# Report A\n\nFirst finding.", {"report_id": 1}),
+            ("", {"report_id": 2}),
+            ("# Report C\n\nSecond finding.", {"report_id": 3}),
+        ]
+
+        service.process_reports_embeddings(reports)
+
+        # One embeddings request covers both non-empty reports
+        mock_openai_client.embeddings.create.assert_called_once()
+
+        # Each non-empty report is stored separately under its own IDs
+        assert mock_collection.add.call_count == 2
+        stored_ids = [call.kwargs["ids"] for call in mock_collection.add.call_args_list]
+        assert stored_ids == [["1_0"], ["3_0"]]
+
     def test_search_similar_success(
         self, test_config, mock_openai_client, mock_chroma_client
     ):
         """Test successful similarity search."""
         mock_client, mock_collection = mock_chroma_client
-        service = EmbeddingService(test_config, mock_openai_client)
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
 
         results = service.search_similar("test query", user_filter="test_user", k=5)
 
@@ -306,7 +1222,9 @@ class TestEmbeddingService:
     ):
         """Test similarity search without user filter."""
         mock_client, mock_collection = mock_chroma_client
-        service = EmbeddingService(test_config, mock_openai_client)
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
 
         service.search_similar("test query", k=3)
 
@@ -322,7 +1240,9 @@ class TestEmbeddingService:
     ):
         """Test similarity search with no results."""
         mock_client, mock_collection = mock_chroma_client
-        service = EmbeddingService(test_config, mock_openai_client)
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
 
         # Mock empty results
         mock_collection.query.return_value = {
@@ -334,12 +1254,57 @@ class TestEmbeddingService:
         results = service.search_similar("test query")
         assert results == []
 
+    def test_search_similar_batch(
+        self, test_config, mock_openai_client, mock_chroma_client
+    ):
+        """Test several queries share one embeddings request and one Chroma query."""
+        mock_client, mock_collection = mock_chroma_client
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
+
+        mock_collection.query.return_value = {
+            "documents": [["doc a", "doc b"], []],
+            "metadatas": [[{"report_id": 1}, {"report_id": 2}], []],
+            "distances": [[0.0, 3.0], []],
+        }
+
+        results = service.search_similar_batch(["first", "second"], k=2)
+
+        mock_openai_client.embeddings.create.assert_called_once()
+        mock_collection.query.assert_called_once_with(
+            query_embeddings=[[0.1, 0.2, 0.3], [0.1, 0.2, 0.3]],
+            n_results=2,
+            where=None,
+            include=["documents", "metadatas", "distances"],
+        )
+
+        assert len(results) == 2
+        assert [r["content"] for r in results[0]] == ["doc a", "doc b"]
+        assert [r["relevance_score"] for r in results[0]] == [1.0, 0.25]
+        assert results[1] == []
+
+    def test_search_similar_batch_empty(
+        self, test_config, mock_openai_client, mock_chroma_client
+    ):
+        """Test batch search with no queries makes no requests."""
+        mock_client, mock_collection = mock_chroma_client
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
+
+        assert service.search_similar_batch([]) == []
+        mock_openai_client.embeddings.create.assert_not_called()
+        mock_collection.query.assert_not_called()
+
     def test_get_collection_stats(
         self, test_config, mock_openai_client, mock_chroma_client
     ):
         """Test getting collection statistics."""
         mock_client, mock_collection = mock_chroma_client
-        service = EmbeddingService(test_config, mock_openai_client)
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
 
         mock_collection.count.return_value = 42
 
@@ -354,7 +1319,9 @@ class TestEmbeddingService:
     ):
         """Test collection stats with error."""
         mock_client, mock_collection = mock_chroma_client
-        service = EmbeddingService(test_config, mock_openai_client)
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
 
         mock_collection.count.side_effect = Exception("Database error")
 
@@ -366,7 +1333,11 @@ class TestEmbeddingService:
     ):
         """Test successful deletion of report chunks."""
         mock_client, mock_collection = mock_chroma_client
-        service = EmbeddingService(test_config, mock_openai_client)
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
+
+        mock_collection.get.return_value = {"ids": ["1_0"]}
 
         service.delete_report_chunks(123)
 
@@ -380,7 +1351,9 @@ class TestEmbeddingService:
     ):
         """Test deletion with no chunks found."""
         mock_client, mock_collection = mock_chroma_client
-        service = EmbeddingService(test_config, mock_openai_client)
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
 
         mock_collection.get.return_value = {"ids": []}
 
@@ -394,7 +1367,10 @@ class TestEmbeddingService:
         self, mock_retry, test_config, mock_openai_client, mock_chroma_client
     ):
         """Test that retry decorator is applied to generate_embeddings."""
-        service = EmbeddingService(test_config, mock_openai_client)
+        mock_client, _ = mock_chroma_client
+        service = EmbeddingService(
+            test_config, mock_openai_client, chroma_client=mock_client
+        )
 
         # Verify retry decorator was applied
         assert hasattr(service.generate_embeddings, "retry")
@@ -403,16 +1379,15 @@ class TestEmbeddingService:
 class TestEmbeddingServiceIntegration:
     """Integration tests for embedding service."""
 
-    @patch("chromadb.PersistentClient")
-    def test_real_chunking_and_embedding_flow(self, mock_chroma_client, test_config):
+    def test_real_chunking_and_embedding_flow(self, test_config):
         """Test realistic chunking and embedding workflow."""
         # Mock Chroma
         mock_client = Mock()
         mock_collection = Mock()
         mock_collection.name = "medical_reports"
         mock_collection.count.return_value = 0
+        mock_collection.get.return_value = {"ids": []}
         mock_client.get_or_create_collection.return_value = mock_collection
-        mock_chroma_client.return_value = mock_client
 
         # Mock OpenAI
         mock_openai = Mock()
@@ -429,7 +1404,7 @@ class TestEmbeddingServiceIntegration:
 
         mock_openai.embeddings.create.side_effect = mock_create_embeddings
 
-        service = EmbeddingService(test_config, mock_openai)
+        service = EmbeddingService(test_config, mock_openai, chroma_client=mock_client)
 
         # Realistic medical report content
         markdown_content = """# Medical Report - Patient John Doe
@@ -466,8 +1441,7 @@ General appearance: Patient appears anxious and diaphoretic.
 
         # Should have multiple chunks (at least 2 for this content)
         assert len(chunks) >= 2
-        assert all(isinstance(chunk, str) for chunk in chunks)
-        assert all(len(chunk.strip()) > 0 for chunk in chunks)
+        _assert_nonempty_strings(chunks)
 
         # Verify storage
         mock_collection.add.assert_called_once()
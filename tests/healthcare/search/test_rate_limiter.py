@@ -0,0 +1,88 @@
+"""Unit tests for async rate limiter."""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from healthcare.search.rate_limiter import AsyncTokenBucket
+
+
+class FakeClock:
+    """Deterministic clock whose sleep advances time instantly."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    """Patch the rate limiter's clock and sleep with a fake clock."""
+    fake_clock = FakeClock()
+    with (
+        patch(
+            "healthcare.search.rate_limiter.time",
+            SimpleNamespace(monotonic=fake_clock.monotonic),
+        ),
+        patch("healthcare.search.rate_limiter.asyncio.sleep", fake_clock.sleep),
+    ):
+        yield fake_clock
+
+
+class TestAsyncTokenBucket:
+    """Test cases for AsyncTokenBucket."""
+
+    def test_invalid_limits(self):
+        """Test that non-positive limits are rejected."""
+        with pytest.raises(ValueError, match="must be positive"):
+            AsyncTokenBucket(rpm=0, tpm=1000)
+
+        with pytest.raises(ValueError, match="must be positive"):
+            AsyncTokenBucket(rpm=60, tpm=0)
+
+    async def test_acquire_within_budget_does_not_wait(self, clock):
+        """Test that requests within both budgets go through immediately."""
+        bucket = AsyncTokenBucket(rpm=60, tpm=1000)
+
+        await bucket.acquire(400)
+        await bucket.acquire(600)
+
+        assert clock.sleeps == []
+
+    async def test_acquire_waits_for_token_budget(self, clock):
+        """Test that exhausting the token budget delays the next request."""
+        bucket = AsyncTokenBucket(rpm=60, tpm=1000)
+
+        await bucket.acquire(1000)
+        await bucket.acquire(100)
+
+        # 100 tokens refill at 1000 tokens/minute in 6 seconds
+        assert clock.now == pytest.approx(6.0)
+
+    async def test_acquire_waits_for_request_budget(self, clock):
+        """Test that exhausting the request budget delays the next request."""
+        bucket = AsyncTokenBucket(rpm=2, tpm=1000)
+
+        await bucket.acquire()
+        await bucket.acquire()
+        await bucket.acquire()
+
+        # One request refills at 2 requests/minute in 30 seconds
+        assert clock.now == pytest.approx(30.0)
+
+    async def test_acquire_oversized_request(self, clock):
+        """Test that a request larger than the token budget waits for a full bucket."""
+        bucket = AsyncTokenBucket(rpm=60, tpm=1000)
+
+        await bucket.acquire(500)
+        await bucket.acquire(5000)
+
+        assert clock.now == pytest.approx(30.0)
@@ -4,6 +4,7 @@ import json
 import tempfile
 from datetime import datetime
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 from sqlmodel import Session, SQLModel, create_engine
@@ -95,6 +96,17 @@ class TestDatabaseService:
         assert service.engine is not None
         service.close()
 
+    def test_database_initialization_with_engine(self, temp_config, sqlite_engine):
+        """Test an injected engine is used as is and left open by close()."""
+        service = DatabaseService(temp_config, engine=sqlite_engine)
+        assert service.engine is sqlite_engine
+
+        service.create_tables()
+        service.close()
+
+        user = service.get_or_create_user("engine_user")
+        assert user.id is not None
+
     def test_create_tables(self, db_service):
         """Test table creation."""
         # Tables should be created in fixture
@@ -102,6 +114,40 @@ class TestDatabaseService:
         with db_service.get_session() as session:
             assert isinstance(session, Session)
 
+    def test_connection_pragmas(self, db_service):
+        """Test new connections use WAL journaling and NORMAL sync."""
+        with db_service.engine.connect() as connection:
+            journal_mode = connection.exec_driver_sql("PRAGMA journal_mode").scalar()
+            synchronous = connection.exec_driver_sql("PRAGMA synchronous").scalar()
+
+        assert journal_mode == "wal"
+        assert synchronous == 1  # NORMAL
+
+    @pytest.mark.parametrize(
+        "query,index",
+        [
+            (
+                "SELECT id FROM medicalreport WHERE user_id = 1 AND file_hash = 'x'",
+                "sqlite_autoindex_medicalreport_1",
+            ),
+            (
+                "SELECT id FROM medicalreport WHERE user_id = 1",
+                "sqlite_autoindex_medicalreport_1",
+            ),
+            (
+                "SELECT id FROM reportasset WHERE report_id = 1",
+                "ix_reportasset_report_id",
+            ),
+        ],
+    )
+    def test_lookups_use_indexes(self, db_service, query, index):
+        """Test duplicate checks and per-user/per-report lookups hit an index."""
+        with db_service.engine.connect() as connection:
+            plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {query}").all()
+
+        assert plan[0][-1].startswith("SEARCH")
+        assert index in plan[0][-1]
+
     def test_get_or_create_user_new(self, db_service):
         """Test creating a new user."""
         user = db_service.get_or_create_user("new_user")
@@ -195,6 +241,105 @@ class TestDatabaseService:
         assert assets[1].report_id == report.id
         assert assets[1].kind == "image"
 
+    def test_create_report_assets_keeps_order_and_defaults(self, db_service):
+        """Test batch-created assets come back in input order with defaults set."""
+        user = db_service.get_or_create_user("test_user")
+        report = db_service.create_medical_report(
+            user.id,
+            {
+                "filename": "test.pdf",
+                "file_hash": "abc123",
+                "markdown_path": "/path/to/test.md",
+                "meta_json": json.dumps({}),
+            },
+        )
+
+        assets = db_service.create_report_assets(
+            report.id,
+            [{"kind": "image", "path": f"/path/to/image{i}.png"} for i in range(5)],
+        )
+
+        assert [asset.path for asset in assets] == [
+            f"/path/to/image{i}.png" for i in range(5)
+        ]
+        assert all(asset.id is not None for asset in assets)
+        assert all(asset.created_at is not None for asset in assets)
+        assert db_service.create_report_assets(report.id, []) == []
+
+    def test_get_or_create_user_cached(self, db_service):
+        """Test a resolved user is served from the cache without a query."""
+        user1 = db_service.get_or_create_user("cached_user")
+
+        with patch.object(db_service, "get_session") as mock_get_session:
+            user2 = db_service.get_or_create_user("cached_user")
+
+        mock_get_session.assert_not_called()
+        assert user2.id == user1.id
+
+    def test_user_cache_evicts_least_recently_used(self, db_service, monkeypatch):
+        """Test the user cache stays within its size limit."""
+        monkeypatch.setattr("healthcare.storage.database.USER_CACHE_SIZE", 2)
+
+        db_service.get_or_create_user("first")
+        db_service.get_or_create_user("second")
+        db_service.get_or_create_user("first")
+        db_service.get_or_create_user("third")
+
+        assert list(db_service._user_cache) == ["first", "third"]
+
+        db_service.close()
+        assert not db_service._user_cache
+
+    def test_bulk_get_or_create_users(self, db_service):
+        """Test bulk user creation returns new and existing users in order."""
+        existing = db_service.get_or_create_user("existing_user")
+
+        users = db_service.bulk_get_or_create_users(
+            ["new_user", "existing_user", "other_user", "new_user"]
+        )
+
+        assert [user.external_id for user in users] == [
+            "new_user",
+            "existing_user",
+            "other_user",
+        ]
+        assert users[1].id == existing.id
+        assert users[1].created_at == existing.created_at
+        assert len({user.id for user in users}) == 3
+        assert db_service.bulk_get_or_create_users([]) == []
+
+    def test_bulk_create_medical_reports(self, db_service):
+        """Test bulk report creation skips duplicates like the single-row path."""
+        user = db_service.get_or_create_user("test_user")
+        existing = db_service.create_medical_report(
+            user.id,
+            {
+                "filename": "existing.pdf",
+                "file_hash": "hash0",
+                "markdown_path": "/path/to/existing.md",
+                "meta_json": json.dumps({}),
+            },
+        )
+
+        reports = db_service.bulk_create_medical_reports(
+            [
+                {
+                    "user_id": user.id,
+                    "filename": f"report{i}.pdf",
+                    "file_hash": f"hash{i}",
+                    "markdown_path": f"/path/to/report{i}.md",
+                    "meta_json": json.dumps({}),
+                }
+                for i in range(3)
+            ]
+        )
+
+        assert [report.file_hash for report in reports] == ["hash0", "hash1", "hash2"]
+        assert reports[0].id == existing.id
+        assert reports[0].filename == "existing.pdf"
+        assert len(db_service.get_user_reports(user.id)) == 3
+        assert db_service.bulk_create_medical_reports([]) == []
+
     def test_get_user_reports(self, db_service):
         """Test getting all reports for a user."""
         # Create user
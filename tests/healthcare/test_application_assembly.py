@@ -1,25 +1,26 @@
 """Test FastAPI application assembly and integration."""
 
-import os
 from pathlib import Path
 
 import pytest
 from fastapi.testclient import TestClient
 
 
+@pytest.fixture(scope="session")
+def cli():
+    """Import the Click CLI group once per test session."""
+    from healthcare.cli import cli as healthcare_cli
+
+    return healthcare_cli
+
+
 class TestApplicationAssembly:
     """Test suite for complete application assembly."""
 
-    def setup_method(self):
-        """Set up test environment."""
-        # Set test environment variables
-        os.environ["OPENAI_API_KEY"] = "test-key"
-
     def test_application_creation_success(self):
         """Test that the application can be created successfully."""
-        from healthcare.main import create_app
-
-        app = create_app()
+        # The module-level app is built by create_app() at import time
+        from healthcare.main import app
 
         # Verify app is created
         assert app is not None
@@ -96,15 +97,11 @@ class TestApplicationAssembly:
         """Test that OpenAPI documentation is available."""
         from healthcare.main import app
 
-        client = TestClient(app)
-
-        # Test docs endpoint
-        response = client.get("/docs")
-        assert response.status_code == 200
+        # Docs UIs are static templates; only check they are mounted
+        assert app.docs_url == "/docs"
+        assert app.redoc_url == "/redoc"
 
-        # Test redoc endpoint
-        response = client.get("/redoc")
-        assert response.status_code == 200
+        client = TestClient(app)
 
         # Test OpenAPI schema
         response = client.get("/openapi.json")
@@ -138,10 +135,8 @@ class TestApplicationAssembly:
         # The lifespan manager should be configured
         assert app.router.lifespan_context is not None
 
-    def test_cli_integration(self):
+    def test_cli_integration(self, cli):
         """Test that CLI is properly integrated."""
-        from healthcare.cli import cli
-
         # CLI should be available
         assert cli is not None
 
@@ -1,313 +1,374 @@
 """Tests for enhanced health check endpoint."""
 
+import re
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
-from unittest.mock import Mock, patch
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Optional
 
+import httpx
+import orjson
 import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
-from healthcare.config.config import Config
 from healthcare.main import add_routes, create_app
-from healthcare.reports.service import ReportService
-from healthcare.search.embeddings import EmbeddingService
-from healthcare.search.search_service import SearchService
-from healthcare.storage.database import DatabaseService
 
+_ISO_TIMESTAMP_RE = re.compile(
+    r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:\d{2})?$"
+)
 
+_SERVICE_STATE_KEYS = (
+    "config",
+    "db_service",
+    "embedding_service",
+    "search_service",
+    "report_service",
+)
+
+
+def _json(response: httpx.Response):
+    """Parse a response body with orjson."""
+    return orjson.loads(response.content)
+
+
+def _set_services(app: FastAPI, services: dict) -> None:
+    """Store services on the app state, leaving None entries unset."""
+    for name, service in services.items():
+        if service is not None:
+            setattr(app.state, name, service)
+
+
+@lru_cache(maxsize=1)
+def _prototype_app() -> FastAPI:
+    """Build the fully routed app once for the test session."""
+    app = create_app()
+    add_routes(app)
+    return app
+
+
+class _Dir:
+    """Stand-in for a data directory that always exists."""
+
+    exists = staticmethod(lambda: True)
+
+    def __str__(self) -> str:
+        return "data"
+
+
+@dataclass(slots=True)
+class _StubConfig:
+    """Configuration attributes read by the health check."""
+
+    openai_model: str = "gpt-5-mini"
+    embedding_model: str = "text-embedding-3-large"
+    base_data_dir: _Dir = field(default_factory=_Dir)
+    reports_dir: str = "data/reports"
+    chunk_size: int = 1000
+    chunk_overlap: int = 200
+
+
+@dataclass(slots=True)
+class _StubDB:
+    """Database service whose sessions answer the health check query."""
+
+    error: Optional[Exception] = None
+    sessions_opened: int = 0
+    barrier: Optional[threading.Barrier] = None
+
+    @contextmanager
+    def get_session(self):
+        self.sessions_opened += 1
+        if self.barrier is not None:
+            self.barrier.wait()
+        if self.error is not None:
+            raise self.error
+        yield SimpleNamespace(exec=lambda _: SimpleNamespace(first=lambda: True))
+
+
+@dataclass(slots=True)
+class _StubService:
+    """Embedding, search or report service exposing only its config."""
+
+    config: Optional[_StubConfig]
+
+
+class _RendezvousService:
+    """Service whose config read blocks until another probe reaches a barrier."""
+
+    def __init__(self, config: _StubConfig, barrier: threading.Barrier):
+        self._config = config
+        self._barrier = barrier
+
+    @property
+    def config(self) -> _StubConfig:
+        self._barrier.wait()
+        return self._config
+
+
+_NOT_INITIALIZED = {"status": "not_initialized"}
+
+# Service statuses reported when every stub service is healthy
+_HEALTHY_SERVICES = {
+    "config": {
+        "status": "healthy",
+        "openai_model": "gpt-5-mini",
+        "embedding_model": "text-embedding-3-large",
+        "base_data_dir_exists": True,
+    },
+    "database": {"status": "healthy", "connection": "active"},
+    "embedding": {
+        "status": "healthy",
+        "model": "text-embedding-3-large",
+        "chunk_size": 1000,
+        "chunk_overlap": 200,
+    },
+    "search": {
+        "status": "healthy",
+        "embedding_model": "text-embedding-3-large",
+        "vector_db": "chroma",
+    },
+    "reports": {
+        "status": "healthy",
+        "base_data_dir": "data",
+        "reports_dir": "data/reports",
+    },
+}
+
+# Expected response bodies, without the timestamp
+_EXPECTED_HEALTHY = {
+    "status": "healthy",
+    "version": "0.1.0",
+    "services": _HEALTHY_SERVICES,
+}
+_EXPECTED_NOT_INITIALIZED = {
+    **_EXPECTED_HEALTHY,
+    "status": "degraded",
+    "services": dict.fromkeys(_HEALTHY_SERVICES, _NOT_INITIALIZED),
+}
+_EXPECTED_MIXED = {
+    **_EXPECTED_HEALTHY,
+    "status": "degraded",
+    "services": {
+        **_HEALTHY_SERVICES,
+        "search": _NOT_INITIALIZED,
+        "reports": _NOT_INITIALIZED,
+    },
+}
+
+# Broken stub per service: (app state key, stub, expected error fragment)
+_FAILING_SERVICES = {
+    "database": (
+        "db_service",
+        _StubDB(error=Exception("Connection refused")),
+        "Connection refused",
+    ),
+    # A missing config will cause an AttributeError
+    "embedding": ("embedding_service", _StubService(config=None), "embedding_model"),
+    "search": ("search_service", _StubService(config=None), "embedding_model"),
+}
+
+# (app state overrides, expected status code, expected body);
+# a None override leaves that service unset on the app
+_SCENARIOS = [
+    pytest.param({}, 200, _EXPECTED_HEALTHY, id="all_services_healthy"),
+    pytest.param(
+        dict.fromkeys(_SERVICE_STATE_KEYS),
+        503,
+        _EXPECTED_NOT_INITIALIZED,
+        id="services_not_initialized",
+    ),
+    pytest.param(
+        {"search_service": None, "report_service": None},
+        503,
+        _EXPECTED_MIXED,
+        id="mixed_service_states",
+    ),
+]
+
+
+@pytest.mark.xdist_group("healthcheck")
 class TestHealthCheckEndpoint:
     """Test cases for the enhanced health check endpoint."""
 
+    @pytest.fixture(scope="session", autouse=True)
+    def warm_up_app(self):
+        """Serve one health check so route and encoder setup happens up front."""
+        TestClient(_prototype_app()).get("/health")
+
     @pytest.fixture
     def app(self):
-        """Create test FastAPI app."""
-        app = create_app()
-        add_routes(app)
+        """Create a fresh app sharing the prototype's routes."""
+        app = FastAPI()
+        app.router.routes = list(_prototype_app().router.routes)
         return app
 
     @pytest.fixture
-    def client(self, app):
-        """Create test client."""
-        return TestClient(app)
+    async def client(self, app):
+        """Create an async client that calls the app directly over ASGI."""
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            yield c
 
     @pytest.fixture
     def mock_config(self):
-        """Mock configuration."""
-        config = Mock(spec=Config)
-        config.openai_model = "gpt-5-mini"
-        config.embedding_model = "text-embedding-3-large"
-        config.base_data_dir.exists.return_value = True
-        config.chunk_size = 1000
-        config.chunk_overlap = 200
-        return config
+        """Stub configuration."""
+        return _StubConfig()
 
     @pytest.fixture
     def mock_db_service(self):
-        """Mock database service."""
-        from contextlib import contextmanager
-
-        db_service = Mock(spec=DatabaseService)
-        session_mock = Mock()
-        session_mock.exec.return_value.first.return_value = True
-
-        @contextmanager
-        def mock_get_session():
-            yield session_mock
-
-        db_service.get_session = mock_get_session
-        return db_service
+        """Stub database service with a working session."""
+        return _StubDB()
 
     @pytest.fixture
     def mock_embedding_service(self, mock_config):
-        """Mock embedding service."""
-        embedding_service = Mock(spec=EmbeddingService)
-        embedding_service.config = mock_config
-        return embedding_service
+        """Stub embedding service."""
+        return _StubService(mock_config)
 
     @pytest.fixture
     def mock_search_service(self, mock_config):
-        """Mock search service."""
-        search_service = Mock(spec=SearchService)
-        search_service.config = mock_config
-        return search_service
+        """Stub search service."""
+        return _StubService(mock_config)
 
     @pytest.fixture
     def mock_report_service(self, mock_config):
-        """Mock report service."""
-        report_service = Mock(spec=ReportService)
-        report_service.config = mock_config
-        return report_service
+        """Stub report service."""
+        return _StubService(mock_config)
 
-    def test_health_check_all_services_healthy(
+    @pytest.fixture
+    def healthy_state(
         self,
-        client,
         mock_config,
         mock_db_service,
         mock_embedding_service,
         mock_search_service,
         mock_report_service,
     ):
-        """Test health check when all services are healthy."""
-        # Set up app state with all services
-        client.app.state.config = mock_config
-        client.app.state.db_service = mock_db_service
-        client.app.state.embedding_service = mock_embedding_service
-        client.app.state.search_service = mock_search_service
-        client.app.state.report_service = mock_report_service
-
-        response = client.get("/health")
-
-        assert response.status_code == 200
-        data = response.json()
-
-        # Check overall status
-        assert data["status"] == "healthy"
-        assert "timestamp" in data
-        assert data["version"] == "0.1.0"
-        assert "services" in data
-
-        # Check individual service statuses
-        services = data["services"]
+        """App state with every service initialized and healthy."""
+        return {
+            "config": mock_config,
+            "db_service": mock_db_service,
+            "embedding_service": mock_embedding_service,
+            "search_service": mock_search_service,
+            "report_service": mock_report_service,
+        }
+
+    @pytest.mark.parametrize(
+        "overrides, expected_status_code, expected_body", _SCENARIOS
+    )
+    @pytest.mark.asyncio
+    async def test_health_check(
+        self, app, client, healthy_state, overrides, expected_status_code, expected_body
+    ):
+        """Test the health check response for each service scenario."""
+        _set_services(app, {**healthy_state, **overrides})
 
-        # Config service
-        assert services["config"]["status"] == "healthy"
-        assert services["config"]["openai_model"] == "gpt-5-mini"
-        assert services["config"]["embedding_model"] == "text-embedding-3-large"
-        assert services["config"]["base_data_dir_exists"] is True
-
-        # Database service
-        assert services["database"]["status"] == "healthy"
-        assert services["database"]["connection"] == "active"
-
-        # Embedding service
-        assert services["embedding"]["status"] == "healthy"
-        assert services["embedding"]["model"] == "text-embedding-3-large"
-        assert services["embedding"]["chunk_size"] == 1000
-        assert services["embedding"]["chunk_overlap"] == 200
-
-        # Search service
-        assert services["search"]["status"] == "healthy"
-        assert services["search"]["embedding_model"] == "text-embedding-3-large"
-        assert services["search"]["vector_db"] == "chroma"
-
-        # Report service
-        assert services["reports"]["status"] == "healthy"
-        assert "base_data_dir" in services["reports"]
-        assert "reports_dir" in services["reports"]
-
-    def test_health_check_services_not_initialized(self, client):
-        """Test health check when services are not initialized."""
-        # Clear app state to simulate services not initialized
-        if hasattr(client.app.state, "config"):
-            delattr(client.app.state, "config")
-        if hasattr(client.app.state, "db_service"):
-            delattr(client.app.state, "db_service")
-        if hasattr(client.app.state, "embedding_service"):
-            delattr(client.app.state, "embedding_service")
-        if hasattr(client.app.state, "search_service"):
-            delattr(client.app.state, "search_service")
-        if hasattr(client.app.state, "report_service"):
-            delattr(client.app.state, "report_service")
-
-        response = client.get("/health")
+        response = await client.get("/health")
 
-        assert response.status_code == 503
-        data = response.json()["detail"]
+        assert response.status_code == expected_status_code
+        data = _json(response)
+        if expected_status_code != 200:
+            data = data["detail"]
 
-        # Check overall status
-        assert data["status"] == "degraded"
         assert "timestamp" in data
+        data.pop("timestamp")
+        assert data == expected_body
 
-        # Check individual service statuses
-        services = data["services"]
-        assert services["config"]["status"] == "not_initialized"
-        assert services["database"]["status"] == "not_initialized"
-        assert services["embedding"]["status"] == "not_initialized"
-        assert services["search"]["status"] == "not_initialized"
-        assert services["reports"]["status"] == "not_initialized"
-
-    def test_health_check_database_connection_failure(
-        self,
-        client,
-        mock_config,
-        mock_embedding_service,
-        mock_search_service,
-        mock_report_service,
+    @pytest.mark.parametrize("failing", list(_FAILING_SERVICES))
+    @pytest.mark.asyncio
+    async def test_health_check_service_failure(
+        self, app, client, healthy_state, failing
     ):
-        """Test health check when database connection fails."""
-        # Create a failing database service
-        failing_db_service = Mock(spec=DatabaseService)
-        failing_db_service.get_session.side_effect = Exception("Connection refused")
-
-        # Set up app state with failing database
-        client.app.state.config = mock_config
-        client.app.state.db_service = failing_db_service
-        client.app.state.embedding_service = mock_embedding_service
-        client.app.state.search_service = mock_search_service
-        client.app.state.report_service = mock_report_service
+        """Test that one failing service marks only that service unhealthy."""
+        state_key, broken_service, expected_error = _FAILING_SERVICES[failing]
+        _set_services(app, {**healthy_state, state_key: broken_service})
 
-        response = client.get("/health")
+        response = await client.get("/health")
 
         assert response.status_code == 503
-        data = response.json()["detail"]
-
-        # Check overall status
+        data = _json(response)["detail"]
         assert data["status"] == "unhealthy"
 
-        # Check individual service statuses
         services = data["services"]
-        assert services["config"]["status"] == "healthy"
-        assert services["database"]["status"] == "unhealthy"
-        assert "Connection refused" in services["database"]["error"]
-        assert services["embedding"]["status"] == "healthy"
-        assert services["search"]["status"] == "healthy"
-        assert services["reports"]["status"] == "healthy"
-
-    def test_health_check_embedding_service_failure(
-        self,
-        client,
-        mock_config,
-        mock_db_service,
-        mock_search_service,
-        mock_report_service,
+        assert services[failing]["status"] == "unhealthy"
+        assert expected_error in services[failing]["error"]
+        for name, healthy in _HEALTHY_SERVICES.items():
+            if name != failing:
+                assert services[name] == healthy, f"Unexpected status for {name}"
+
+    @pytest.mark.asyncio
+    async def test_health_check_uses_cache(
+        self, app, client, healthy_state, mock_db_service
     ):
-        """Test health check when embedding service fails."""
-        # Create a failing embedding service
-        failing_embedding_service = Mock(spec=EmbeddingService)
-        failing_embedding_service.config = None  # This will cause an AttributeError
+        """Test that a healthy result is reused instead of probing again."""
+        _set_services(app, healthy_state)
 
-        # Set up app state with failing embedding service
-        client.app.state.config = mock_config
-        client.app.state.db_service = mock_db_service
-        client.app.state.embedding_service = failing_embedding_service
-        client.app.state.search_service = mock_search_service
-        client.app.state.report_service = mock_report_service
+        first = await client.get("/health")
+        second = await client.get("/health")
 
-        response = client.get("/health")
-
-        assert response.status_code == 503
-        data = response.json()["detail"]
+        assert first.status_code == second.status_code == 200
+        assert _json(second) == _json(first)
+        assert mock_db_service.sessions_opened == 1
 
-        # Check overall status
-        assert data["status"] == "unhealthy"
-
-        # Check individual service statuses
-        services = data["services"]
-        assert services["config"]["status"] == "healthy"
-        assert services["database"]["status"] == "healthy"
-        assert services["embedding"]["status"] == "unhealthy"
-        assert "error" in services["embedding"]
-        assert services["search"]["status"] == "healthy"
-        assert services["reports"]["status"] == "healthy"
-
-    def test_health_check_search_service_failure(
-        self,
-        client,
-        mock_config,
-        mock_db_service,
-        mock_embedding_service,
-        mock_report_service,
+    @pytest.mark.asyncio
+    async def test_health_check_cache_expires(
+        self, app, client, healthy_state, mock_db_service, monkeypatch
     ):
-        """Test health check when search service fails."""
-        # Create a failing search service
-        failing_search_service = Mock(spec=SearchService)
-        failing_search_service.config = None  # This will cause an AttributeError
+        """Test that services are probed again once the cached result expires."""
+        monkeypatch.setattr("healthcare.main.HEALTH_CACHE_TTL_SECONDS", 0)
+        _set_services(app, healthy_state)
 
-        # Set up app state with failing search service
-        client.app.state.config = mock_config
-        client.app.state.db_service = mock_db_service
-        client.app.state.embedding_service = mock_embedding_service
-        client.app.state.report_service = mock_report_service
-        client.app.state.search_service = failing_search_service
+        await client.get("/health")
+        await client.get("/health")
 
-        response = client.get("/health")
-
-        assert response.status_code == 503
-        data = response.json()["detail"]
+        assert mock_db_service.sessions_opened == 2
 
-        # Check overall status
-        assert data["status"] == "unhealthy"
-
-        # Check individual service statuses
-        services = data["services"]
-        assert services["config"]["status"] == "healthy"
-        assert services["database"]["status"] == "healthy"
-        assert services["embedding"]["status"] == "healthy"
-        assert services["search"]["status"] == "unhealthy"
-        assert "error" in services["search"]
-        assert services["reports"]["status"] == "healthy"
-
-    def test_health_check_mixed_service_states(
-        self, client, mock_config, mock_db_service, mock_embedding_service
+    @pytest.mark.asyncio
+    async def test_health_check_does_not_cache_failures(
+        self, app, client, healthy_state, mock_db_service
     ):
-        """Test health check with mixed service states."""
-        # Set up app state with some services initialized, some not
-        client.app.state.config = mock_config
-        client.app.state.db_service = mock_db_service
-        client.app.state.embedding_service = mock_embedding_service
-        # Don't set search_service or report_service to simulate them not being initialized
-        if hasattr(client.app.state, "search_service"):
-            delattr(client.app.state, "search_service")
-        if hasattr(client.app.state, "report_service"):
-            delattr(client.app.state, "report_service")
-
-        response = client.get("/health")
-
-        assert response.status_code == 503
-        data = response.json()["detail"]
-
-        # Check overall status
-        assert data["status"] == "degraded"
-
-        # Check individual service statuses
-        services = data["services"]
-        assert services["config"]["status"] == "healthy"
-        assert services["database"]["status"] == "healthy"
-        assert services["embedding"]["status"] == "healthy"
-        assert services["search"]["status"] == "not_initialized"
-        assert services["reports"]["status"] == "not_initialized"
+        """Test that a failed check is re-run on the next request."""
+        _set_services(
+            app, {**healthy_state, "db_service": _StubDB(error=Exception("down"))}
+        )
+        failed = await client.get("/health")
+
+        app.state.db_service = mock_db_service
+        recovered = await client.get("/health")
+
+        assert failed.status_code == 503
+        assert recovered.status_code == 200
+        assert mock_db_service.sessions_opened == 1
+
+    @pytest.mark.asyncio
+    async def test_health_check_runs_probes_concurrently(
+        self, app, client, healthy_state, mock_config
+    ):
+        """Test that probes overlap instead of running one after another."""
+        # Both probes must be in flight at once for the barrier to open; run
+        # serially, the first wait times out and breaks the barrier
+        barrier = threading.Barrier(2, timeout=5)
+        _set_services(
+            app,
+            {
+                **healthy_state,
+                "db_service": _StubDB(barrier=barrier),
+                "search_service": _RendezvousService(mock_config, barrier),
+            },
+        )
+
+        response = await client.get("/health")
+
+        assert not barrier.broken
+        assert response.status_code == 200
 
-    def test_health_check_response_format(
+    @pytest.mark.asyncio
+    async def test_health_check_response_format(
         self,
+        app,
         client,
         mock_config,
         mock_db_service,
@@ -317,16 +378,16 @@ class TestHealthCheckEndpoint:
     ):
         """Test that health check response has the correct format."""
         # Set up app state with all services
-        client.app.state.config = mock_config
-        client.app.state.db_service = mock_db_service
-        client.app.state.embedding_service = mock_embedding_service
-        client.app.state.report_service = mock_report_service
-        client.app.state.search_service = mock_search_service
+        app.state.config = mock_config
+        app.state.db_service = mock_db_service
+        app.state.embedding_service = mock_embedding_service
+        app.state.report_service = mock_report_service
+        app.state.search_service = mock_search_service
 
-        response = client.get("/health")
+        response = await client.get("/health")
 
         assert response.status_code == 200
-        data = response.json()
+        data = _json(response)
 
         # Check required top-level fields
         required_fields = ["status", "timestamp", "version", "services"]
@@ -335,8 +396,9 @@ class TestHealthCheckEndpoint:
 
         # Check timestamp format (should be ISO format)
         timestamp = data["timestamp"]
-        # This should not raise an exception if it's a valid ISO format
-        datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+        assert _ISO_TIMESTAMP_RE.match(timestamp), f"Not ISO 8601: {timestamp}"
+        # fromisoformat accepts a trailing "Z" natively on Python 3.11+
+        datetime.fromisoformat(timestamp)
 
         # Check services structure
         services = data["services"]
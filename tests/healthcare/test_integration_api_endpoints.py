@@ -1,54 +1,21 @@
 """Integration tests for all API endpoints."""
 
-import json
-import os
-import tempfile
-from pathlib import Path
-from unittest.mock import Mock, patch
+from types import SimpleNamespace
 
+import orjson
 import pytest
 from fastapi.testclient import TestClient
 
+from healthcare.agent.routes import get_healthcare_agent
 from healthcare.main import app
+from healthcare.reports.routes import get_report_service
+from healthcare.search.routes import get_search_service
+from tests.utils import _restored_app_state
 
+TEST_USER_ID = "test_api_user"
 
-class TestAPIEndpointsIntegration:
-    """Integration test suite for all API endpoints."""
-
-    def setup_method(self):
-        """Set up test fixtures for each test."""
-        # Set test environment variables
-        os.environ["OPENAI_API_KEY"] = "test-key"
-
-        # Create temporary directory for test data
-        self.temp_dir = tempfile.mkdtemp()
-        self.test_data_dir = Path(self.temp_dir)
-
-        # Set environment variables to use test directory
-        os.environ["DATA_DIR"] = str(self.test_data_dir)
-        os.environ["UPLOADS_DIR"] = str(self.test_data_dir / "uploads")
-        os.environ["REPORTS_DIR"] = str(self.test_data_dir / "reports")
-        os.environ["CHROMA_DIR"] = str(self.test_data_dir / "chroma")
-
-        # Create test client
-        self.client = TestClient(app)
-
-        # Sample data for testing
-        self.test_user_id = "test_api_user"
-        self.create_sample_pdf()
-
-    def teardown_method(self):
-        """Clean up after each test."""
-        import shutil
-
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-
-    def create_sample_pdf(self):
-        """Create a minimal PDF file for testing."""
-        self.sample_pdf_path = self.test_data_dir / "api_test_report.pdf"
-
-        # Create a minimal PDF content
-        pdf_content = b"""%PDF-1.4
+# Minimal single-page PDF used as upload input
+PDF_BYTES = b"""%PDF-1.4
 1 0 obj
 << /Type /Catalog /Pages 2 0 R >>
 endobj
@@ -81,51 +48,295 @@ startxref
 311
 %%EOF"""
 
-        self.sample_pdf_path.write_bytes(pdf_content)
 
-    def test_root_endpoint(self):
-        """Test the root endpoint."""
-        response = self.client.get("/")
-        assert response.status_code == 200
+# Chat request bodies, serialized once and sent as raw content
+JSON_HEADERS = {"content-type": "application/json"}
+CHAT_BODY = orjson.dumps(
+    {
+        "user_external_id": TEST_USER_ID,
+        "query": "What medical information do you have for me?",
+        "session_id": "api_test_session",
+    }
+)
+CHAT_BODY_WITHOUT_SESSION = orjson.dumps(
+    {"user_external_id": TEST_USER_ID, "query": "Test query without session"}
+)
+CHAT_BODY_WITHOUT_USER = orjson.dumps({"user_external_id": "", "query": "Test query"})
+
+# Malformed requests and the error status each endpoint should answer with
+ERROR_CASES = [
+    # Upload endpoints
+    {
+        "method": "POST",
+        "url": "/api/upload",
+        "kwargs": {"data": {}, "files": {}},
+        "status": 422,
+    },
+    # Reports endpoints
+    {
+        "method": "GET",
+        "url": "/api//search",
+        "kwargs": {"params": {"q": "test"}},
+        "status": 404,
+    },
+    {"method": "GET", "url": "/reports/999/markdown", "kwargs": {}, "status": 404},
+    # Agent endpoints
+    {"method": "POST", "url": "/api/agent/chat", "kwargs": {"json": {}}, "status": 422},
+    {"method": "GET", "url": "/api/agent/history/", "kwargs": {}, "status": 404},
+    # Asset endpoints
+    {"method": "GET", "url": "/api/reports//assets", "kwargs": {}, "status": 404},
+]
+
+# Endpoints that should always answer with a JSON object
+CONSISTENCY_ENDPOINTS = ["/config", "/api/agent/config"]
+
+# Requests that should fail request validation
+VALIDATION_CASES = [
+    {
+        "method": "POST",
+        "url": "/api/agent/chat",
+        "kwargs": {"json": {"user_external_id": "", "query": "test"}},
+    },
+    {
+        "method": "GET",
+        "url": "/api/search/test_user",
+        "kwargs": {"params": {"q": "", "k": 5}},
+    },
+]
+
+
+def _check_root(response):
+    assert response.json() == {
+        "message": "Healthcare Agent MVP",
+        "status": "running",
+        "docs": "/docs",
+    }
+
+
+def _check_health(response):
+    data = response.json()
+    assert data["status"] == "healthy"
+    assert data["version"] == "0.1.0"
+    assert "timestamp" in data
+    assert {service["status"] for service in data["services"].values()} == {"healthy"}
+
+
+def _check_openapi(response):
+    schema = response.json()
+    assert "openapi" in schema
+    assert schema["info"]["title"] == "Healthcare Agent MVP"
+
+
+def _check_html(response):
+    assert "text/html" in response.headers["content-type"]
+
+
+# Requests probing CORS and content type handling, all sent from a browser origin
+ORIGIN = "http://localhost:3000"
+HEADER_REQUESTS = {
+    "options_preflight": lambda client: client.options(
+        "/api/upload",
+        headers={
+            "Origin": ORIGIN,
+            "Access-Control-Request-Method": "POST",
+            "Access-Control-Request-Headers": "Content-Type",
+        },
+    ),
+    "post_json": lambda client: client.post(
+        "/api/agent/chat",
+        content=CHAT_BODY_WITHOUT_SESSION,
+        headers={**JSON_HEADERS, "Origin": ORIGIN},
+    ),
+    "post_multipart": lambda client: client.post(
+        "/api/upload",
+        data={"user_external_id": TEST_USER_ID},
+        files={"file": ("test.pdf", PDF_BYTES, "application/pdf")},
+        headers={"Origin": ORIGIN},
+    ),
+}
+
+
+def _assert_headers(response, content_type):
+    assert response.headers["access-control-allow-origin"] in ("*", ORIGIN)
+    assert response.headers["content-type"].startswith(content_type)
+
+
+class FakeOpenAI:
+    """OpenAI client answering file uploads, conversions and embeddings offline."""
+
+    MARKDOWN = "# Test Report\n\nAPI integration test content"
+    EMBEDDING_DIMENSIONS = 8
+
+    def __init__(self):
+        self.files = SimpleNamespace(
+            create=lambda **kwargs: SimpleNamespace(id="file-test-123"),
+            delete=lambda file_id: None,
+        )
+        self.responses = SimpleNamespace(create=self._convert)
+        self.embeddings = SimpleNamespace(create=self._embed)
 
-        data = response.json()
-        assert "message" in data
-        assert "status" in data
-        assert "docs" in data
-        assert data["message"] == "Healthcare Agent MVP"
-        assert data["status"] == "running"
-        assert data["docs"] == "/docs"
-
-    def test_health_endpoint(self):
-        """Test the health check endpoint."""
-        response = self.client.get("/health")
-
-        # Health endpoint may return 200 (healthy) or 503 (degraded/unhealthy)
-        assert response.status_code in [200, 503]
+    def _convert(self, **kwargs):
+        output = {"markdown": self.MARKDOWN, "manifest": {"figures": [], "tables": []}}
+        return SimpleNamespace(output_text=orjson.dumps(output).decode())
 
-        data = response.json()
-        # Health endpoint may return different format based on service status
-        if "detail" in data:
-            # Degraded health response
-            assert "status" in data["detail"] or "status" in data
-        else:
-            # Normal health response
-            assert "status" in data
-
-        # Should have timestamp and version info
-        assert "timestamp" in data or (
-            "detail" in data and "timestamp" in data["detail"]
-        )
-        assert "version" in data or ("detail" in data and "version" in data["detail"])
+    def _embed(self, input, **kwargs):
+        vector = [0.1] * self.EMBEDDING_DIMENSIONS
+        return SimpleNamespace(data=[SimpleNamespace(embedding=vector) for _ in input])
+
+
+class FakeReportService:
+    """Report service for a user without any reports."""
+
+    def list_user_reports(self, user_external_id):
+        return []
+
+    def get_report_stats(self, user_external_id):
+        return {
+            "user_external_id": user_external_id,
+            "total_reports": 0,
+            "total_assets": 0,
+            "total_markdown_size": 0,
+        }
+
+    def _missing(self, report_id, user_external_id):
+        raise ValueError(f"Report not found: {report_id}")
+
+    get_report_markdown = _missing
+    get_report_summary = _missing
+    list_report_assets = _missing
+
+
+class FakeSearchService:
+    """Search service with an empty index."""
+
+    def semantic_search(self, user_external_id, query, k=5):
+        return []
+
+    def get_search_stats(self, user_external_id):
+        return {
+            "user_external_id": user_external_id,
+            "reports_count": 0,
+            "total_chunks": 0,
+            "embedding_model": "text-embedding-3-large",
+        }
+
+
+class FakeHealthcareAgent:
+    """Healthcare agent returning canned replies without calling OpenAI."""
+
+    REPLY = "No medical reports are available yet."
 
-        # Status should be one of the expected values
-        status = data.get("status") or data.get("detail", {}).get("status")
-        if status:
-            assert status in ["healthy", "degraded", "unhealthy"]
+    def process_query(self, user_external_id, query, session_id=None):
+        return self.REPLY
 
-    def test_config_endpoint(self):
+    def get_conversation_history(self, user_external_id, session_id=None):
+        return []
+
+    def clear_conversation_history(self, user_external_id, session_id=None):
+        return True
+
+    def get_agent_stats(self):
+        return {
+            "agent_name": "Healthcare Consultant",
+            "model": "gpt-5-mini",
+            "embedding_model": "text-embedding-3-large",
+            "vector_db": "ChromaDB",
+            "storage": "SQLite",
+            "knowledge_base": "medical_reports",
+            "toolkit_functions": [],
+        }
+
+
+class TestAPIEndpointsIntegration:
+    """Integration test suite for all API endpoints."""
+
+    @pytest.fixture(scope="class", autouse=True)
+    def api_environment(self, tmp_path_factory):
+        """Point the data directories at a temporary directory for this class."""
+        data_dir = tmp_path_factory.mktemp("api_data")
+        with pytest.MonkeyPatch.context() as mp:
+            # Startup writes its log files under a relative logs/ directory
+            mp.chdir(data_dir)
+            mp.setenv("OPENAI_API_KEY", "test-key")
+            mp.setenv("DATA_DIR", str(data_dir))
+            mp.setenv("UPLOADS_DIR", str(data_dir / "uploads"))
+            mp.setenv("REPORTS_DIR", str(data_dir / "reports"))
+            mp.setenv("CHROMA_DIR", str(data_dir / "chroma"))
+            yield data_dir
+
+    @pytest.fixture(scope="class", autouse=True)
+    def fake_openai(self):
+        """Route every OpenAI client built by the app to one shared fake."""
+        fake = FakeOpenAI()
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(
+                "healthcare.conversion.conversion_service.OpenAI", lambda **_: fake
+            )
+            mp.setattr("healthcare.search.embeddings.OpenAI", lambda **_: fake)
+            mp.setattr(
+                "healthcare.images.image_service.ImageExtractionService."
+                "extract_images_pikepdf",
+                lambda self, pdf_path, output_dir: [],
+            )
+            yield fake
+
+    @pytest.fixture(scope="class", autouse=True)
+    def service_overrides(self):
+        """Serve report, search and agent endpoints from in-memory fakes."""
+        overrides = {
+            get_report_service: FakeReportService,
+            get_search_service: FakeSearchService,
+            get_healthcare_agent: FakeHealthcareAgent,
+        }
+        app.dependency_overrides.update(overrides)
+        yield
+        for dependency in overrides:
+            app.dependency_overrides.pop(dependency, None)
+
+    @pytest.fixture(scope="class")
+    def client(self, api_environment):
+        """Start the app once for the class and share its test client.
+
+        Every test reuses this client, its transport and the services the
+        lifespan stored on app.state. Tests must not replace app.state
+        attributes; patch them with monkeypatch so they are restored.
+        """
+        with (
+            _restored_app_state(app),
+            TestClient(
+                app, backend="asyncio", raise_server_exceptions=True
+            ) as test_client,
+        ):
+            yield test_client
+
+    @pytest.fixture(scope="session")
+    def sample_pdf(self, tmp_path_factory):
+        """Write the minimal sample PDF once for the whole session."""
+        path = tmp_path_factory.mktemp("hc") / "api_test_report.pdf"
+        path.write_bytes(PDF_BYTES)
+        return path
+
+    @pytest.mark.parametrize(
+        "url,checks",
+        [
+            ("/", _check_root),
+            ("/health", _check_health),
+            ("/openapi.json", _check_openapi),
+            # Swagger UI and ReDoc page rendering runs only with -m slow
+            pytest.param("/docs", _check_html, marks=pytest.mark.slow),
+            pytest.param("/redoc", _check_html, marks=pytest.mark.slow),
+        ],
+    )
+    def test_get_smoke(self, client, url, checks):
+        """Test the root, health and documentation endpoints answer."""
+        response = client.get(url)
+
+        assert response.status_code == 200
+        checks(response)
+
+    def test_config_endpoint(self, client):
         """Test the configuration endpoint."""
-        response = self.client.get("/config")
+        response = client.get("/config")
 
         # Config endpoint may fail if services aren't initialized
         assert response.status_code in [200, 503]
@@ -136,422 +347,230 @@ startxref
             assert "embedding_model" in data
             assert "data_directories" in data
 
-    def test_openapi_documentation_endpoints(self):
-        """Test OpenAPI documentation endpoints."""
-        # Test OpenAPI schema
-        response = self.client.get("/openapi.json")
-        assert response.status_code == 200
-
-        schema = response.json()
-        assert "openapi" in schema
-        assert "info" in schema
-        assert schema["info"]["title"] == "Healthcare Agent MVP"
-
-        # Test Swagger UI
-        response = self.client.get("/docs")
-        assert response.status_code == 200
-        assert "text/html" in response.headers.get("content-type", "")
-
-        # Test ReDoc
-        response = self.client.get("/redoc")
-        assert response.status_code == 200
-        assert "text/html" in response.headers.get("content-type", "")
-
-    @patch("healthcare.conversion.conversion_service.OpenAI")
-    @patch("healthcare.images.image_service.extract_images_from_pdf")
-    @pytest.mark.skip
-    def test_upload_endpoints(self, mock_extract_images, mock_openai):
+    def test_upload_endpoints(self, client, sample_pdf):
         """Test all upload-related endpoints."""
 
-        # Setup mocks
-        mock_openai_client = Mock()
-        mock_openai.return_value = mock_openai_client
-
-        mock_file_response = Mock()
-        mock_file_response.id = "file-test-123"
-        mock_openai_client.files.create.return_value = mock_file_response
-
-        mock_parse_response = Mock()
-        mock_parse_response.output_parsed = Mock()
-        mock_parse_response.output_parsed.markdown = (
-            "# Test Report\n\nAPI integration test content"
-        )
-        mock_parse_response.output_parsed.manifest = {"figures": [], "tables": []}
-        mock_openai_client.responses.parse.return_value = mock_parse_response
-
-        mock_extract_images.return_value = []
-
         # Test PDF upload
-        with open(self.sample_pdf_path, "rb") as pdf_file:
-            response = self.client.post(
+        with open(sample_pdf, "rb") as pdf_file:
+            response = client.post(
                 "/api/upload",
-                data={"user_external_id": self.test_user_id},
+                data={"user_external_id": TEST_USER_ID},
                 files={"file": ("test_report.pdf", pdf_file, "application/pdf")},
             )
 
         assert response.status_code == 200
         upload_data = response.json()
         assert "report_id" in upload_data
-        self.test_report_id = upload_data["report_id"]
+        assert upload_data["embeddings_generated"] is True
 
         # Test upload stats endpoint
-        stats_response = self.client.get("/api/upload/stats")
+        stats_response = client.get("/api/upload/stats")
         assert stats_response.status_code == 200
 
         stats_data = stats_response.json()
         assert "total_uploads" in stats_data
 
         # Test invalid file upload
-        invalid_response = self.client.post(
+        invalid_response = client.post(
             "/api/upload",
-            data={"user_external_id": self.test_user_id},
+            data={"user_external_id": TEST_USER_ID},
             files={"file": ("invalid.txt", b"not a pdf", "text/plain")},
         )
         assert invalid_response.status_code in [400, 422]
 
         # Test missing parameters
-        missing_user_response = self.client.post(
+        missing_user_response = client.post(
             "/api/upload",
             data={},
             files={"file": ("test.pdf", b"fake pdf", "application/pdf")},
         )
         assert missing_user_response.status_code == 422
 
-    def test_reports_endpoints(self):
+    def test_reports_endpoints(self, client):
         """Test all reports-related endpoints."""
 
-        # Test listing reports for non-existent user
-        response = self.client.get(f"/api/reports/{self.test_user_id}")
-        assert response.status_code in [
-            200,
-            503,
-        ]  # Allow for service unavailable in test environment
-
-        if response.status_code == 200:
-            data = response.json()
-            assert "reports" in data
-            assert isinstance(data["reports"], list)
-
-        # Test getting markdown for non-existent report
-        response = self.client.get(
-            "/api/reports/999/markdown", params={"user_external_id": self.test_user_id}
-        )
-        assert response.status_code in [404, 400, 503]  # Allow for service unavailable
-
-        # Test getting assets for non-existent report
-        response = self.client.get(
-            "/api/reports/999/assets", params={"user_external_id": self.test_user_id}
-        )
-        assert response.status_code in [404, 400, 503]  # Allow for service unavailable
+        # Test listing reports for a user without reports
+        response = client.get(f"/api/reports/{TEST_USER_ID}")
+        assert response.status_code == 200
 
-        # Test getting summary for non-existent report
-        response = self.client.get(
-            "/api/reports/999/summary", params={"user_external_id": self.test_user_id}
-        )
-        assert response.status_code in [404, 400, 503]  # Allow for service unavailable
+        data = response.json()
+        assert data["reports"] == []
+        assert data["total"] == 0
+        assert data["user_external_id"] == TEST_USER_ID
+
+        # Test getting markdown, assets and summary for a non-existent report
+        for path in ("markdown", "assets", "summary"):
+            response = client.get(
+                f"/api/reports/999/{path}", params={"user_external_id": TEST_USER_ID}
+            )
+            assert response.status_code == 404, path
+            assert "not found" in response.json()["detail"]
 
         # Test reports stats
-        response = self.client.get(f"/api/reports/{self.test_user_id}/stats")
-        assert response.status_code in [200, 503]  # Allow for service unavailable
+        response = client.get(f"/api/reports/{TEST_USER_ID}/stats")
+        assert response.status_code == 200
 
-        if response.status_code == 200:
-            stats_data = response.json()
-            assert "total_reports" in stats_data
+        stats_data = response.json()
+        assert stats_data["total_reports"] == 0
 
-    def test_search_endpoints(self):
+    def test_search_endpoints(self, client):
         """Test all search-related endpoints."""
 
         # Test search with valid query
-        response = self.client.get(
-            f"/api/search/{self.test_user_id}",
+        response = client.get(
+            f"/api/search/{TEST_USER_ID}",
             params={"q": "medical report", "k": 5},
         )
-        assert response.status_code in [200, 503]  # Allow for service unavailable
+        assert response.status_code == 200
 
-        if response.status_code == 200:
-            data = response.json()
-            assert "results" in data
-            assert "query" in data
-            assert "total_results" in data
-            assert isinstance(data["results"], list)
+        data = response.json()
+        assert data["results"] == []
+        assert data["query"] == "medical report"
+        assert data["total_results"] == 0
 
         # Test search with empty query
-        response = self.client.get(
-            f"/api/search/{self.test_user_id}", params={"q": "", "k": 5}
-        )
-        assert response.status_code in [400, 422, 503]  # Allow for service unavailable
+        response = client.get(f"/api/search/{TEST_USER_ID}", params={"q": "", "k": 5})
+        assert response.status_code == 422
 
         # Test search with invalid k parameter
-        response = self.client.get(
-            f"/api/search/{self.test_user_id}", params={"q": "test", "k": 0}
+        response = client.get(
+            f"/api/search/{TEST_USER_ID}", params={"q": "test", "k": 0}
         )
-        assert response.status_code in [400, 422, 503]  # Allow for service unavailable
+        assert response.status_code == 422
 
         # Test search with very large k parameter
-        response = self.client.get(
-            f"/api/search/{self.test_user_id}", params={"q": "test", "k": 1000}
+        response = client.get(
+            f"/api/search/{TEST_USER_ID}", params={"q": "test", "k": 1000}
         )
-        assert response.status_code in [
-            200,
-            400,
-            422,
-            503,
-        ]  # Allow for service unavailable
+        assert response.status_code == 422
 
         # Test search stats
-        response = self.client.get(f"/api/search/{self.test_user_id}/stats")
-        assert response.status_code in [200, 503]  # Allow for service unavailable
+        response = client.get(f"/api/search/{TEST_USER_ID}/stats")
+        assert response.status_code == 200
 
-        if response.status_code == 200:
-            stats_data = response.json()
-            assert "total_searches" in stats_data
+        stats_data = response.json()
+        assert stats_data["reports_count"] == 0
+        assert stats_data["total_chunks"] == 0
 
-    def test_agent_endpoints(self):
+    def test_agent_endpoints(self, client):
         """Test all AI agent-related endpoints."""
 
         # Test agent chat
-        response = self.client.post(
+        response = client.post(
             "/api/agent/chat",
-            json={
-                "user_external_id": self.test_user_id,
-                "query": "What medical information do you have for me?",
-                "session_id": "api_test_session",
-            },
+            content=CHAT_BODY,
+            headers=JSON_HEADERS,
         )
-        assert response.status_code in [
-            200,
-            500,
-            503,
-        ]  # Allow for service failures in test environment
+        assert response.status_code == 200
 
-        if response.status_code == 200:
-            data = response.json()
-            assert "response" in data
-            assert "user_external_id" in data
-            assert "session_id" in data
-            assert "query" in data
-            assert data["user_external_id"] == self.test_user_id
+        data = response.json()
+        assert data["response"] == FakeHealthcareAgent.REPLY
+        assert data["user_external_id"] == TEST_USER_ID
+        assert data["session_id"] == "api_test_session"
+        assert data["query"] == "What medical information do you have for me?"
 
         # Test agent chat without session ID
-        response = self.client.post(
+        response = client.post(
             "/api/agent/chat",
-            json={
-                "user_external_id": self.test_user_id,
-                "query": "Test query without session",
-            },
+            content=CHAT_BODY_WITHOUT_SESSION,
+            headers=JSON_HEADERS,
         )
-        assert response.status_code in [200, 500, 503]  # Allow for service failures
-
-        if response.status_code == 200:
-            data = response.json()
-            assert data["session_id"] == self.test_user_id  # Should default to user ID
+        assert response.status_code == 200
+        assert response.json()["session_id"] == TEST_USER_ID  # Defaults to user ID
 
         # Test agent chat with invalid input
-        response = self.client.post(
-            "/api/agent/chat", json={"user_external_id": "", "query": "Test query"}
+        response = client.post(
+            "/api/agent/chat", content=CHAT_BODY_WITHOUT_USER, headers=JSON_HEADERS
         )
         assert response.status_code in [400, 422]
 
         # Test conversation history
-        response = self.client.get(f"/api/agent/history/{self.test_user_id}")
-        assert response.status_code in [200, 500]  # May fail if storage not working
+        response = client.get(f"/api/agent/history/{TEST_USER_ID}")
+        assert response.status_code == 200
 
-        if response.status_code == 200:
-            data = response.json()
-            assert "history" in data
-            assert "total_messages" in data
-            assert "user_external_id" in data
+        data = response.json()
+        assert data["history"] == []
+        assert data["total_messages"] == 0
+        assert data["user_external_id"] == TEST_USER_ID
 
         # Test conversation history with session ID
-        response = self.client.get(
-            f"/api/agent/history/{self.test_user_id}",
+        response = client.get(
+            f"/api/agent/history/{TEST_USER_ID}",
             params={"session_id": "api_test_session"},
         )
-        assert response.status_code in [200, 500]
+        assert response.status_code == 200
+        assert response.json()["session_id"] == "api_test_session"
 
         # Test clearing conversation history
-        response = self.client.delete(f"/api/agent/history/{self.test_user_id}")
-        assert response.status_code in [200, 500]
+        response = client.delete(f"/api/agent/history/{TEST_USER_ID}")
+        assert response.status_code == 200
 
-        if response.status_code == 200:
-            data = response.json()
-            assert "success" in data
-            assert "user_external_id" in data
+        data = response.json()
+        assert data["success"] is True
+        assert data["user_external_id"] == TEST_USER_ID
 
         # Test agent config
-        response = self.client.get("/api/agent/config")
-        assert response.status_code in [200, 503]
+        response = client.get("/api/agent/config")
+        assert response.status_code == 200
 
-        if response.status_code == 200:
-            data = response.json()
-            assert "agent_name" in data
-            assert "model" in data
+        data = response.json()
+        assert data["agent_name"] == "Healthcare Consultant"
+        assert data["model"] == "gpt-5-mini"
 
-    def test_assets_endpoints(self):
+    def test_assets_endpoints(self, client):
         """Test asset-related endpoints."""
 
-        # Test getting assets for non-existent report
-        response = self.client.get("/api/reports/999/assets")
-        assert response.status_code in [404, 400, 500, 503]
+        # Test getting assets without the required user_external_id
+        response = client.get("/api/reports/999/assets")
+        assert response.status_code == 422
 
         # Test getting specific asset for non-existent report
-        response = self.client.get("/api/reports/999/assets/1")
-        assert response.status_code in [404, 400, 500, 503]
+        response = client.get("/api/reports/999/assets/1")
+        assert response.status_code == 422
 
-    def test_error_handling_across_endpoints(self):
+    @pytest.mark.parametrize(
+        "case", ERROR_CASES, ids=[f"{c['method']}-{c['url']}" for c in ERROR_CASES]
+    )
+    def test_error_handling_across_endpoints(self, client, case):
         """Test error handling consistency across all endpoints."""
+        response = client.request(case["method"], case["url"], **case["kwargs"])
+
+        assert response.status_code == case["status"]
+        assert response.headers["content-type"].startswith("application/json")
+        assert "detail" in response.json()
+
+    @pytest.mark.parametrize(
+        "request_kind,content_type",
+        [
+            ("options_preflight", "text/plain"),
+            ("post_json", "application/json"),
+            ("post_multipart", "application/json"),
+        ],
+    )
+    def test_header_handling(self, client, request_kind, content_type):
+        """Test CORS and content type headers on preflight, JSON and form requests."""
+        response = HEADER_REQUESTS[request_kind](client)
 
-        # Test endpoints with various invalid inputs
-        test_cases = [
-            # Upload endpoints
-            {"method": "POST", "url": "/api/upload", "data": {}, "files": {}},
-            # Reports endpoints
-            {"method": "GET", "url": "/api//search", "params": {"q": "test"}},
-            {"method": "GET", "url": "/reports/999/markdown", "params": {}},
-            # Agent endpoints
-            {"method": "POST", "url": "/api/agent/chat", "json": {}},
-            {"method": "GET", "url": "/api/agent/history/"},
-            # Asset endpoints
-            {"method": "GET", "url": "/api/reports//assets"},
-        ]
-
-        for case in test_cases:
-            method = case["method"]
-            url = case["url"]
-
-            try:
-                if method == "GET":
-                    response = self.client.get(url, params=case.get("params", {}))
-                elif method == "POST":
-                    if "json" in case:
-                        response = self.client.post(url, json=case["json"])
-                    else:
-                        response = self.client.post(
-                            url, data=case.get("data", {}), files=case.get("files", {})
-                        )
-                elif method == "DELETE":
-                    response = self.client.delete(url)
-                else:
-                    continue
-
-                # Should return appropriate error status codes
-                assert response.status_code in [400, 404, 405, 422, 500, 503]
-
-                # Should return JSON error response
-                if response.headers.get("content-type", "").startswith(
-                    "application/json"
-                ):
-                    data = response.json()
-                    # Should have some error indication
-                    assert any(key in data for key in ["error", "detail", "message"])
-
-            except Exception as e:
-                # Some malformed requests might cause exceptions
-                # This is acceptable as long as the server doesn't crash
-                pass
-
-    def test_cors_headers(self):
-        """Test CORS headers are properly set."""
-
-        # Test preflight request
-        response = self.client.options(
-            "/api/upload",
-            headers={
-                "Origin": "http://localhost:3000",
-                "Access-Control-Request-Method": "POST",
-                "Access-Control-Request-Headers": "Content-Type",
-            },
-        )
-
-        # CORS should be configured to allow requests
-        assert response.status_code in [200, 204]
-
-    def test_content_type_handling(self):
-        """Test proper content type handling across endpoints."""
-
-        # Test JSON content type for API endpoints
-        response = self.client.post(
-            "/api/agent/chat",
-            headers={"Content-Type": "application/json"},
-            json={"user_external_id": self.test_user_id, "query": "Test content type"},
-        )
-        assert response.status_code in [200, 500, 503]  # Allow for service failures
-
-        if response.status_code == 200:
-            assert response.headers.get("content-type", "").startswith(
-                "application/json"
-            )
-
-        # Test multipart form data for file uploads
-        with open(self.sample_pdf_path, "rb") as pdf_file:
-            response = self.client.post(
-                "/api/upload",
-                data={"user_external_id": self.test_user_id},
-                files={"file": ("test.pdf", pdf_file, "application/pdf")},
-            )
-
-        # Should handle multipart data properly (may fail due to mocking)
-        assert response.status_code in [200, 400, 422, 500]
+        assert response.status_code == 200
+        _assert_headers(response, content_type)
 
-    def test_api_versioning_and_consistency(self):
+    @pytest.mark.parametrize("endpoint", CONSISTENCY_ENDPOINTS)
+    def test_api_versioning_and_consistency(self, client, endpoint):
         """Test API versioning and response consistency."""
+        response = client.get(endpoint)
 
-        # All API endpoints should have consistent response formats
-        endpoints_to_test = [
-            "/",
-            "/health",
-            "/api/agent/config",
-        ]
-
-        for endpoint in endpoints_to_test:
-            response = self.client.get(endpoint)
-
-            # Should return valid HTTP status
-            assert 200 <= response.status_code < 600
-
-            # Should return JSON for API endpoints
-            if endpoint.startswith("/api") or endpoint in ["/", "/health"]:
-                content_type = response.headers.get("content-type", "")
-                if response.status_code == 200:
-                    assert "application/json" in content_type
-
-                    # Should be valid JSON
-                    data = response.json()
-                    assert isinstance(data, dict)
-
-    def test_input_validation_consistency(self):
+        assert response.status_code == 200
+        assert "application/json" in response.headers.get("content-type", "")
+        assert isinstance(response.json(), dict)
+
+    @pytest.mark.parametrize(
+        "case",
+        VALIDATION_CASES,
+        ids=[f"{c['method']}-{c['url']}" for c in VALIDATION_CASES],
+    )
+    def test_input_validation_consistency(self, client, case):
         """Test input validation consistency across endpoints."""
+        response = client.request(case["method"], case["url"], **case["kwargs"])
 
-        # Test consistent validation error format
-        validation_test_cases = [
-            {
-                "endpoint": "/api/agent/chat",
-                "method": "POST",
-                "data": {"user_external_id": "", "query": "test"},
-            },
-            {
-                "endpoint": "/api/search/test_user",
-                "method": "GET",
-                "params": {"q": "", "k": 5},
-            },
-        ]
-
-        for case in validation_test_cases:
-            if case["method"] == "POST":
-                response = self.client.post(case["endpoint"], json=case["data"])
-            else:
-                response = self.client.get(
-                    case["endpoint"], params=case.get("params", {})
-                )
-
-            # Should return validation error (or service unavailable in test environment)
-            assert response.status_code in [400, 422, 503]
-
-            # Should have consistent error format
-            if response.headers.get("content-type", "").startswith("application/json"):
-                data = response.json()
-                # Should indicate validation error
-                assert any(
-                    key in str(data).lower()
-                    for key in ["validation", "error", "detail", "message"]
-                )
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["type"] == "string_too_short"
@@ -1,12 +1,12 @@
 """Integration tests for database operations."""
 
-import os
-import tempfile
+from collections import OrderedDict, defaultdict
 from datetime import datetime
 from pathlib import Path
 
 import pytest
-from sqlmodel import select
+from sqlalchemy import bindparam, event
+from sqlmodel import Session, select
 
 from healthcare.config.config import Config
 from healthcare.reports.service import ReportService
@@ -15,75 +15,142 @@ from healthcare.search.search_service import SearchService
 from healthcare.storage.database import DatabaseService
 from healthcare.storage.models import MedicalReport, ReportAsset, User
 
+# Report markdown, encoded once and written without text-mode translation
+MARKDOWN_BYTES = b"# Test Report\n\nThis is a test medical report."
+
+# Built once; the expanding bind parameter accepts any number of ids
+USERS_BY_ID = select(User).where(User.id.in_(bindparam("ids", expanding=True)))
+
+
+@pytest.fixture(scope="module")
+def config(tmp_path_factory):
+    """Create a test configuration for the database tests."""
+    data_dir = tmp_path_factory.mktemp("database_operations")
+    return Config(
+        openai_api_key="test-key",
+        openai_model="gpt-5-mini",
+        embedding_model="text-embedding-3-large",
+        base_data_dir=data_dir,
+        medical_db_path=Path(":memory:"),
+        agent_db_path=data_dir / "test_agent.db",
+        chroma_dir=data_dir / "chroma",
+    )
+
+
+@pytest.fixture(scope="module")
+def database(config, sqlite_engine):
+    """Create the database schema once on the module's shared engine."""
+    database = DatabaseService(config, engine=sqlite_engine)
+    database.create_tables()
+    return database
+
+
+@pytest.fixture
+def db_service(database, monkeypatch):
+    """Run each test inside a transaction that is rolled back afterwards.
+
+    Sessions join the outer transaction through SAVEPOINTs, so the commits
+    made by DatabaseService only release a savepoint. The user cache starts
+    empty so no test sees users another test rolled back.
+    """
+    monkeypatch.setattr(database, "_user_cache", OrderedDict())
+    with database.engine.connect() as connection:
+        transaction = connection.begin()
+        monkeypatch.setattr(
+            database,
+            "get_session",
+            lambda: Session(bind=connection, join_transaction_mode="create_savepoint"),
+        )
+        yield database
+        transaction.rollback()
+
+
+def _fetch_report_row(db_service, report_id):
+    """Fetch a report as a plain Core row, skipping ORM model construction."""
+    with db_service.get_session() as session:
+        return session.execute(
+            select(MedicalReport.__table__).where(
+                MedicalReport.__table__.c.id == report_id
+            )
+        ).one_or_none()
+
+
+def _seed_users_and_reports(db_service, pairs):
+    """Insert one new user and one report per pair, committing once."""
+    with db_service.get_session() as session:
+        users = [User(external_id=external_id) for external_id, _ in pairs]
+        session.add_all(users)
+        session.flush()
+
+        reports = [
+            MedicalReport(user_id=user.id, **report_data)
+            for user, (_, report_data) in zip(users, pairs)
+        ]
+        session.add_all(reports)
+        session.flush()
 
-class TestDatabaseOperationsIntegration:
-    """Integration test suite for database operations."""
+        # Detach before committing so the flushed rows stay loaded
+        session.expunge_all()
+        session.commit()
+        return list(zip(users, reports))
+
+
+@pytest.fixture(scope="module")
+def report_service(config, database):
+    """Create one report service on the module's shared database service."""
+    return ReportService(config, database)
 
-    def setup_method(self):
-        """Set up test fixtures for each test."""
-        # Create temporary directory for test data
-        self.temp_dir = tempfile.mkdtemp()
-        self.test_data_dir = Path(self.temp_dir)
-
-        # Create test configuration
-        self.config = Config(
-            openai_api_key="test-key",
-            openai_model="gpt-5-mini",
-            embedding_model="text-embedding-3-large",
-            base_data_dir=self.test_data_dir,
-            medical_db_path=self.test_data_dir / "test_medical.db",
-            agent_db_path=self.test_data_dir / "test_agent.db",
-            chroma_dir=self.test_data_dir / "chroma",
-        )
 
-        # Initialize database service
-        self.db_service = DatabaseService(self.config)
-        self.db_service.create_tables()
+@pytest.fixture
+def session(db_service):
+    """Open one session for a test's read-back assertions."""
+    with db_service.get_session() as session:
+        yield session
 
-    def teardown_method(self):
-        """Clean up after each test."""
-        self.db_service.close()
-        import shutil
 
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+class TestDatabaseOperationsIntegration:
+    """Integration test suite for database operations."""
 
-    def test_user_operations(self):
+    # Report fields shared by most tests; each test adds its own names and paths
+    _BASE_REPORT_DATA = {"language": "en", "images_dir": None, "meta_json": "{}"}
+
+    def test_user_operations(self, db_service):
         """Test user creation and retrieval operations."""
 
         # Test creating a new user
-        user = self.db_service.get_or_create_user("test_user_123")
+        user = db_service.get_or_create_user("test_user_123")
         assert user is not None
         assert user.external_id == "test_user_123"
         assert user.id is not None
         assert user.created_at is not None
 
         # Test retrieving existing user
-        user2 = self.db_service.get_or_create_user("test_user_123")
+        user2 = db_service.get_or_create_user("test_user_123")
         assert user2.id == user.id
         assert user2.external_id == user.external_id
 
         # Test creating different user
-        user3 = self.db_service.get_or_create_user("different_user")
+        user3 = db_service.get_or_create_user("different_user")
         assert user3.id != user.id
         assert user3.external_id == "different_user"
 
-    def test_medical_report_operations(self):
+    def test_medical_report_operations(self, db_service, tmp_path):
         """Test medical report creation and retrieval."""
 
         # Create user first
-        user = self.db_service.get_or_create_user("report_test_user")
+        user = db_service.get_or_create_user("report_test_user")
 
         # Test creating medical report
         report_data = {
+            **self._BASE_REPORT_DATA,
             "filename": "test_report.pdf",
             "file_hash": "abc123def456",
-            "language": "en",
-            "markdown_path": str(self.test_data_dir / "test_report.md"),
-            "images_dir": str(self.test_data_dir / "images"),
+            "markdown_path": str(tmp_path / "test_report.md"),
+            "images_dir": str(tmp_path / "images"),
             "meta_json": '{"manifest": {"figures": [], "tables": []}}',
         }
 
-        report = self.db_service.create_medical_report(user.id, report_data)
+        report = db_service.create_medical_report(user.id, report_data)
         assert report is not None
         assert report.user_id == user.id
         assert report.filename == "test_report.pdf"
@@ -91,163 +158,152 @@ class TestDatabaseOperationsIntegration:
         assert report.id is not None
 
         # Test retrieving report
-        with self.db_service.get_session() as session:
-            retrieved_report = session.get(MedicalReport, report.id)
-            assert retrieved_report is not None
-            assert retrieved_report.filename == "test_report.pdf"
-            assert retrieved_report.user_id == user.id
+        retrieved_report = _fetch_report_row(db_service, report.id)
+        assert retrieved_report is not None
+        assert retrieved_report.filename == "test_report.pdf"
+        assert retrieved_report.user_id == user.id
 
-    def test_duplicate_report_prevention(self):
+    def test_duplicate_report_prevention(self, db_service, tmp_path):
         """Test that duplicate reports are prevented."""
 
-        user = self.db_service.get_or_create_user("duplicate_test_user")
+        user = db_service.get_or_create_user("duplicate_test_user")
 
         report_data = {
+            **self._BASE_REPORT_DATA,
             "filename": "duplicate_test.pdf",
             "file_hash": "duplicate_hash_123",
-            "language": "en",
-            "markdown_path": str(self.test_data_dir / "duplicate.md"),
-            "images_dir": None,
-            "meta_json": "{}",
+            "markdown_path": str(tmp_path / "duplicate.md"),
         }
 
         # Create first report
-        report1 = self.db_service.create_medical_report(user.id, report_data)
+        report1 = db_service.create_medical_report(user.id, report_data)
         assert report1 is not None
 
         # Try to create duplicate (same user + same hash)
         # Should return existing report instead of creating new one
-        report2 = self.db_service.create_medical_report(user.id, report_data)
+        report2 = db_service.create_medical_report(user.id, report_data)
         assert report2.id == report1.id  # Should return the same report
 
         # But different user with same hash should work
-        user2 = self.db_service.get_or_create_user("different_user_duplicate")
-        report3 = self.db_service.create_medical_report(user2.id, report_data)
+        user2 = db_service.get_or_create_user("different_user_duplicate")
+        report3 = db_service.create_medical_report(user2.id, report_data)
         assert report3 is not None
         assert report3.id != report1.id
 
-    def test_report_asset_operations(self):
+    def test_report_asset_operations(self, db_service, tmp_path, session):
         """Test report asset creation and retrieval."""
 
-        user = self.db_service.get_or_create_user("asset_test_user")
+        user = db_service.get_or_create_user("asset_test_user")
 
         # Create report
         report_data = {
+            **self._BASE_REPORT_DATA,
             "filename": "asset_test.pdf",
             "file_hash": "asset_hash_123",
-            "language": "en",
-            "markdown_path": str(self.test_data_dir / "asset_test.md"),
-            "images_dir": str(self.test_data_dir / "images"),
-            "meta_json": "{}",
+            "markdown_path": str(tmp_path / "asset_test.md"),
+            "images_dir": str(tmp_path / "images"),
         }
-        report = self.db_service.create_medical_report(user.id, report_data)
+        report = db_service.create_medical_report(user.id, report_data)
 
         # Create test assets
         assets_data = [
             {
                 "kind": "image",
-                "path": str(self.test_data_dir / "image1.png"),
+                "path": str(tmp_path / "image1.png"),
                 "alt_text": "Medical chart image",
             },
             {
                 "kind": "image",
-                "path": str(self.test_data_dir / "image2.png"),
+                "path": str(tmp_path / "image2.png"),
                 "alt_text": "X-ray image",
             },
             {
                 "kind": "table",
-                "path": str(self.test_data_dir / "table1.csv"),
+                "path": str(tmp_path / "table1.csv"),
                 "alt_text": "Lab results table",
             },
         ]
 
         # Create assets
-        self.db_service.create_report_assets(report.id, assets_data)
+        db_service.create_report_assets(report.id, assets_data)
 
         # Verify assets were created
-        with self.db_service.get_session() as session:
-            assets = session.exec(
-                select(ReportAsset).where(ReportAsset.report_id == report.id)
-            ).all()
+        assets = session.exec(
+            select(ReportAsset).where(ReportAsset.report_id == report.id)
+        ).all()
 
-            assert len(assets) == 3
+        assert len(assets) == 3
 
-            # Check image assets
-            image_assets = [a for a in assets if a.kind == "image"]
-            assert len(image_assets) == 2
+        # Bucket assets by kind in one pass
+        assets_by_kind = defaultdict(list)
+        for asset in assets:
+            assets_by_kind[asset.kind].append(asset)
 
-            # Check table asset
-            table_assets = [a for a in assets if a.kind == "table"]
-            assert len(table_assets) == 1
-            assert "table1.csv" in table_assets[0].path
+        assert len(assets_by_kind["image"]) == 2
+        assert len(assets_by_kind["table"]) == 1
+        assert "table1.csv" in assets_by_kind["table"][0].path
 
-    def test_user_report_isolation(self):
+    def test_user_report_isolation(self, db_service, tmp_path, session):
         """Test that reports are properly isolated between users."""
 
-        # Create two users
-        user1 = self.db_service.get_or_create_user("isolation_user1")
-        user2 = self.db_service.get_or_create_user("isolation_user2")
-
-        # Create reports for each user
-        report_data1 = {
-            "filename": "user1_report.pdf",
-            "file_hash": "user1_hash",
-            "language": "en",
-            "markdown_path": str(self.test_data_dir / "user1.md"),
-            "images_dir": None,
-            "meta_json": "{}",
-        }
-
-        report_data2 = {
-            "filename": "user2_report.pdf",
-            "file_hash": "user2_hash",
-            "language": "en",
-            "markdown_path": str(self.test_data_dir / "user2.md"),
-            "images_dir": None,
-            "meta_json": "{}",
-        }
-
-        report1 = self.db_service.create_medical_report(user1.id, report_data1)
-        report2 = self.db_service.create_medical_report(user2.id, report_data2)
+        # Create both users and their reports in one transaction
+        (user1, report1), (user2, report2) = _seed_users_and_reports(
+            db_service,
+            [
+                (
+                    "isolation_user1",
+                    {
+                        **self._BASE_REPORT_DATA,
+                        "filename": "user1_report.pdf",
+                        "file_hash": "user1_hash",
+                        "markdown_path": str(tmp_path / "user1.md"),
+                    },
+                ),
+                (
+                    "isolation_user2",
+                    {
+                        **self._BASE_REPORT_DATA,
+                        "filename": "user2_report.pdf",
+                        "file_hash": "user2_hash",
+                        "markdown_path": str(tmp_path / "user2.md"),
+                    },
+                ),
+            ],
+        )
 
         # Verify each user only sees their own reports
-        with self.db_service.get_session() as session:
-            user1_reports = session.exec(
-                select(MedicalReport).where(MedicalReport.user_id == user1.id)
-            ).all()
-            assert len(user1_reports) == 1
-            assert user1_reports[0].id == report1.id
-
-            user2_reports = session.exec(
-                select(MedicalReport).where(MedicalReport.user_id == user2.id)
-            ).all()
-            assert len(user2_reports) == 1
-            assert user2_reports[0].id == report2.id
-
-    def test_database_service_integration_with_report_service(self):
+        user1_reports = session.exec(
+            select(MedicalReport).where(MedicalReport.user_id == user1.id)
+        ).all()
+        assert len(user1_reports) == 1
+        assert user1_reports[0].id == report1.id
+
+        user2_reports = session.exec(
+            select(MedicalReport).where(MedicalReport.user_id == user2.id)
+        ).all()
+        assert len(user2_reports) == 1
+        assert user2_reports[0].id == report2.id
+
+    def test_database_service_integration_with_report_service(
+        self, db_service, report_service, tmp_path
+    ):
         """Test database service integration with report service."""
 
-        # Create report service
-        report_service = ReportService(self.config, self.db_service)
-
         # Create user and report via database service
-        user = self.db_service.get_or_create_user("integration_user")
+        user = db_service.get_or_create_user("integration_user")
 
         # Create markdown file
-        markdown_content = "# Test Report\n\nThis is a test medical report."
-        markdown_path = self.test_data_dir / "integration_test.md"
-        markdown_path.write_text(markdown_content)
+        markdown_path = tmp_path / "integration_test.md"
+        markdown_path.write_bytes(MARKDOWN_BYTES)
 
         report_data = {
+            **self._BASE_REPORT_DATA,
             "filename": "integration_test.pdf",
             "file_hash": "integration_hash",
-            "language": "en",
             "markdown_path": str(markdown_path),
-            "images_dir": None,
-            "meta_json": "{}",
         }
 
-        report = self.db_service.create_medical_report(user.id, report_data)
+        report = db_service.create_medical_report(user.id, report_data)
 
         # Test report service can access the data
         reports = report_service.list_user_reports("integration_user")
@@ -260,182 +316,164 @@ class TestDatabaseOperationsIntegration:
         assert "Test Report" in content
         assert "test medical report" in content
 
-    def test_database_transaction_handling(self):
+    def test_database_transaction_handling(self, db_service, tmp_path):
         """Test proper transaction handling and rollback."""
 
-        user = self.db_service.get_or_create_user("transaction_user")
+        user = db_service.get_or_create_user("transaction_user")
 
         # Test successful transaction
-        with self.db_service.get_session() as session:
-            report_data = {
-                "filename": "transaction_test.pdf",
-                "file_hash": "transaction_hash",
-                "language": "en",
-                "markdown_path": str(self.test_data_dir / "transaction.md"),
-                "images_dir": None,
-                "meta_json": "{}",
-            }
+        report_data = {
+            **self._BASE_REPORT_DATA,
+            "filename": "transaction_test.pdf",
+            "file_hash": "transaction_hash",
+            "markdown_path": str(tmp_path / "transaction.md"),
+        }
 
-            report = self.db_service.create_medical_report(user.id, report_data)
+        report = db_service.create_medical_report(user.id, report_data)
 
-            # Verify report exists
-            assert report.id is not None
+        # Verify report exists
+        assert report.id is not None
 
         # Verify report persisted after session
-        with self.db_service.get_session() as session:
-            persisted_report = session.get(MedicalReport, report.id)
-            assert persisted_report is not None
-            assert persisted_report.filename == "transaction_test.pdf"
+        persisted_report = _fetch_report_row(db_service, report.id)
+        assert persisted_report is not None
+        assert persisted_report.filename == "transaction_test.pdf"
 
-    def test_database_connection_management(self):
+    @pytest.mark.parametrize("n", [5])
+    def test_database_connection_management(self, db_service, tmp_path, n, session):
         """Test proper database connection management."""
 
-        # Test multiple sessions
-        user_ids = []
-        for i in range(5):
-            user = self.db_service.get_or_create_user(f"connection_user_{i}")
-            user_ids.append(user.id)
+        # Create several users in one batch
+        users = db_service.bulk_get_or_create_users(
+            [f"connection_user_{i}" for i in range(n)]
+        )
+        user_ids = [user.id for user in users]
 
         # Verify all users were created
-        with self.db_service.get_session() as session:
-            users = session.exec(select(User).where(User.id.in_(user_ids))).all()
-            assert len(users) == 5
-
-        # Test concurrent-like access
-        reports = []
-        for i, user_id in enumerate(user_ids):
-            report_data = {
-                "filename": f"concurrent_test_{i}.pdf",
-                "file_hash": f"concurrent_hash_{i}",
-                "language": "en",
-                "markdown_path": str(self.test_data_dir / f"concurrent_{i}.md"),
-                "images_dir": None,
-                "meta_json": "{}",
-            }
-            report = self.db_service.create_medical_report(user_id, report_data)
-            reports.append(report)
+        users = session.exec(USERS_BY_ID, params={"ids": user_ids}).all()
+        assert {user.id for user in users} == set(user_ids)
+
+        # Create one report per user in one batch
+        reports = db_service.bulk_create_medical_reports(
+            [
+                {
+                    "user_id": user_id,
+                    "filename": f"concurrent_test_{i}.pdf",
+                    "file_hash": f"concurrent_hash_{i}",
+                    **self._BASE_REPORT_DATA,
+                    "markdown_path": str(tmp_path / f"concurrent_{i}.md"),
+                }
+                for i, user_id in enumerate(user_ids)
+            ]
+        )
 
-        # Verify all reports were created
-        assert len(reports) == 5
-        assert len(set(r.id for r in reports)) == 5  # All unique IDs
+        # Verify one distinct report per user was created
+        assert len({report.id for report in reports}) == n
+        assert {report.user_id for report in reports} == set(user_ids)
 
-    def test_database_schema_validation(self):
+    def test_database_schema_validation(self, db_service, tmp_path):
         """Test database schema validation and constraints."""
 
-        user = self.db_service.get_or_create_user("schema_test_user")
+        user = db_service.get_or_create_user("schema_test_user")
 
         # Test required fields
         with pytest.raises(Exception):
             # Missing required filename
             invalid_data = {
                 "file_hash": "schema_hash",
-                "language": "en",
-                "markdown_path": str(self.test_data_dir / "schema.md"),
-                "meta_json": "{}",
+                **self._BASE_REPORT_DATA,
+                "markdown_path": str(tmp_path / "schema.md"),
             }
-            self.db_service.create_medical_report(user.id, invalid_data)
+            db_service.create_medical_report(user.id, invalid_data)
 
         # Test valid data
         valid_data = {
+            **self._BASE_REPORT_DATA,
             "filename": "schema_valid.pdf",
             "file_hash": "schema_valid_hash",
-            "language": "en",
-            "markdown_path": str(self.test_data_dir / "schema_valid.md"),
-            "images_dir": None,
-            "meta_json": "{}",
+            "markdown_path": str(tmp_path / "schema_valid.md"),
         }
 
-        report = self.db_service.create_medical_report(user.id, valid_data)
+        report = db_service.create_medical_report(user.id, valid_data)
         assert report is not None
 
-    def test_database_performance_basic(self):
-        """Test basic database performance characteristics."""
-
-        import time
-
-        # Time user creation
-        start_time = time.time()
-        users = []
-        for i in range(10):
-            user = self.db_service.get_or_create_user(f"perf_user_{i}")
-            users.append(user)
-        user_creation_time = time.time() - start_time
-
-        # Should be reasonably fast (less than 1 second for 10 users)
-        assert user_creation_time < 1.0
-
-        # Time report creation
-        start_time = time.time()
-        reports = []
-        for i, user in enumerate(users):
-            report_data = {
-                "filename": f"perf_report_{i}.pdf",
-                "file_hash": f"perf_hash_{i}",
-                "language": "en",
-                "markdown_path": str(self.test_data_dir / f"perf_{i}.md"),
-                "images_dir": None,
-                "meta_json": "{}",
-            }
-            report = self.db_service.create_medical_report(user.id, report_data)
-            reports.append(report)
-        report_creation_time = time.time() - start_time
-
-        # Should be reasonably fast (less than 2 seconds for 10 reports)
-        assert report_creation_time < 2.0
-
-        # Time bulk retrieval
-        start_time = time.time()
-        with self.db_service.get_session() as session:
-            all_reports = session.exec(select(MedicalReport)).all()
-        retrieval_time = time.time() - start_time
-
-        assert len(all_reports) >= 10
-        # Should be very fast (less than 0.1 seconds)
-        assert retrieval_time < 0.1
-
-    def test_database_cleanup_and_consistency(self):
+    @pytest.mark.parametrize("n", [10, 100])
+    def test_database_performance_basic(
+        self, db_service, tmp_path, session, sqlite_engine, n
+    ):
+        """Test bulk creation costs one statement however many rows it writes."""
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(sqlite_engine, "before_cursor_execute", record)
+        try:
+            users = db_service.bulk_get_or_create_users(
+                [f"perf_user_{i}" for i in range(n)]
+            )
+            reports = db_service.bulk_create_medical_reports(
+                [
+                    {
+                        **self._BASE_REPORT_DATA,
+                        "user_id": user.id,
+                        "filename": f"perf_report_{i}.pdf",
+                        "file_hash": f"perf_hash_{i}",
+                        "markdown_path": str(tmp_path / f"perf_{i}.md"),
+                    }
+                    for i, user in enumerate(users)
+                ]
+            )
+        finally:
+            event.remove(sqlite_engine, "before_cursor_execute", record)
+
+        inserts = [sql for sql in statements if sql.startswith("INSERT")]
+        assert len(inserts) == 2
+
+        assert len(users) == len(reports) == n
+        assert len(session.exec(select(MedicalReport)).all()) == n
+
+    def test_database_cleanup_and_consistency(self, db_service, tmp_path, session):
         """Test database cleanup and data consistency."""
 
-        user = self.db_service.get_or_create_user("cleanup_user")
+        user = db_service.get_or_create_user("cleanup_user")
 
         # Create report with assets
         report_data = {
+            **self._BASE_REPORT_DATA,
             "filename": "cleanup_test.pdf",
             "file_hash": "cleanup_hash",
-            "language": "en",
-            "markdown_path": str(self.test_data_dir / "cleanup.md"),
-            "images_dir": str(self.test_data_dir / "images"),
-            "meta_json": "{}",
+            "markdown_path": str(tmp_path / "cleanup.md"),
+            "images_dir": str(tmp_path / "images"),
         }
 
-        report = self.db_service.create_medical_report(user.id, report_data)
+        report = db_service.create_medical_report(user.id, report_data)
 
         # Add assets
         assets_data = [
             {
                 "kind": "image",
-                "path": str(self.test_data_dir / "cleanup_image.png"),
+                "path": str(tmp_path / "cleanup_image.png"),
                 "alt_text": "Cleanup test image",
             }
         ]
-        self.db_service.create_report_assets(report.id, assets_data)
+        db_service.create_report_assets(report.id, assets_data)
 
         # Verify data consistency
-        with self.db_service.get_session() as session:
-            # Check report exists
-            db_report = session.get(MedicalReport, report.id)
-            assert db_report is not None
-
-            # Check assets exist
-            assets = session.exec(
-                select(ReportAsset).where(ReportAsset.report_id == report.id)
-            ).all()
-            assert len(assets) == 1
-
-            # Check foreign key relationship
-            assert assets[0].report_id == report.id
-
-            # Verify user relationship
-            db_user = session.get(User, user.id)
-            assert db_user is not None
-            assert db_report.user_id == db_user.id
+        # Check report exists
+        db_report = session.get(MedicalReport, report.id)
+        assert db_report is not None
+
+        # Check assets exist
+        assets = session.exec(
+            select(ReportAsset).where(ReportAsset.report_id == report.id)
+        ).all()
+        assert len(assets) == 1
+
+        # Check foreign key relationship
+        assert assets[0].report_id == report.id
+
+        # Verify user relationship
+        db_user = session.get(User, user.id)
+        assert db_user is not None
+        assert db_report.user_id == db_user.id
@@ -1,53 +1,21 @@
 """Integration tests for complete PDF upload to agent query workflow."""
 
+import asyncio
 import json
-import os
+import shutil
 import tempfile
 from pathlib import Path
-from unittest.mock import Mock, patch
+from types import SimpleNamespace
+from unittest.mock import Mock
 
+import httpx
+import orjson
 import pytest
-from fastapi.testclient import TestClient
 
-from healthcare.main import app
+from tests.utils import _restored_app_state
 
-
-class TestFullWorkflowIntegration:
-    """Integration test suite for complete PDF upload to agent query workflow."""
-
-    def setup_method(self):
-        """Set up test fixtures for each test."""
-        # Set test environment variables
-        os.environ["OPENAI_API_KEY"] = "test-key"
-
-        # Create temporary directory for test data
-        self.temp_dir = tempfile.mkdtemp()
-        self.test_data_dir = Path(self.temp_dir)
-
-        # Set environment variables to use test directory
-        os.environ["DATA_DIR"] = str(self.test_data_dir)
-        os.environ["UPLOADS_DIR"] = str(self.test_data_dir / "uploads")
-        os.environ["REPORTS_DIR"] = str(self.test_data_dir / "reports")
-        os.environ["CHROMA_DIR"] = str(self.test_data_dir / "chroma")
-
-        # Create test client
-        self.client = TestClient(app)
-
-        # Create a sample PDF file for testing
-        self.create_sample_pdf()
-
-    def teardown_method(self):
-        """Clean up after each test."""
-        import shutil
-
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-
-    def create_sample_pdf(self):
-        """Create a minimal PDF file for testing."""
-        self.sample_pdf_path = self.test_data_dir / "sample_medical_report.pdf"
-
-        # Create a minimal PDF content (simplified)
-        pdf_content = b"""%PDF-1.4
+# Minimal single-page PDF uploaded straight from memory
+SAMPLE_PDF_BYTES = b"""%PDF-1.4
 1 0 obj
 << /Type /Catalog /Pages 2 0 R >>
 endobj
@@ -80,102 +48,196 @@ startxref
 300
 %%EOF"""
 
-        self.sample_pdf_path.write_bytes(pdf_content)
 
-    @patch("healthcare.conversion.conversion_service.OpenAI")
-    @patch("healthcare.images.image_service.extract_images_from_pdf")
-    @pytest.mark.skip
-    def test_complete_workflow_pdf_to_agent_query(
-        self, mock_extract_images, mock_openai
-    ):
-        """Test complete workflow from PDF upload to agent query."""
+DEFAULT_MARKDOWN = "# Medical Report\n\nNo findings."
+EMBEDDING_DIMENSIONS = 8
+AGENT_REPLY = "Your latest blood pressure reading was 120/80 mmHg."
 
-        # Mock OpenAI API responses
-        mock_openai_client = Mock()
-        mock_openai.return_value = mock_openai_client
 
-        # Mock file upload response
-        mock_file_response = Mock()
-        mock_file_response.id = "file-123456"
-        mock_openai_client.files.create.return_value = mock_file_response
+def _conversion_output(markdown):
+    """Serialize a conversion result as the Responses API output_text."""
+    output = {"markdown": markdown, "manifest": {"figures": [], "tables": []}}
+    return orjson.dumps(output).decode()
 
-        # Mock conversion response
-        mock_conversion_result = {
-            "markdown": "# Medical Report\n\n## Patient Information\nPatient: John Doe\nDate: 2024-01-15\n\n## Vital Signs\n- Blood Pressure: 120/80 mmHg\n- Heart Rate: 72 bpm\n- Temperature: 98.6°F\n\n## Diagnosis\nPatient shows normal vital signs. Continue current treatment plan.",
-            "manifest": {"figures": [], "tables": []},
-        }
 
-        mock_parse_response = Mock()
-        mock_parse_response.output_parsed = Mock()
-        mock_parse_response.output_parsed.markdown = mock_conversion_result["markdown"]
-        mock_parse_response.output_parsed.manifest = mock_conversion_result["manifest"]
-        mock_openai_client.responses.parse.return_value = mock_parse_response
+def _embed(input, **kwargs):
+    """Answer an embeddings request with one fixed vector per input."""
+    vector = [0.1] * EMBEDDING_DIMENSIONS
+    return SimpleNamespace(data=[SimpleNamespace(embedding=vector) for _ in input])
+
+
+# Readiness polling for services that answer 503 until they are initialized
+READY_ATTEMPTS = 5
+READY_BACKOFF_SECONDS = 0.05
+
+
+async def wait_for(client, method, url, **kwargs):
+    """Send a request, retrying with exponential backoff while it answers 503.
+
+    Returns the first response that is not 503, or the last 503 response
+    once READY_ATTEMPTS requests have been made.
+    """
+    for attempt in range(READY_ATTEMPTS):
+        response = await client.request(method, url, **kwargs)
+        if response.status_code != 503 or attempt == READY_ATTEMPTS - 1:
+            return response
+        await asyncio.sleep(READY_BACKOFF_SECONDS * 2**attempt)
+
+
+@pytest.fixture
+async def async_client(app):
+    """Start the app and create an async client that calls it over ASGI.
+
+    ASGITransport does not send lifespan events, so the lifespan is entered
+    here to create the database tables and the services on app.state.
+    """
+    transport = httpx.ASGITransport(app=app)
+    with _restored_app_state(app):
+        async with (
+            app.router.lifespan_context(app),
+            httpx.AsyncClient(transport=transport, base_url="http://test") as c,
+        ):
+            yield c
+
+
+class TestFullWorkflowIntegration:
+    """Integration test suite for complete PDF upload to agent query workflow."""
+
+    @pytest.fixture(autouse=True)
+    def workflow_environment(self, ramdisk_dir, monkeypatch):
+        """Point the data directories at a fresh RAM-backed temp directory."""
+        # Create temporary directory for test data
+        self.temp_dir = tempfile.mkdtemp(dir=ramdisk_dir)
+        self.test_data_dir = Path(self.temp_dir)
+
+        # Startup writes its log files under a relative logs/ directory
+        monkeypatch.chdir(self.test_data_dir)
 
-        # Mock image extraction (no images in this test)
-        mock_extract_images.return_value = []
+        # Set environment variables to use test directory
+        monkeypatch.setenv("DATA_DIR", str(self.test_data_dir))
+        monkeypatch.setenv("UPLOADS_DIR", str(self.test_data_dir / "uploads"))
+        monkeypatch.setenv("REPORTS_DIR", str(self.test_data_dir / "reports"))
+        monkeypatch.setenv("MEDICAL_DB_PATH", str(self.test_data_dir / "medical.db"))
+        monkeypatch.setenv(
+            "AGENT_DB_PATH", str(self.test_data_dir / "healthcare_agent.db")
+        )
+        # Keep the vector database in memory; nothing here needs it persisted
+        monkeypatch.setenv("CHROMA_MODE", "ephemeral")
+
+        yield
+
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @pytest.fixture(scope="class")
+    def openai_mocks(self):
+        """Build the mock OpenAI client and its canned responses once per class.
+
+        Tests only vary conversion.output_text (or queue conversion results
+        through responses.create.side_effect, which is reset before every
+        test).
+        """
+        client = Mock()
+        file = Mock()
+        file.id = "file-123456"
+        client.files.create.return_value = file
+
+        conversion = Mock(output_text=_conversion_output(DEFAULT_MARKDOWN))
+        client.responses.create.return_value = conversion
+        client.embeddings.create.side_effect = _embed
+
+        return SimpleNamespace(client=client, file=file, conversion=conversion)
+
+    @pytest.fixture(autouse=True)
+    def mocked_services(self, openai_mocks, monkeypatch):
+        """Route OpenAI, PDF image extraction and agent replies to mocks."""
+        openai_mocks.client.reset_mock()
+        openai_mocks.client.responses.create.side_effect = None
+        openai_mocks.conversion.output_text = _conversion_output(DEFAULT_MARKDOWN)
+
+        mocks = SimpleNamespace(
+            openai=Mock(return_value=openai_mocks.client),
+            extract_images=Mock(return_value=[]),
+            process_query=Mock(return_value=AGENT_REPLY),
+        )
+        monkeypatch.setattr(
+            "healthcare.conversion.conversion_service.OpenAI", mocks.openai
+        )
+        monkeypatch.setattr("healthcare.search.embeddings.OpenAI", mocks.openai)
+        monkeypatch.setattr(
+            "healthcare.images.image_service.ImageExtractionService."
+            "extract_images_pikepdf",
+            mocks.extract_images,
+        )
+        monkeypatch.setattr(
+            "healthcare.agent.agent_service.HealthcareAgent.process_query",
+            mocks.process_query,
+        )
+        return mocks
+
+    async def test_complete_workflow_pdf_to_agent_query(
+        self, async_client, openai_mocks
+    ):
+        """Test complete workflow from PDF upload to agent query."""
+
+        # Mock conversion response
+        openai_mocks.conversion.output_text = _conversion_output(
+            "# Medical Report\n\n## Patient Information\nPatient: John Doe\nDate: 2024-01-15\n\n## Vital Signs\n- Blood Pressure: 120/80 mmHg\n- Heart Rate: 72 bpm\n- Temperature: 98.6°F\n\n## Diagnosis\nPatient shows normal vital signs. Continue current treatment plan."
+        )
 
         user_external_id = "test_user_123"
 
         # Step 1: Upload PDF
-        with open(self.sample_pdf_path, "rb") as pdf_file:
-            upload_response = self.client.post(
-                "/api/upload",
-                data={"user_external_id": user_external_id},
-                files={"file": ("sample_report.pdf", pdf_file, "application/pdf")},
-            )
+        upload_response = await async_client.post(
+            "/api/upload",
+            data={"user_external_id": user_external_id},
+            files={"file": ("sample_report.pdf", SAMPLE_PDF_BYTES, "application/pdf")},
+        )
 
         assert upload_response.status_code == 200
         upload_data = upload_response.json()
         assert "report_id" in upload_data
         report_id = upload_data["report_id"]
 
-        # Step 2: Verify PDF was processed and stored
-        # Check that report is listed
-        reports_response = self.client.get(f"/reports/{user_external_id}")
-        assert reports_response.status_code in [
-            200,
-            503,
-        ]  # Allow for service unavailable
+        # Steps 2-4 only depend on the upload, so issue them concurrently:
+        # list reports, fetch the Markdown and run a semantic search
+        reports_response, markdown_response, search_response = await asyncio.gather(
+            wait_for(async_client, "GET", f"/api/reports/{user_external_id}"),
+            wait_for(
+                async_client,
+                "GET",
+                f"/api/reports/{report_id}/markdown",
+                params={"user_external_id": user_external_id},
+            ),
+            wait_for(
+                async_client,
+                "GET",
+                f"/api/search/{user_external_id}",
+                params={"q": "blood pressure", "k": 5},
+            ),
+        )
 
-        if reports_response.status_code == 200:
-            reports_data = reports_response.json()
-            assert "reports" in reports_data
-            assert len(reports_data["reports"]) == 1
-            assert reports_data["reports"][0]["id"] == report_id
+        # Step 2: Verify PDF was processed and stored
+        assert reports_response.status_code == 200
+        reports_data = reports_response.json()
+        assert "reports" in reports_data
+        assert len(reports_data["reports"]) == 1
+        assert reports_data["reports"][0]["id"] == report_id
 
         # Step 3: Verify Markdown content is accessible
-        markdown_response = self.client.get(
-            f"/reports/{report_id}/markdown",
-            params={"user_external_id": user_external_id},
-        )
-        assert markdown_response.status_code in [
-            200,
-            503,
-        ]  # Allow for service unavailable
-
-        if markdown_response.status_code == 200:
-            markdown_data = markdown_response.json()
-            assert "content" in markdown_data
-            assert "Medical Report" in markdown_data["content"]
-            assert "Blood Pressure: 120/80 mmHg" in markdown_data["content"]
+        assert markdown_response.status_code == 200
+        markdown_data = markdown_response.json()
+        assert "content" in markdown_data
+        assert "Medical Report" in markdown_data["content"]
+        assert "Blood Pressure: 120/80 mmHg" in markdown_data["content"]
 
         # Step 4: Test semantic search functionality
-        search_response = self.client.get(
-            f"/api/{user_external_id}/search",
-            params={"q": "blood pressure", "k": 5},
-        )
-        assert search_response.status_code in [
-            200,
-            503,
-        ]  # Allow for service unavailable
+        assert search_response.status_code == 200
+        search_data = search_response.json()
+        assert "results" in search_data
+        assert len(search_data["results"]) >= 0  # May be 0 in test environment
 
-        if search_response.status_code == 200:
-            search_data = search_response.json()
-            assert "results" in search_data
-            assert len(search_data["results"]) >= 0  # May be 0 in test environment
-
-        # Verify search result contains relevant content (if search was successful)
-        if search_response.status_code == 200 and len(search_data["results"]) > 0:
+        # Verify search result contains relevant content
+        if len(search_data["results"]) > 0:
             found_blood_pressure = any(
                 "blood pressure" in result["content"].lower()
                 for result in search_data["results"]
@@ -184,7 +246,9 @@ startxref
             # assert found_blood_pressure, "Search should find blood pressure content"
 
         # Step 5: Test AI agent query
-        agent_response = self.client.post(
+        agent_response = await wait_for(
+            async_client,
+            "POST",
             "/api/agent/chat",
             json={
                 "user_external_id": user_external_id,
@@ -192,46 +256,34 @@ startxref
                 "session_id": "integration_test_session",
             },
         )
-        assert agent_response.status_code in [
-            200,
-            500,
-            503,
-        ]  # Allow for service failures in test environment
-
-        if agent_response.status_code == 200:
-            agent_data = agent_response.json()
-            assert "response" in agent_data
-            assert agent_data["user_external_id"] == user_external_id
-            assert agent_data["session_id"] == "integration_test_session"
+        assert agent_response.status_code == 200
+        agent_data = agent_response.json()
+        assert "response" in agent_data
+        assert agent_data["user_external_id"] == user_external_id
+        assert agent_data["session_id"] == "integration_test_session"
 
         # The agent should be able to process the query (exact response depends on agent logic)
-        if agent_response.status_code == 200:
-            assert len(agent_data["response"]) > 0
+        assert len(agent_data["response"]) > 0
 
         # Step 6: Test conversation history
-        history_response = self.client.get(
+        history_response = await wait_for(
+            async_client,
+            "GET",
             f"/api/agent/history/{user_external_id}",
             params={"session_id": "integration_test_session"},
         )
-        assert history_response.status_code in [
-            200,
-            500,
-            503,
-        ]  # Allow for service failures
-
-        if history_response.status_code == 200:
-            history_data = history_response.json()
-            assert "history" in history_data
-            assert (
-                history_data["total_messages"] >= 0
-            )  # May be 0 if agent storage not working in test
-
-    @patch("healthcare.conversion.conversion_service.OpenAI")
-    def test_error_handling_in_workflow(self, mock_openai):
+        assert history_response.status_code == 200
+        history_data = history_response.json()
+        assert "history" in history_data
+        assert (
+            history_data["total_messages"] >= 0
+        )  # May be 0 if agent storage not working in test
+
+    def test_error_handling_in_workflow(self, client):
         """Test error handling throughout the workflow."""
 
         # Test 1: Invalid file upload
-        invalid_response = self.client.post(
+        invalid_response = client.post(
             "/api/upload",
             data={"user_external_id": "test_user"},
             files={"file": ("invalid.txt", b"not a pdf", "text/plain")},
@@ -239,16 +291,15 @@ startxref
         assert invalid_response.status_code in [400, 422]  # Should reject non-PDF
 
         # Test 2: Missing user ID
-        with open(self.sample_pdf_path, "rb") as pdf_file:
-            missing_user_response = self.client.post(
-                "/api/upload",
-                data={},  # Missing user_external_id
-                files={"file": ("sample.pdf", pdf_file, "application/pdf")},
-            )
+        missing_user_response = client.post(
+            "/api/upload",
+            data={},  # Missing user_external_id
+            files={"file": ("sample.pdf", SAMPLE_PDF_BYTES, "application/pdf")},
+        )
         assert missing_user_response.status_code == 422  # Validation error
 
         # Test 3: Search with invalid user
-        search_response = self.client.get(
+        search_response = client.get(
             "/api/nonexistent_user/search", params={"q": "test query"}
         )
         assert search_response.status_code in [
@@ -258,217 +309,148 @@ startxref
         ]  # Should handle gracefully or service unavailable
 
         # Test 4: Agent query with invalid user
-        agent_response = self.client.post(
+        agent_response = client.post(
             "/api/agent/chat",
             json={"user_external_id": "nonexistent_user", "query": "test query"},
         )
         # Should not crash - agent will handle gracefully or service unavailable
         assert agent_response.status_code in [200, 400, 404, 500, 503]
 
-    @pytest.mark.skip
-    def test_multi_document_workflow(self):
+    async def test_multi_document_workflow(self, async_client, openai_mocks):
         """Test workflow with multiple documents for the same user."""
 
-        with (
-            patch("healthcare.conversion.conversion_service.OpenAI") as mock_openai,
-            patch(
-                "healthcare.images.image_service.extract_images_from_pdf"
-            ) as mock_extract,
-        ):
+        # Mock different conversion results for each document
+        conversion_markdowns = [
+            "# Blood Work Results\n\n## Lab Values\n- Cholesterol: 180 mg/dL\n- Glucose: 95 mg/dL",
+            "# Annual Physical\n\n## Vital Signs\n- Blood Pressure: 118/75 mmHg\n- Weight: 170 lbs",
+        ]
+
+        # Concurrent uploads may be converted in either order
+        openai_mocks.client.responses.create.side_effect = [
+            Mock(output_text=_conversion_output(markdown))
+            for markdown in conversion_markdowns
+        ]
+
+        user_external_id = "multi_doc_user"
+
+        # Upload all documents concurrently; the trailing PDF comment gives
+        # each upload its own content hash so none is deduplicated
+        upload_responses = await asyncio.gather(
+            *(
+                async_client.post(
+                    "/api/upload",
+                    data={"user_external_id": user_external_id},
+                    files={
+                        "file": (
+                            f"report_{i}.pdf",
+                            SAMPLE_PDF_BYTES + f"\n% report {i}\n".encode(),
+                            "application/pdf",
+                        )
+                    },
+                )
+                for i in range(len(conversion_markdowns))
+            )
+        )
 
-            # Setup mocks
-            mock_openai_client = Mock()
-            mock_openai.return_value = mock_openai_client
-
-            mock_file_response = Mock()
-            mock_file_response.id = "file-123456"
-            mock_openai_client.files.create.return_value = mock_file_response
-
-            # Mock different conversion results for each document
-            conversion_results = [
-                {
-                    "markdown": "# Blood Work Results\n\n## Lab Values\n- Cholesterol: 180 mg/dL\n- Glucose: 95 mg/dL",
-                    "manifest": {"figures": [], "tables": []},
-                },
-                {
-                    "markdown": "# Annual Physical\n\n## Vital Signs\n- Blood Pressure: 118/75 mmHg\n- Weight: 170 lbs",
-                    "manifest": {"figures": [], "tables": []},
-                },
-            ]
-
-            mock_extract.return_value = []
-            user_external_id = "multi_doc_user"
-            report_ids = []
-
-            # Upload multiple documents
-            for i, result in enumerate(conversion_results):
-                mock_parse_response = Mock()
-                mock_parse_response.output_parsed = Mock()
-                mock_parse_response.output_parsed.markdown = result["markdown"]
-                mock_parse_response.output_parsed.manifest = result["manifest"]
-                mock_openai_client.responses.parse.return_value = mock_parse_response
-
-                # Create unique PDF for each upload
-                pdf_path = self.test_data_dir / f"report_{i}.pdf"
-                pdf_path.write_bytes(self.sample_pdf_path.read_bytes())
-
-                with open(pdf_path, "rb") as pdf_file:
-                    upload_response = self.client.post(
-                        "/api/upload",
-                        data={"user_external_id": user_external_id},
-                        files={
-                            "file": (f"report_{i}.pdf", pdf_file, "application/pdf")
-                        },
-                    )
-
-                assert upload_response.status_code == 200
-                upload_data = upload_response.json()
-                report_ids.append(upload_data["report_id"])
-
-            # Verify both reports are listed
-            reports_response = self.client.get(f"/reports/{user_external_id}")
-            assert reports_response.status_code in [
-                200,
-                503,
-            ]  # Allow for service unavailable
-
-            if reports_response.status_code == 200:
-                reports_data = reports_response.json()
-                assert len(reports_data["reports"]) == 2
-
-            # Verify we can search across both documents
-            search_response = self.client.get(
-                f"/api/{user_external_id}/search",
+        assert [response.status_code for response in upload_responses] == [200, 200]
+        report_ids = [response.json()["report_id"] for response in upload_responses]
+        assert len(set(report_ids)) == 2
+
+        # Listing and searching are independent reads, so issue them together
+        reports_response, search_response = await asyncio.gather(
+            wait_for(async_client, "GET", f"/api/reports/{user_external_id}"),
+            wait_for(
+                async_client,
+                "GET",
+                f"/api/search/{user_external_id}",
                 params={"q": "cholesterol blood pressure", "k": 10},
-            )
-            assert search_response.status_code in [
-                200,
-                503,
-            ]  # Allow for service unavailable
+            ),
+        )
 
-            if search_response.status_code == 200:
-                search_data = search_response.json()
+        # Verify both reports are listed
+        assert reports_response.status_code == 200
+        reports_data = reports_response.json()
+        assert len(reports_data["reports"]) == 2
 
-                # Should find content from both documents
-                results_content = " ".join(
-                    [r["content"] for r in search_data["results"]]
-                )
-                # Note: Actual search results depend on embeddings being generated
-                # In a real integration test, we would verify cross-document search works
+        # Verify we can search across both documents
+        assert search_response.status_code == 200
+        search_data = search_response.json()
 
-    @pytest.mark.skip
-    def test_data_isolation_between_users(self):
-        """Test that data is properly isolated between different users."""
+        # Should find content from both documents
+        results_content = " ".join([r["content"] for r in search_data["results"]])
+        # Note: Actual search results depend on embeddings being generated
+        # In a real integration test, we would verify cross-document search works
 
-        with (
-            patch("healthcare.conversion.conversion_service.OpenAI") as mock_openai,
-            patch(
-                "healthcare.images.image_service.extract_images_from_pdf"
-            ) as mock_extract,
-        ):
+    async def test_data_isolation_between_users(self, async_client, openai_mocks):
+        """Test that data is properly isolated between different users."""
 
-            # Setup mocks
-            mock_openai_client = Mock()
-            mock_openai.return_value = mock_openai_client
+        openai_mocks.conversion.output_text = _conversion_output(
+            "# User1 Report\n\nPrivate medical data for user1"
+        )
 
-            mock_file_response = Mock()
-            mock_file_response.id = "file-123456"
-            mock_openai_client.files.create.return_value = mock_file_response
+        # Upload document for user1
+        user1_upload = await async_client.post(
+            "/api/upload",
+            data={"user_external_id": "user1"},
+            files={"file": ("user1_report.pdf", SAMPLE_PDF_BYTES, "application/pdf")},
+        )
 
-            mock_parse_response = Mock()
-            mock_parse_response.output_parsed = Mock()
-            mock_parse_response.output_parsed.markdown = (
-                "# User1 Report\n\nPrivate medical data for user1"
-            )
-            mock_parse_response.output_parsed.manifest = {"figures": [], "tables": []}
-            mock_openai_client.responses.parse.return_value = mock_parse_response
+        assert user1_upload.status_code == 200
+        user1_report_id = user1_upload.json()["report_id"]
 
-            mock_extract.return_value = []
+        # Upload document for user2 (with different content)
+        openai_mocks.conversion.output_text = _conversion_output(
+            "# User2 Report\n\nPrivate medical data for user2"
+        )
 
-            # Upload document for user1
-            with open(self.sample_pdf_path, "rb") as pdf_file:
-                user1_upload = self.client.post(
-                    "/api/upload",
-                    data={"user_external_id": "user1"},
-                    files={"file": ("user1_report.pdf", pdf_file, "application/pdf")},
-                )
+        user2_upload = await async_client.post(
+            "/api/upload",
+            data={"user_external_id": "user2"},
+            files={"file": ("user2_report.pdf", SAMPLE_PDF_BYTES, "application/pdf")},
+        )
 
-            assert user1_upload.status_code == 200
-            user1_report_id = user1_upload.json()["report_id"]
+        assert user2_upload.status_code == 200
+        user2_report_id = user2_upload.json()["report_id"]
+
+        # Verify user1 can only see their own reports
+        user1_reports = await wait_for(async_client, "GET", "/api/reports/user1")
+        assert user1_reports.status_code == 200
+        user1_data = user1_reports.json()
+        assert len(user1_data["reports"]) == 1
+        assert user1_data["reports"][0]["id"] == user1_report_id
+
+        # Verify user2 can only see their own reports
+        user2_reports = await wait_for(async_client, "GET", "/api/reports/user2")
+        assert user2_reports.status_code == 200
+        user2_data = user2_reports.json()
+        assert len(user2_data["reports"]) == 1
+        assert user2_data["reports"][0]["id"] == user2_report_id
+
+        # Verify user1 cannot access user2's report directly
+        cross_access_response = await wait_for(
+            async_client,
+            "GET",
+            f"/api/reports/{user2_report_id}/markdown",
+            params={"user_external_id": "user1"},
+        )
+        assert cross_access_response.status_code in [403, 404]  # Should be denied
 
-            # Upload document for user2 (with different content)
-            mock_parse_response.output_parsed.markdown = (
-                "# User2 Report\n\nPrivate medical data for user2"
-            )
+        # Verify search results are isolated
+        user1_search = await wait_for(
+            async_client, "GET", "/api/search/user1", params={"q": "medical data"}
+        )
+        assert user1_search.status_code == 200
 
-            with open(self.sample_pdf_path, "rb") as pdf_file:
-                user2_upload = self.client.post(
-                    "/api/upload",
-                    data={"user_external_id": "user2"},
-                    files={"file": ("user2_report.pdf", pdf_file, "application/pdf")},
-                )
+        user2_search = await wait_for(
+            async_client, "GET", "/api/search/user2", params={"q": "medical data"}
+        )
+        assert user2_search.status_code == 200
 
-            assert user2_upload.status_code == 200
-            user2_report_id = user2_upload.json()["report_id"]
-
-            # Verify user1 can only see their own reports
-            user1_reports = self.client.get("/reports/user1")
-            assert user1_reports.status_code in [
-                200,
-                503,
-            ]  # Allow for service unavailable
-
-            if user1_reports.status_code == 200:
-                user1_data = user1_reports.json()
-                assert len(user1_data["reports"]) == 1
-                assert user1_data["reports"][0]["id"] == user1_report_id
-
-            # Verify user2 can only see their own reports
-            user2_reports = self.client.get("/reports/user2")
-            assert user2_reports.status_code in [
-                200,
-                503,
-            ]  # Allow for service unavailable
-
-            if user2_reports.status_code == 200:
-                user2_data = user2_reports.json()
-                assert len(user2_data["reports"]) == 1
-                assert user2_data["reports"][0]["id"] == user2_report_id
-
-            # Verify user1 cannot access user2's report directly
-            cross_access_response = self.client.get(
-                f"/reports/{user2_report_id}/markdown",
-                params={"user_external_id": "user1"},
-            )
-            assert cross_access_response.status_code in [
-                403,
-                404,
-                503,
-            ]  # Should be denied or service unavailable
-
-            # Verify search results are isolated
-            user1_search = self.client.get(
-                "/api/user1/search", params={"q": "medical data"}
-            )
-            assert user1_search.status_code in [
-                200,
-                503,
-            ]  # Allow for service unavailable
+        # Search results should be different (though content depends on embedding generation)
+        user1_results = user1_search.json()["results"]
+        user2_results = user2_search.json()["results"]
 
-            user2_search = self.client.get(
-                "/api/user2/search", params={"q": "medical data"}
-            )
-            assert user2_search.status_code in [
-                200,
-                503,
-            ]  # Allow for service unavailable
-
-            # Search results should be different (though content depends on embedding generation)
-            if user1_search.status_code == 200 and user2_search.status_code == 200:
-                user1_results = user1_search.json()["results"]
-                user2_results = user2_search.json()["results"]
-
-                # Basic verification that searches return results for respective users
-                # (Exact content verification would require real embeddings)
-                assert isinstance(user1_results, list)
-                assert isinstance(user2_results, list)
+        # Basic verification that searches return results for respective users
+        # (Exact content verification would require real embeddings)
+        assert isinstance(user1_results, list)
+        assert isinstance(user2_results, list)
@@ -5,6 +5,7 @@ import tempfile
 from pathlib import Path
 from unittest.mock import Mock, patch
 
+import numpy as np
 import pytest
 from fastapi.testclient import TestClient
 
@@ -50,7 +51,7 @@ def mock_openai_services():
             "healthcare.conversion.conversion_service.OpenAI"
         ) as mock_openai_conversion,
         patch("healthcare.search.embeddings.OpenAI") as mock_openai_embedding,
-        patch("chromadb.PersistentClient") as mock_chroma,
+        patch("healthcare.search.embeddings.get_chroma_client") as mock_chroma,
     ):
 
         # Mock conversion service
@@ -87,6 +88,7 @@ def mock_openai_services():
         mock_collection = Mock()
         mock_collection.name = "medical_reports"
         mock_collection.count.return_value = 0
+        mock_collection.get.return_value = {"ids": []}
         mock_chroma_client.get_or_create_collection.return_value = mock_collection
         mock_chroma.return_value = mock_chroma_client
 
@@ -378,12 +380,12 @@ class TestUploadConversionEmbeddingIntegration:
         # Verify documents were chunked
         documents = call_args["documents"]
         assert len(documents) > 0
-        assert all(isinstance(doc, str) for doc in documents)
+        assert set(map(type, documents)) == {str}
 
         # Verify embeddings were generated
         embeddings = call_args["embeddings"]
         assert len(embeddings) == len(documents)
-        assert all(isinstance(emb, list) for emb in embeddings)
+        assert embeddings.dtype == np.float32
 
 
 @pytest.mark.integration
@@ -0,0 +1,41 @@
+"""Helpers shared across the test suite."""
+
+from contextlib import contextmanager
+from typing import Iterator, Sequence
+
+import numpy as np
+import pytest
+from starlette.datastructures import State
+
+# Module globals of healthcare.main assigned by the app lifespan
+_LIFESPAN_GLOBALS = (
+    "config",
+    "db_service",
+    "embedding_service",
+    "search_service",
+    "report_service",
+    "healthcare_agent",
+)
+
+
+def _assert_nonempty_strings(chunks: Sequence[str]) -> None:
+    """Assert every chunk is a string with non-whitespace content."""
+    assert set(map(type, chunks)) == {str}
+    assert np.fromiter(map(len, map(str.strip, chunks)), dtype=np.int64).min() > 0
+
+
+@contextmanager
+def _restored_app_state(app) -> Iterator[None]:
+    """Run the app lifespan against a fresh app.state, restoring it on exit.
+
+    The lifespan stores its services on app.state and in the module globals
+    of healthcare.main. Both are put back afterwards so later tests still see
+    an app without started services.
+    """
+    import healthcare.main as healthcare_main
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(app, "state", State())
+        for name in _LIFESPAN_GLOBALS:
+            mp.setattr(healthcare_main, name, getattr(healthcare_main, name))
+        yield